@@ -0,0 +1,221 @@
+"""
+Pool of warm headless browsers shared by scraper searches.
+
+Launching Chromium costs seconds of CPU and hundreds of MB of RAM, so browsers
+are started once and reused. Each search leases a browser, opens a fresh
+context on it (cheap, and keeps cookies and carts isolated between searches)
+and returns the browser when done. Browsers are recycled once they are too
+old, have served too many searches or fail a health check.
+
+Browsers are bound to the event loop that launched them, so the pool owns a
+single long-lived loop running in a background thread; ``run`` schedules
+coroutines onto it from any thread or loop.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, List, Optional, TypeVar
+
+from browser_use import Browser, BrowserConfig
+from browser_use.browser.context import BrowserContextConfig
+
+from shared.config import (
+    get_browser_max_age,
+    get_browser_max_uses,
+    get_browser_pool_size,
+)
+
+T = TypeVar("T")
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+)
+
+
+def default_context_config() -> BrowserContextConfig:
+    """Context settings used for scraper searches."""
+    return BrowserContextConfig(
+        disable_security=False,
+        user_agent=USER_AGENT,
+        minimum_wait_page_load_time=3,
+        maximum_wait_page_load_time=30,
+    )
+
+
+def _launch_browser() -> Browser:
+    return Browser(
+        config=BrowserConfig(
+            # Let Playwright manage the browser instance
+            headless=True,
+            new_context_config=default_context_config(),
+        )
+    )
+
+
+class _PooledBrowser:
+    """A browser plus the bookkeeping needed to decide when to recycle it."""
+
+    __slots__ = ("browser", "created_at", "uses")
+
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+class BrowserPool:
+    """A bounded set of long-lived browsers leased out one search at a time."""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_age: Optional[float] = None,
+        max_uses: Optional[int] = None,
+        launcher: Callable[[], Browser] = _launch_browser,
+    ):
+        """
+        Initialize the pool; browsers are launched lazily on first lease.
+
+        Args:
+            size: Maximum number of browsers, and so of concurrent searches
+            max_age: Seconds after which a browser is replaced
+            max_uses: Searches after which a browser is replaced
+            launcher: Factory for new browsers
+        """
+        self.size = size if size is not None else get_browser_pool_size()
+        self.max_age = max_age if max_age is not None else get_browser_max_age()
+        self.max_uses = max_uses if max_uses is not None else get_browser_max_uses()
+        self._launcher = launcher
+        self._idle: List[_PooledBrowser] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the pool's event loop thread on first use."""
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run_loop() -> None:
+                    asyncio.set_event_loop(loop)
+                    self._slots = asyncio.Semaphore(self.size)
+                    ready.set()
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run_loop, name="browser-pool", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, coro_fn: Callable[..., Awaitable[T]], *args: Any) -> "Future[T]":
+        """
+        Schedule ``coro_fn(*args)`` on the pool's event loop.
+
+        Args:
+            coro_fn: Coroutine function to run
+            *args: Its arguments
+
+        Returns:
+            Future: A thread-safe future for the result
+        """
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro_fn(*args), loop)
+
+    def run(self, coro_fn: Callable[..., Awaitable[T]], *args: Any, timeout: Optional[float] = None) -> T:
+        """Run ``coro_fn(*args)`` on the pool's loop and wait for the result."""
+        return self.submit(coro_fn, *args).result(timeout=timeout)
+
+    async def _is_healthy(self, pooled: _PooledBrowser) -> bool:
+        if time.monotonic() - pooled.created_at > self.max_age:
+            logging.debug("Recycling browser: max age reached")
+            return False
+        if pooled.uses >= self.max_uses:
+            logging.debug("Recycling browser: max uses reached")
+            return False
+        playwright_browser = getattr(pooled.browser, "playwright_browser", None)
+        if playwright_browser is not None and not playwright_browser.is_connected():
+            logging.debug("Recycling browser: disconnected")
+            return False
+        return True
+
+    async def _close(self, pooled: _PooledBrowser) -> None:
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logging.warning(f"Error closing pooled browser: {str(e)}")
+
+    async def _checkout(self) -> _PooledBrowser:
+        while self._idle:
+            pooled = self._idle.pop()
+            if await self._is_healthy(pooled):
+                return pooled
+            await self._close(pooled)
+        logging.debug("Launching a new pooled browser")
+        return _PooledBrowser(self._launcher())
+
+    @asynccontextmanager
+    async def lease(self):
+        """
+        Lease a warm browser for one search; must run on the pool's loop.
+
+        Yields:
+            Browser: A browser exclusively used by the caller until the block exits
+        """
+        async with self._slots:
+            pooled = await self._checkout()
+            failed = False
+            try:
+                yield pooled.browser
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                pooled.uses += 1
+                # A search that crashed may have left the browser in a bad state
+                if failed or not await self._is_healthy(pooled):
+                    await self._close(pooled)
+                else:
+                    self._idle.append(pooled)
+
+    async def _close_all(self) -> None:
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._close(pooled)
+
+    def close(self) -> None:
+        """Close idle browsers and stop the pool's event loop."""
+        with self._start_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close_all(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Return the process-wide browser pool, creating it on first use.
+
+    Returns:
+        BrowserPool: The shared pool
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+    return _pool
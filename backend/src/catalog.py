@@ -0,0 +1,348 @@
+"""
+Restaurant and menu catalog used by the crew's search tools.
+
+The catalog is loaded once from a JSON file and indexed by cuisine, keyword
+token, restaurant name and platform, so lookups stay constant-time however
+many restaurants it holds.
+"""
+import json
+import logging
+import re
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from shared.config import get_catalog_path
+
+# Result tiers: the default listing, and the one offered when it was rejected
+FEATURED = "featured"
+ALTERNATIVE = "alternative"
+
+# Fields of a restaurant record returned by searches (the menu is fetched separately)
+_SUMMARY_FIELDS = ("name", "specialty", "description", "rating", "reviews", "platform")
+_DISH_FIELDS = ("name", "price", "restaurant", "rating")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Shortest keyword matched as part of a longer word when no whole word matches
+_MIN_PARTIAL_TOKEN = 3
+
+
+def normalize_token(token: str) -> str:
+    """Lowercase a word and strip a plural ending, so "Pizzas" matches "pizza"."""
+    token = token.lower()
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split free text into normalized tokens.
+
+    Args:
+        text: Text such as search keywords
+
+    Returns:
+        List[str]: Normalized tokens in their original order
+    """
+    return [normalize_token(token) for token in _TOKEN_RE.findall(text.lower())]
+
+
+def normalize_name(name: str) -> str:
+    """Canonical form of a restaurant name used for lookups."""
+    return " ".join(_TOKEN_RE.findall(name.lower()))
+
+
+def partial_matches(token: str, vocabulary: Iterable[str]) -> List[str]:
+    """
+    Indexed tokens that contain a keyword or are contained in it.
+
+    Used when no whole word matches, so "cheese" finds "cheeseburger", a
+    partial word such as "piz" finds "pizza", and "cheeseburger" finds "burger".
+
+    Args:
+        token: A normalized keyword
+        vocabulary: Indexed tokens
+
+    Returns:
+        List[str]: Matching tokens, sorted
+    """
+    if len(token) < _MIN_PARTIAL_TOKEN:
+        return []
+    return sorted(
+        candidate for candidate in vocabulary
+        if candidate != token and (token in candidate or (len(candidate) >= _MIN_PARTIAL_TOKEN and candidate in token))
+    )
+
+
+def _pick(record: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    return {field: record[field] for field in fields if record.get(field) is not None}
+
+
+class Catalog:
+    """An immutable, indexed set of restaurants and dishes."""
+
+    def __init__(
+        self,
+        restaurants: List[Dict[str, Any]],
+        dishes: List[Dict[str, Any]],
+        pricing: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Build the indexes.
+
+        Args:
+            restaurants: Restaurant records (name, cuisine, platform, tiers, optional menu, ...)
+            dishes: Dish records (name, price, restaurant, keywords, tier, ...)
+            pricing: Pricing rules by platform and restaurant (see ``pricing.PricingEngine.from_config``)
+        """
+        self.restaurants = restaurants
+        self.dishes = dishes
+        self.pricing = pricing or {}
+
+        # Indexes hold positions into the record lists, in catalog order
+        self._by_name: Dict[str, int] = {}
+        self._by_cuisine: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self._by_platform: Dict[str, Set[int]] = defaultdict(set)
+        self._restaurants_by_token: Dict[str, List[int]] = defaultdict(list)
+        self._dishes_by_token: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        # Everything that can be ordered: menu items and listed dishes, with price and platform
+        self._offers: List[Dict[str, Any]] = []
+        self._offers_by_token: Dict[str, List[int]] = defaultdict(list)
+
+        for index, restaurant in enumerate(restaurants):
+            self._by_name.setdefault(normalize_name(restaurant["name"]), index)
+            cuisine = normalize_token(restaurant.get("cuisine", ""))
+            for tier in restaurant.get("tiers", ()):
+                self._by_cuisine[cuisine][tier].append(index)
+            if restaurant.get("platform"):
+                self._by_platform[normalize_name(restaurant["platform"])].add(index)
+            tokens = set(tokenize(restaurant["name"]))
+            for field in ("cuisine", "specialty"):
+                tokens.update(tokenize(restaurant.get(field) or ""))
+            for token in tokens:
+                self._restaurants_by_token[token].append(index)
+            for item in restaurant.get("menu", ()):
+                self._add_offer(item, restaurant["name"], restaurant.get("platform"), tokenize(item["name"]))
+
+        for index, dish in enumerate(dishes):
+            tokens = set(tokenize(dish["name"]))
+            for keyword in dish.get("keywords", ()):
+                tokens.update(tokenize(keyword))
+            for token in tokens:
+                self._dishes_by_token[token][dish.get("tier", FEATURED)].append(index)
+            restaurant = self.get_restaurant(dish.get("restaurant", ""))
+            platform = dish.get("platform") or (restaurant or {}).get("platform")
+            self._add_offer(dish, dish.get("restaurant", ""), platform, tokens)
+
+    def _add_offer(self, item: Dict[str, Any], restaurant: str, platform: Optional[str], tokens: Iterable[str]) -> None:
+        if item.get("price") is None:
+            return
+        offer = {"name": item["name"], "price": item["price"], "restaurant": restaurant, "platform": platform}
+        index = len(self._offers)
+        self._offers.append(offer)
+        for token in set(tokens):
+            self._offers_by_token[token].append(index)
+
+    @classmethod
+    def load(cls, path: str) -> "Catalog":
+        """
+        Load a catalog from a JSON file.
+
+        Args:
+            path: Path to the catalog file
+
+        Returns:
+            Catalog: The indexed catalog
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        catalog = cls(data.get("restaurants", []), data.get("dishes", []), data.get("pricing"))
+        logging.debug(
+            f"Loaded catalog with {len(catalog.restaurants)} restaurants and {len(catalog.dishes)} dishes from {path}"
+        )
+        return catalog
+
+    @property
+    def cuisines(self) -> List[str]:
+        """Cuisines that have at least one listed restaurant."""
+        return sorted(self._by_cuisine)
+
+    def has_cuisine(self, cuisine: str) -> bool:
+        """Check whether any restaurant is listed under a cuisine."""
+        return normalize_token(cuisine) in self._by_cuisine
+
+    def restaurants_by_cuisine(
+        self,
+        cuisine: str,
+        tier: str = FEATURED,
+        platform: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        List restaurants serving a cuisine.
+
+        Args:
+            cuisine: Cuisine name, e.g. "chinese"
+            tier: FEATURED for the default listing, ALTERNATIVE for the fallback one
+            platform: Only return restaurants on this delivery platform
+            limit: Maximum number of results
+
+        Returns:
+            List[Dict[str, Any]]: Restaurant summaries in catalog order
+        """
+        indexes = self._by_cuisine.get(normalize_token(cuisine), {}).get(tier, [])
+        if platform:
+            on_platform = self._by_platform.get(normalize_name(platform), set())
+            indexes = [index for index in indexes if index in on_platform]
+        if limit is not None:
+            indexes = indexes[:limit]
+        return [_pick(self.restaurants[index], _SUMMARY_FIELDS) for index in indexes]
+
+    def restaurants_by_platform(self, platform: str) -> List[Dict[str, Any]]:
+        """List every restaurant on a delivery platform, in catalog order."""
+        indexes = sorted(self._by_platform.get(normalize_name(platform), ()))
+        return [_pick(self.restaurants[index], _SUMMARY_FIELDS) for index in indexes]
+
+    def restaurants_by_keywords(
+        self, keywords: str, platform: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find restaurants whose name, cuisine or specialty matches the keywords.
+
+        Args:
+            keywords: Free-text search keywords
+            platform: Only return restaurants on this delivery platform
+            limit: Maximum number of results
+
+        Returns:
+            List[Dict[str, Any]]: Restaurant summaries, best matches first
+        """
+        hits: Dict[int, int] = defaultdict(int)
+        for token in set(tokenize(keywords)):
+            for index in self._restaurants_by_token.get(token, ()):
+                hits[index] += 1
+        if platform:
+            on_platform = self._by_platform.get(normalize_name(platform), set())
+            hits = {index: count for index, count in hits.items() if index in on_platform}
+        indexes = sorted(hits, key=lambda index: (-hits[index], index))
+        if limit is not None:
+            indexes = indexes[:limit]
+        return [_pick(self.restaurants[index], _SUMMARY_FIELDS) for index in indexes]
+
+    def find_dishes(self, keywords: str, tier: str = FEATURED, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find dishes for the first keyword that has any in the requested tier.
+
+        Keywords without dishes in the tier are skipped, so "pepperoni pizza"
+        finds the featured pizza even though "pepperoni" is only listed as an
+        alternative. When no keyword has alternatives, the default listing is
+        used instead. Keywords are matched as whole words first; only if none
+        matches are they matched as parts of words (see ``partial_matches``).
+
+        Args:
+            keywords: Free-text search keywords
+            tier: FEATURED for the default listing, ALTERNATIVE for the fallback one
+            limit: Maximum number of results
+
+        Returns:
+            List[Dict[str, Any]]: Matching dishes, or an empty list
+        """
+        tokens = tokenize(keywords)
+        for partial in (False, True):
+            for wanted in dict.fromkeys((tier, FEATURED)):
+                for token in tokens:
+                    if partial:
+                        matched = partial_matches(token, self._dishes_by_token)
+                        indexes = sorted({
+                            index for match in matched for index in self._dishes_by_token[match].get(wanted, ())
+                        })
+                    else:
+                        indexes = self._dishes_by_token.get(token, {}).get(wanted)
+                    if not indexes:
+                        continue
+                    if limit is not None:
+                        indexes = indexes[:limit]
+                    return [_pick(self.dishes[index], _DISH_FIELDS) for index in indexes]
+        return []
+
+    def find_offers(self, keywords: str, platform: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find orderable items matching every keyword, across all restaurants.
+
+        Args:
+            keywords: Item name or keywords, e.g. "margherita pizza"
+            platform: Only return items sold on this delivery platform
+
+        Returns:
+            List[Dict[str, Any]]: Offers ({"name", "price", "restaurant", "platform"}) in catalog order
+        """
+        tokens = set(tokenize(keywords))
+        if not tokens:
+            return []
+        indexes = set.intersection(*(set(self._offers_by_token.get(token, ())) for token in tokens))
+        offers = [self._offers[index] for index in sorted(indexes)]
+        if platform:
+            offers = [offer for offer in offers if normalize_name(offer.get("platform") or "") == normalize_name(platform)]
+        return offers
+
+    def find_cuisine(self, keywords: str) -> Optional[str]:
+        """Return the first listed cuisine named by a keyword, as a whole word or else as part of one."""
+        tokens = tokenize(keywords)
+        for token in tokens:
+            if token in self._by_cuisine:
+                return token
+        for token in tokens:
+            matched = partial_matches(token, self._by_cuisine)
+            if matched:
+                return matched[0]
+        return None
+
+    def get_restaurant(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a restaurant by name, ignoring case and punctuation.
+
+        Args:
+            name: Restaurant name
+
+        Returns:
+            Optional[Dict[str, Any]]: The full restaurant record or None
+        """
+        index = self._by_name.get(normalize_name(name))
+        return self.restaurants[index] if index is not None else None
+
+    def get_menu(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a restaurant's menu.
+
+        Args:
+            name: Restaurant name
+
+        Returns:
+            Optional[Dict[str, Any]]: {"name": ..., "menu": [...]} or None if the restaurant has no menu
+        """
+        restaurant = self.get_restaurant(name)
+        if restaurant is None or "menu" not in restaurant:
+            return None
+        return {"name": restaurant["name"], "menu": restaurant["menu"]}
+
+
+_catalog: Optional[Catalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    """
+    Return the process-wide catalog, loading it on first use.
+
+    Returns:
+        Catalog: The catalog read from CATALOG_PATH
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = Catalog.load(get_catalog_path())
+    return _catalog
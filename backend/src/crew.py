@@ -1,12 +1,12 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
+import logging
 import os
 import sys
 from pathlib import Path
 from crewai.tools import tool
 import asyncio
 import threading
-from .uber_eats_scraper import scrape_ubereats
 import json
 from datetime import datetime, timedelta
 import random
@@ -14,90 +14,54 @@ import random
 # Add project root to sys.path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from shared.fake_llm import create_llm_override
+from shared.tool_results import compact_result
+
+from .catalog import ALTERNATIVE, FEATURED, get_catalog
+from .platform_search import search_all_platforms_sync
+from .pricing import build_candidate_carts, get_pricing_engine
+from .uber_eats_scraper import scrape_ubereats, scrape_ubereats_sync
+
 
 # @tool("FoodSearch")
 # def food_search(postal_code: str, keywords: str) -> list:
 #     """Search for food given a postal code and keywords, returning real deliveroo results.
 #     """
-#     results = []
-#     error = None
-#
-#     def run_in_thread():
-#         nonlocal results, error
-#         try:
-#             # Create and manage a new event loop for this thread
-#             loop = asyncio.new_event_loop()
-#             asyncio.set_event_loop(loop)
-#             results = loop.run_until_complete(scrape_ubereats(postal_code, keywords))
-#             loop.close()
-#         except Exception as e:
-#             print(f"Error in scraper thread: {e}")
-#             error = e
-#
-#     # Create and start the thread
-#     thread = threading.Thread(target=run_in_thread)
-#     thread.start()
-#     thread.join() # Wait for the thread to complete
-#
-#     if error:
-#         # Return an error indication if the thread failed
-#         return [{ "error": f"Failed to get results due to an error in the scraper: {error}" }]
-#     else:
-#         return results
+#     try:
+#         # Runs on the shared browser pool's event loop; no per-search thread or browser
+#         return scrape_ubereats_sync(postal_code, keywords, timeout=300)
+#     except Exception as e:
+#         print(f"Error in scraper: {e}")
+#         # Return an error indication if the scraper failed
+#         return [{ "error": f"Failed to get results due to an error in the scraper: {e}" }]
 
 @tool("FoodSearch")
-def food_search(postal_code: str, keywords: str, show_alternatives: bool = False) -> list:
+@compact_result("FoodSearch")
+def food_search(postal_code: str, keywords: str, show_alternatives: bool = False) -> str:
     """
     Search for food given a postal code and keywords. Returns a result based on the keywords provided.
     
-    Supported keywords and their results:
-    - "pizza": Returns a Margherita Pizza from Pizza Place.
-    - "sushi": Returns a Salmon Sushi Set from Sushi Bar.
-    - "burger": Returns a Classic Burger from Burger Joint.
-    - "chinese": Returns Chinese restaurant options.
+    Keywords naming a dish (e.g. "pizza", "sushi", "burger") return matching dishes;
+    keywords naming a cuisine (e.g. "chinese", "italian", "indian") return restaurant options.
     
-    If the keywords do not match any of the above, an error message is returned.
+    If the keywords do not match any dish or cuisine, an error message is returned.
     """
-    # This dictionary will be injected into the agent below
-    keyword_map = {
-        "pizza": [{"name": "Margherita Pizza", "price": 10.99, "restaurant": "Pizza Place", "rating": 4.5}],
-        "sushi": [{"name": "Salmon Sushi Set", "price": 15.99, "restaurant": "Sushi Bar", "rating": 4.7}],
-        "burger": [{"name": "Classic Burger", "price": 9.99, "restaurant": "Burger Joint", "rating": 4.3}],
-        "chinese": [
-            {"name": "Ni HAO", "specialty": "Kung Pao Chicken", "rating": 4.7, "reviews": 500, "platform": "UberEats"},
-            {"name": "Wok & Roll", "specialty": "Crispy duck pancakes", "rating": 4.5, "reviews": 300, "platform": "Deliveroo"},
-            {"name": "Bamboo House", "specialty": "Beef in black bean sauce", "rating": 4.6, "reviews": 450, "platform": "Just Eat"}
-        ]
-    }
-    
-    # Alternative recommendations for when initial options are rejected
-    alternative_keyword_map = {
-        "pizza": [{"name": "Pepperoni Pizza", "price": 12.99, "restaurant": "Pizza Express", "rating": 4.6}],
-        "sushi": [{"name": "Dragon Roll", "price": 16.99, "restaurant": "Sushi Master", "rating": 4.8}],
-        "burger": [{"name": "Double Cheeseburger", "price": 11.99, "restaurant": "Burger King", "rating": 4.4}],
-        "chinese": [
-            {"name": "Xin Kai", "specialty": "Kung Pao Chicken", "description": "Spicy chicken with peanuts and vegetables in a savory sauce", "rating": 4.7, "reviews": 500, "platform": "UberEats"},
-            {"name": "Imperial Palace", "specialty": "Chicken with Garlic Sauce", "description": "Tender chicken with garlic and ginger sauce", "rating": 4.8, "reviews": 320, "platform": "Deliveroo"},
-            {"name": "Dragon Phoenix", "specialty": "Gong Bao Ji Ding", "description": "Traditional Kung Pao Chicken", "rating": 4.9, "reviews": 400, "platform": "Just Eat"}
-        ]
-    }
-    
-    for key, value in keyword_map.items():
-        if key in keywords.lower():
-            if show_alternatives:
-                # If alternatives are requested, check if there are alternatives for this keyword
-                if key in alternative_keyword_map:
-                    return alternative_keyword_map[key]
-                else:
-                    # If no alternatives exist, return the original results
-                    return value
-            else:
-                return value
+    catalog = get_catalog()
+    tier = ALTERNATIVE if show_alternatives else FEATURED
+
+    dishes = catalog.find_dishes(keywords, tier=tier)
+    if dishes:
+        return dishes
+
+    cuisine = catalog.find_cuisine(keywords)
+    if cuisine:
+        return catalog.restaurants_by_cuisine(cuisine, tier=tier)
     return [{"error": "No matching food found for the given keywords."}]
 
 
 @tool("SaveUserPreferences")
-def save_user_preferences(postal_code: str, delivery_time: str = None) -> dict:
+@compact_result("SaveUserPreferences")
+def save_user_preferences(postal_code: str, delivery_time: str = None) -> str:
     """Save user preferences like postal code and delivery time."""
     if not postal_code:
         return {"error": "Missing postal code"}
@@ -113,114 +77,53 @@ def save_user_preferences(postal_code: str, delivery_time: str = None) -> dict:
 
 
 @tool("SearchRestaurants")
-def search_restaurants(postal_code: str, cuisine: str, delivery_time: str = None, show_alternatives: bool = False) -> list:
-    """Search for restaurants by cuisine type that deliver to the given postal code."""
+@compact_result("SearchRestaurants")
+def search_restaurants(postal_code: str, cuisine: str, delivery_time: str = None, show_alternatives: bool = False, platform: str = None) -> str:
+    """Search for restaurants by cuisine type that deliver to the given postal code, optionally on one platform."""
     if not postal_code or not cuisine:
         return [{"error": "Missing postal code or cuisine type"}]
     
-    # In a real implementation, this would query a database or API
-    # For this simulation, we'll return mock data
-    restaurants = {
-        "chinese": [
-            {"name": "Xin Kai", "specialty": "Kung Pao Chicken", "rating": 4.7, "reviews": 500, "platform": "UberEats"},
-            {"name": "Wok & Roll", "specialty": "Crispy duck pancakes", "rating": 4.5, "reviews": 300, "platform": "Deliveroo"},
-            {"name": "Bamboo House", "specialty": "Beef in black bean sauce", "rating": 4.6, "reviews": 450, "platform": "Just Eat"}
-        ],
-        "italian": [
-            {"name": "Pasta Paradise", "specialty": "Homemade pasta", "rating": 4.8, "reviews": 420, "platform": "UberEats"},
-            {"name": "Pizza Express", "specialty": "Wood-fired pizza", "rating": 4.6, "reviews": 380, "platform": "Deliveroo"},
-            {"name": "Roma Italian", "specialty": "Authentic Italian cuisine", "rating": 4.7, "reviews": 350, "platform": "Just Eat"}
-        ],
-        "indian": [
-            {"name": "Spice Garden", "specialty": "Butter chicken", "rating": 4.8, "reviews": 450, "platform": "UberEats"},
-            {"name": "Taj Mahal", "specialty": "Biryani", "rating": 4.7, "reviews": 380, "platform": "Deliveroo"},
-            {"name": "Royal Indian", "specialty": "Curry", "rating": 4.6, "reviews": 320, "platform": "Just Eat"}
-        ]
-    }
-    
-    # Alternative recommendations for when initial options are rejected
-    alternative_restaurants = {
-        "chinese": [
-            {"name": "Xin Kai", "specialty": "Kung Pao Chicken", "description": "Spicy chicken with peanuts and vegetables in a savory sauce", "rating": 4.7, "reviews": 500, "platform": "UberEats"},
-            {"name": "Imperial Palace", "specialty": "Chicken with Garlic Sauce", "description": "Tender chicken with garlic and ginger sauce", "rating": 4.8, "reviews": 320, "platform": "Deliveroo"},
-            {"name": "Dragon Phoenix", "specialty": "Gong Bao Ji Ding", "description": "Traditional Kung Pao Chicken", "rating": 4.9, "reviews": 400, "platform": "Just Eat"}
-        ],
-        "italian": [
-            {"name": "La Cucina", "specialty": "Homemade lasagna", "description": "Layers of pasta with rich meat sauce and cheese", "rating": 4.9, "reviews": 380, "platform": "UberEats"},
-            {"name": "Pasta Express", "specialty": "Seafood linguine", "description": "Fresh seafood with linguine in white wine sauce", "rating": 4.7, "reviews": 320, "platform": "Deliveroo"},
-            {"name": "Roma Bella", "specialty": "Margherita pizza", "description": "Classic pizza with tomato, mozzarella, and basil", "rating": 4.8, "reviews": 350, "platform": "Just Eat"}
-        ],
-        "indian": [
-            {"name": "Spice Garden", "specialty": "Butter chicken", "description": "Tender chicken in rich, creamy tomato sauce", "rating": 4.8, "reviews": 450, "platform": "UberEats"},
-            {"name": "Taj Mahal", "specialty": "Biryani", "description": "Fragrant rice dish with spices and tender meat", "rating": 4.7, "reviews": 380, "platform": "Deliveroo"},
-            {"name": "Royal Indian", "specialty": "Curry", "description": "Rich, flavorful curry with your choice of protein", "rating": 4.6, "reviews": 320, "platform": "Just Eat"}
-        ]
-    }
-    
-    if cuisine.lower() in restaurants:
-        if show_alternatives:
-            return alternative_restaurants[cuisine.lower()]
-        else:
-            return restaurants[cuisine.lower()]
-    else:
+    catalog = get_catalog()
+    if not catalog.has_cuisine(cuisine):
         return [{"error": f"No restaurants found for cuisine: {cuisine}"}]
 
+    tier = ALTERNATIVE if show_alternatives else FEATURED
+    results = catalog.restaurants_by_cuisine(cuisine, tier=tier, platform=platform, limit=10)
+    if not results:
+        return [{"error": f"No restaurants found for cuisine: {cuisine} on {platform}"}]
+    return results
+
+
+@tool("SearchAllPlatforms")
+@compact_result("SearchAllPlatforms")
+def search_all_platforms(postal_code: str, keywords: str) -> str:
+    """Search UberEats, Deliveroo and Just Eat at once to compare options for the given postal code and keywords."""
+    if not postal_code or not keywords:
+        return {"error": "Missing postal code or keywords"}
+
+    result = search_all_platforms_sync(postal_code, keywords)
+    if not result["results"]:
+        return {"error": f"No results found on any platform for: {keywords}", "platforms": result["platforms"]}
+    return result
+
 
 @tool("GetRestaurantMenu")
-def get_restaurant_menu(restaurant_name: str) -> dict:
+@compact_result("GetRestaurantMenu")
+def get_restaurant_menu(restaurant_name: str) -> str:
     """Get the menu for a specific restaurant."""
     if not restaurant_name:
         return {"error": "Missing restaurant name"}
     
-    # In a real implementation, this would query a database or API
-    # For this simulation, we'll return mock data
-    menus = {
-        "Dragon Phoenix": {
-            "name": "Dragon Phoenix",
-            "menu": [
-                {"name": "Gong Bao Ji Ding", "description": "Tender chicken pieces stir-fried with peanuts, vegetables, and chili in a savory sauce", "price": 13.99},
-                {"name": "Egg Fried Rice", "description": "Fluffy rice with scrambled egg and spring onions", "price": 3.50},
-                {"name": "Beef in Black Bean Sauce", "description": "Sliced beef with black bean sauce and vegetables", "price": 14.99},
-                {"name": "Sweet and Sour Chicken", "description": "Crispy chicken in sweet and sour sauce with pineapple", "price": 12.99},
-                {"name": "Spring Rolls", "description": "Crispy vegetable spring rolls with sweet chili sauce", "price": 4.99},
-                {"name": "Still Water (500ml)", "description": "Bottled still water", "price": 1.50},
-                {"name": "Coca Cola (330ml)", "description": "Bottled Coca Cola", "price": 1.99}
-            ]
-        },
-        "Golden Dragon": {
-            "name": "Golden Dragon",
-            "menu": [
-                {"name": "Sweet and Sour Chicken", "description": "Crispy chicken in sweet and sour sauce with pineapple", "price": 12.99},
-                {"name": "Egg Fried Rice", "description": "Fluffy rice with scrambled egg and spring onions", "price": 3.50},
-                {"name": "Beef in Black Bean Sauce", "description": "Sliced beef with black bean sauce and vegetables", "price": 14.99},
-                {"name": "Kung Pao Chicken", "description": "Spicy chicken with peanuts and vegetables", "price": 13.99},
-                {"name": "Spring Rolls", "description": "Crispy vegetable spring rolls with sweet chili sauce", "price": 4.99},
-                {"name": "Still Water (500ml)", "description": "Bottled still water", "price": 1.50},
-                {"name": "Coca Cola (330ml)", "description": "Bottled Coca Cola", "price": 1.99}
-            ]
-        },
-        "Xin Kai": {
-            "name": "Xin Kai",
-            "menu": [
-                {"name": "Sweet and Sour Chicken", "description": "Crispy chicken in sweet and sour sauce with pineapple", "price": 12.99},
-                {"name": "Egg Fried Rice", "description": "Fluffy rice with scrambled egg and spring onions", "price": 3.50},
-                {"name": "Beef in Black Bean Sauce", "description": "Sliced beef with black bean sauce and vegetables", "price": 14.99},
-                {"name": "Kung Pao Chicken", "description": "Spicy chicken with peanuts and vegetables", "price": 17.83},
-                {"name": "Spring Rolls", "description": "Crispy vegetable spring rolls with sweet chili sauce", "price": 4.99},
-                {"name": "Still Water (500ml)", "description": "Bottled still water", "price": 1.50},
-                {"name": "Coca Cola (330ml)", "description": "Bottled Coca Cola", "price": 1.99}
-            ]
-        }
-    }
-    
-    if restaurant_name in menus:
-        return menus[restaurant_name]
+    menu = get_catalog().get_menu(restaurant_name)
+    if menu is not None:
+        return menu
     else:
         return {"error": f"Menu not found for restaurant: {restaurant_name}"}
 
 
 @tool("AddToCart")
-def add_to_cart(restaurant_name: str, items: list) -> dict:
+@compact_result("AddToCart")
+def add_to_cart(restaurant_name: str, items: list) -> str:
     """Add items to the cart for a specific restaurant."""
     if not restaurant_name or not items:
         return {"error": "Missing restaurant name or items"}
@@ -235,38 +138,49 @@ def add_to_cart(restaurant_name: str, items: list) -> dict:
 
 
 @tool("CalculateTotal")
-def calculate_total(cart_items: list) -> dict:
+@compact_result("CalculateTotal")
+def calculate_total(cart_items: list) -> str:
     """Calculate the total price for the items in the cart."""
     if not cart_items:
         return {"error": "Cart is empty"}
     
-    # In a real implementation, this would calculate based on actual prices
-    # For this simulation, we'll use a simplified calculation
-    subtotal = sum(item.get("price", 0) for item in cart_items)
-    delivery_fee = 2.99
+    quote = get_pricing_engine().quote_one({"items": cart_items})
+    subtotal, discount, delivery_fee, total = quote["subtotal"], quote["discount"], quote["delivery_fee"], quote["total"]
     
-    # Apply discount if subtotal is over £18
-    discount = 0
-    if subtotal >= 18:
-        discount = subtotal * 0.15  # 15% discount
-    
-    # Reduce delivery fee if discount is applied
-    if discount > 0:
-        delivery_fee = 1.69
+    return {
+        "subtotal": subtotal,
+        "discount": discount,
+        "delivery_fee": delivery_fee,
+        "total": total,
+        "message": f"Subtotal: £{subtotal}, Discount: £{discount}, Delivery fee: £{delivery_fee}, Total: £{total}"
+    }
+
+
+@tool("CompareCartPrices")
+@compact_result("CompareCartPrices")
+def compare_cart_prices(items: list, platform: str = None, limit: int = 5) -> str:
+    """
+    Find the cheapest way to order a list of items. Builds a cart at every restaurant (on every platform)
+    that sells all the items and prices them all at once, including discounts and delivery fees.
     
-    total = subtotal - discount + delivery_fee
+    Items are names or keywords (e.g. "egg fried rice"), or {"name": ..., "quantity": ...} objects.
+    Returns the cheapest options first.
+    """
+    if not items:
+        return {"error": "Missing items to compare"}
     
+    carts, missing = build_candidate_carts(items, platform=platform)
+    if not carts:
+        return {"error": "No restaurant offers all of these items", "missing": missing}
     return {
-        "subtotal": round(subtotal, 2),
-        "discount": round(discount, 2),
-        "delivery_fee": round(delivery_fee, 2),
-        "total": round(total, 2),
-        "message": f"Subtotal: £{round(subtotal, 2)}, Discount: £{round(discount, 2)}, Delivery fee: £{round(delivery_fee, 2)}, Total: £{round(total, 2)}"
+        "options": get_pricing_engine().compare(carts, limit=limit),
+        "compared": len(carts),
     }
 
 
 @tool("ProcessOrder")
-def process_order(postal_code: str, delivery_time: str, payment_method: str, cart_items: list) -> dict:
+@compact_result("ProcessOrder")
+def process_order(postal_code: str, delivery_time: str, payment_method: str, cart_items: list) -> str:
     """Process the order with the given details."""
     if not postal_code or not payment_method or not cart_items:
         return {"error": "Missing required order details"}
@@ -287,7 +201,8 @@ def process_order(postal_code: str, delivery_time: str, payment_method: str, car
 
 
 @tool("PayOrder")
-def pay_order(order_id: str, payment_method: str) -> dict:
+@compact_result("PayOrder")
+def pay_order(order_id: str, payment_method: str) -> str:
     """Pay for an order given an order ID and payment method."""
     if not order_id or not payment_method:
         return {"error": "Missing order_id or payment_method"}
@@ -300,25 +215,15 @@ def pay_order(order_id: str, payment_method: str) -> dict:
 
 
 @tool("GenerateOrderSummary")
-def generate_order_summary(restaurant_name: str, items: list, postal_code: str, delivery_time: str = None) -> dict:
+@compact_result("GenerateOrderSummary")
+def generate_order_summary(restaurant_name: str, items: list, postal_code: str, delivery_time: str = None) -> str:
     """Generate a comprehensive summary of the order before placing it."""
     if not restaurant_name or not items or not postal_code:
         return {"error": "Missing required order details"}
     
     # Calculate the total price
-    subtotal = sum(item.get("price", 0) for item in items)
-    delivery_fee = 2.99
-    
-    # Apply discount if subtotal is over £18
-    discount = 0
-    if subtotal >= 18:
-        discount = subtotal * 0.15  # 15% discount
-    
-    # Reduce delivery fee if discount is applied
-    if discount > 0:
-        delivery_fee = 1.69
-    
-    total = subtotal - discount + delivery_fee
+    quote = get_pricing_engine().quote_one({"restaurant": restaurant_name, "items": items})
+    subtotal, discount, delivery_fee, total = quote["subtotal"], quote["discount"], quote["delivery_fee"], quote["total"]
     
     # Generate a random ETA (in a real implementation, this would be calculated based on restaurant preparation time and distance)
     eta_minutes = random.randint(30, 45)
@@ -332,35 +237,17 @@ def generate_order_summary(restaurant_name: str, items: list, postal_code: str,
         eta_time = current_time + timedelta(minutes=eta_minutes)
         formatted_delivery_time = eta_time.strftime("%I:%M %p")
     
-    # Create a formatted summary
+    # The LLM writes the summary shown to the user from these fields
     summary = {
         "restaurant": restaurant_name,
         "items": items,
         "postal_code": postal_code,
         "delivery_time": formatted_delivery_time,
-        "subtotal": round(subtotal, 2),
-        "discount": round(discount, 2),
-        "delivery_fee": round(delivery_fee, 2),
-        "total": round(total, 2),
+        "subtotal": subtotal,
+        "discount": discount,
+        "delivery_fee": delivery_fee,
+        "total": total,
         "eta_minutes": eta_minutes,
-        "formatted_summary": f"""
-Order Summary:
--------------
-Restaurant: {restaurant_name}
-Delivery to: {postal_code}
-Scheduled delivery: {formatted_delivery_time}
-Estimated arrival: {eta_minutes} minutes
-
-Items:
-{chr(10).join([f"- {item.get('name', 'Unknown item')}: £{item.get('price', 0):.2f}" for item in items])}
-
-Subtotal: £{round(subtotal, 2)}
-Discount: £{round(discount, 2)}
-Delivery fee: £{round(delivery_fee, 2)}
-Total: £{round(total, 2)}
-
-Please confirm if this order summary is correct.
-"""
     }
     
     return summary
@@ -376,22 +263,20 @@ class ChatbotCrew:
 
     @agent
     def assistant(self) -> Agent:
-        # Hardcoded keyword-to-result mapping for demo
-        self.keyword_map = {
-            "pizza": [{"name": "Margherita Pizza", "price": 10.99, "restaurant": "Pizza Place", "rating": 4.5}],
-            "sushi": [{"name": "Salmon Sushi Set", "price": 15.99, "restaurant": "Sushi Bar", "rating": 4.7}],
-            "burger": [{"name": "Classic Burger", "price": 9.99, "restaurant": "Burger Joint", "rating": 4.3}],
-        }
         return Agent(
             config=self.agents_config["assistant"],
+            # None keeps the configured model; LLM_PROVIDER=fake swaps in the offline stand-in
+            llm=create_llm_override(),
             verbose=True,
             tools=[
                 food_search, 
                 save_user_preferences, 
                 search_restaurants, 
+                search_all_platforms,
                 get_restaurant_menu, 
                 add_to_cart, 
                 calculate_total, 
+                compare_cart_prices,
                 generate_order_summary,
                 process_order, 
                 pay_order
@@ -406,7 +291,7 @@ class ChatbotCrew:
     def crew(self) -> Crew:
         """Creates the chatbot crew"""
 
-        print("Registered tools:", self.assistant().tools)
+        logging.debug(f"Registered tools: {[tool.name for agent in self.agents for tool in agent.tools]}")
 
         return Crew(
             agents=self.agents,
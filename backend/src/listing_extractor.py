@@ -0,0 +1,311 @@
+"""
+Deterministic extraction of restaurant listings from a search results page.
+
+The scraper's fast path loads one search results page and reads the listings
+straight out of it instead of having a browser agent click through every
+restaurant. Extraction tries, in order, the JSON the page embeds for its own
+rendering (Next.js data and JSON-LD) and then the listing cards in the DOM.
+Everything here is pure parsing, so it runs against recorded pages too.
+"""
+import json
+import logging
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional, TypedDict
+from urllib.parse import urljoin
+
+
+class Listing(TypedDict, total=False):
+    name: str
+    url: str
+    rating: float
+    rating_count: int
+    eta_min_minutes: int
+    eta_max_minutes: int
+    delivery_fee: float
+    price: float
+    platform: str
+
+
+_NAME_KEYS = ("name", "title", "restaurantName")
+_URL_KEYS = ("url", "href", "link", "uri", "menuUrl")
+_RATING_KEYS = ("rating", "ratingValue", "starRating", "aggregateRating")
+_RATING_COUNT_KEYS = ("ratingCount", "reviewCount", "rating_count", "numRatings")
+_ETA_KEYS = ("eta", "etaRange", "deliveryTime", "delivery_time", "estimatedDeliveryTime")
+_FEE_KEYS = ("deliveryFee", "delivery_fee", "fee")
+_PRICE_KEYS = ("price", "minimumOrder", "minOrder")
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_ETA_RANGE_RE = re.compile(r"(\d+)\s*(?:-|–|to)\s*(\d+)\s*min", re.I)
+_ETA_SINGLE_RE = re.compile(r"(\d+)\s*min", re.I)
+_RATING_RE = re.compile(r"\b([0-5]\.\d)\b(?:\s*·?\s*\((\d[\d,]*)\+?\))?")
+_FEE_RE = re.compile(r"£\s*(\d+(?:\.\d{1,2})?)\s*delivery", re.I)
+_FREE_DELIVERY_RE = re.compile(r"free delivery", re.I)
+_PRICE_RE = re.compile(r"£\s*(\d+(?:\.\d{1,2})?)")
+
+_SCRIPT_RE = re.compile(
+    r"<script[^>]*?(?:id=[\"']__NEXT_DATA__[\"']|type=[\"']application/(?:ld\+)?json[\"'])[^>]*>(.*?)</script>",
+    re.S | re.I,
+)
+
+
+def _first(record: Dict[str, Any], keys: Iterable[str]) -> Any:
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Read a number from a number, a "£1.99"-style string or an amount dict."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = _NUMBER_RE.search(value.replace(",", ""))
+        return float(match.group()) if match else None
+    if isinstance(value, dict):
+        if "fractional" in value:
+            fractional = _to_float(value["fractional"])
+            return fractional / 100 if fractional is not None else None
+        return _to_float(_first(value, ("value", "amount", "ratingValue", "formatted", "text")))
+    return None
+
+
+def _eta_range(value: Any) -> Optional[List[int]]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return [int(value), int(value)]
+    if isinstance(value, dict):
+        low = _to_float(_first(value, ("min", "minimum", "lower", "from")))
+        high = _to_float(_first(value, ("max", "maximum", "upper", "to")))
+        if low is not None or high is not None:
+            low = low if low is not None else high
+            high = high if high is not None else low
+            return [int(low), int(high)]
+        return _eta_range(_first(value, ("text", "formatted", "label")))
+    if isinstance(value, str):
+        match = _ETA_RANGE_RE.search(value)
+        if match:
+            return [int(match.group(1)), int(match.group(2))]
+        match = _ETA_SINGLE_RE.search(value)
+        if match:
+            return [int(match.group(1)), int(match.group(1))]
+    return None
+
+
+def _listing_from_json(record: Dict[str, Any], base_url: str) -> Optional[Listing]:
+    """Build a listing from a JSON object if it looks like a restaurant card."""
+    name = _first(record, _NAME_KEYS)
+    if not isinstance(name, str) or not name.strip():
+        return None
+
+    listing = Listing(name=name.strip())
+    url = _first(record, _URL_KEYS)
+    if isinstance(url, str):
+        listing["url"] = urljoin(base_url, url)
+
+    rating = _first(record, _RATING_KEYS)
+    if isinstance(rating, dict):
+        count = _to_float(_first(rating, _RATING_COUNT_KEYS + ("count",)))
+        if count is not None:
+            listing["rating_count"] = int(count)
+    rating_value = _to_float(rating)
+    if rating_value is not None and 0 <= rating_value <= 5:
+        listing["rating"] = rating_value
+    if "rating_count" not in listing:
+        count = _to_float(_first(record, _RATING_COUNT_KEYS))
+        if count is not None:
+            listing["rating_count"] = int(count)
+
+    eta = _eta_range(_first(record, _ETA_KEYS))
+    if eta:
+        listing["eta_min_minutes"], listing["eta_max_minutes"] = eta
+
+    fee = _first(record, _FEE_KEYS)
+    if isinstance(fee, str) and _FREE_DELIVERY_RE.search(fee):
+        listing["delivery_fee"] = 0.0
+    else:
+        fee_value = _to_float(fee)
+        if fee_value is not None:
+            listing["delivery_fee"] = fee_value
+
+    price = _to_float(_first(record, _PRICE_KEYS))
+    if price is not None:
+        listing["price"] = price
+
+    # A name alone matches all sorts of objects; require some listing details
+    details = sum(key in listing for key in ("url", "rating", "eta_min_minutes", "delivery_fee"))
+    return listing if details >= 2 else None
+
+
+def _walk(value: Any) -> Iterable[Dict[str, Any]]:
+    stack = [value]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield current
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+
+
+def extract_from_json(html: str, base_url: str = "") -> List[Listing]:
+    """
+    Extract listings from the JSON embedded in a page.
+
+    Args:
+        html: Page HTML
+        base_url: URL of the page, used to resolve relative links
+
+    Returns:
+        List[Listing]: Listings in page order
+    """
+    listings: List[Listing] = []
+    for match in _SCRIPT_RE.finditer(html):
+        try:
+            data = json.loads(match.group(1))
+        except ValueError:
+            continue
+        for record in _walk(data):
+            listing = _listing_from_json(record, base_url)
+            if listing is not None:
+                listings.append(listing)
+    return listings
+
+
+class _CardParser(HTMLParser):
+    """Collects the text of every link pointing at a restaurant menu."""
+
+    def __init__(self, link_pattern: re.Pattern):
+        super().__init__()
+        self.link_pattern = link_pattern
+        self.cards: List[Dict[str, Any]] = []
+        self._depth = 0
+        self._current: Optional[Dict[str, Any]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if self._current is not None:
+            if tag == "a":
+                self._depth += 1
+            return
+        href = dict(attrs).get("href") or ""
+        if tag == "a" and self.link_pattern.search(href):
+            self._current = {"href": href, "text": []}
+            self._depth = 1
+
+    def handle_endtag(self, tag):
+        if self._current is None or tag != "a":
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            self.cards.append(self._current)
+            self._current = None
+
+    def handle_data(self, data):
+        if self._current is not None and data.strip():
+            self._current["text"].append(data.strip())
+
+
+def extract_from_dom(html: str, base_url: str = "", link_pattern: str = r"/menu/") -> List[Listing]:
+    """
+    Extract listings from the restaurant cards in the page markup.
+
+    Args:
+        html: Page HTML
+        base_url: URL of the page, used to resolve relative links
+        link_pattern: Regular expression matching links to restaurant pages
+
+    Returns:
+        List[Listing]: Listings in page order
+    """
+    parser = _CardParser(re.compile(link_pattern))
+    parser.feed(html)
+    parser.close()
+
+    listings: List[Listing] = []
+    for card in parser.cards:
+        texts = card["text"]
+        name = next((text for text in texts if not _NUMBER_RE.fullmatch(text)), None)
+        if not name:
+            continue
+        listing = Listing(name=name, url=urljoin(base_url, card["href"]))
+        details = " · ".join(texts[1:])
+
+        rating = _RATING_RE.search(details)
+        if rating:
+            listing["rating"] = float(rating.group(1))
+            if rating.group(2):
+                listing["rating_count"] = int(rating.group(2).replace(",", ""))
+        eta = _eta_range(details)
+        if eta:
+            listing["eta_min_minutes"], listing["eta_max_minutes"] = eta
+        fee = _FEE_RE.search(details)
+        if fee:
+            listing["delivery_fee"] = float(fee.group(1))
+        elif _FREE_DELIVERY_RE.search(details):
+            listing["delivery_fee"] = 0.0
+        price = _PRICE_RE.search(_FEE_RE.sub("", details))
+        if price:
+            listing["price"] = float(price.group(1))
+        listings.append(listing)
+    return listings
+
+
+def _dedupe(listings: Iterable[Listing]) -> List[Listing]:
+    seen = set()
+    unique: List[Listing] = []
+    for listing in listings:
+        key = listing.get("url") or listing["name"].lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(listing)
+    return unique
+
+
+def extract_listings(html: str, base_url: str = "", platform: str = "Deliveroo", limit: int = 10) -> List[Listing]:
+    """
+    Extract restaurant listings from a search results page.
+
+    Args:
+        html: Page HTML
+        base_url: URL of the page, used to resolve relative links
+        platform: Platform name recorded on each listing
+        limit: Maximum number of listings
+
+    Returns:
+        List[Listing]: Listings in page order; empty when nothing could be extracted
+    """
+    listings = _dedupe(extract_from_json(html, base_url))
+    if not listings:
+        listings = _dedupe(extract_from_dom(html, base_url))
+    logging.debug(f"Extracted {len(listings)} listings from {base_url or 'page'}")
+    for listing in listings:
+        listing["platform"] = platform
+    return listings[:limit]
+
+
+def records_from_agent_result(value: Any) -> List[Dict[str, Any]]:
+    """
+    Coerce browser agent output into a list of records.
+
+    Args:
+        value: An agent history, a JSON string, a dict or a list
+
+    Returns:
+        List[Dict[str, Any]]: The records, without error entries
+    """
+    if hasattr(value, "final_result"):
+        value = value.final_result()
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    if isinstance(value, dict):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [record for record in value if isinstance(record, dict) and "error" not in record]
@@ -8,8 +8,8 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 # Import shared utilities
-from shared.config import load_env
-from shared.memory import memory, format_context
+from shared.config import load_env, get_memory_user_id
+from shared.memory import get_memory, warm_up_memory, format_context, MemoryWriteQueue
 from shared.logger import setup_logger
 
 # Load environment variables
@@ -24,7 +24,24 @@ def run():
     print("Starting Agent Eat CLI chatbot...")
     print("Type 'exit', 'quit', or 'bye' to exit.")
     print("-" * 50)
-    
+
+    # Open the vector store before the first turn rather than during it
+    warm_up_memory()
+
+    # Memory additions are written in the background; only the search blocks a turn
+    memory_writer = MemoryWriteQueue(get_memory())
+
+    # Build the crew once; each turn runs on a copy with fresh task state that
+    # shares the parsed agent config and tool objects
+    crew_template = ChatbotCrew().crew()
+    try:
+        _chat_loop(memory_writer, crew_template)
+    finally:
+        memory_writer.close()
+
+def _chat_loop(memory_writer, crew_template):
+    """Read user input and answer it until the user exits."""
+    user_id = get_memory_user_id()
     while True:
         user_input = input("You: ")
         if user_input.lower() in ["exit", "quit", "bye"]:
@@ -33,11 +50,12 @@ def run():
 
         try:
             # Add user input to memory
-            memory.add(f"User: {user_input}", user_id="user")
-            logger.debug(f"Added user input to memory: {user_input}")
+            memory_writer.add(f"User: {user_input}", user_id=user_id)
+            logger.debug(f"Queued user input for memory: {user_input}")
 
             # Retrieve relevant information from vector store
-            relevant_info = memory.search(query=user_input, limit=3, user_id="user")
+            # Only this user's history is searched
+            relevant_info = get_memory().search(query=user_input, limit=3, user_id=user_id)
             context = format_context(relevant_info)
             logger.debug(f"Retrieved context: {context[:100]}...")
 
@@ -46,15 +64,15 @@ def run():
                 "context": f"{context}",
             }
 
-            # Create a new crew instance for each response to avoid state issues
-            response = ChatbotCrew().crew().kickoff(inputs=inputs)
+            # Run a fresh copy of the crew for each response to avoid state issues
+            response = crew_template.copy().kickoff(inputs=inputs)
             
             # Convert response to string first if needed
             response_str = str(response)
             logger.debug(f"Generated response: {response_str[:100] if len(response_str) > 100 else response_str}...")
 
             # Add chatbot response to memory
-            memory.add(f"Assistant: {response_str}", user_id="assistant")
+            memory_writer.add(f"Assistant: {response_str}", user_id=f"{user_id}:assistant")
             print(f"Assistant: {response_str}")
             
         except Exception as e:
@@ -0,0 +1,161 @@
+"""
+Search coordinator that queries every delivery platform at once.
+
+Each platform is wrapped in an adapter. ``search_all_platforms`` runs the
+adapters concurrently under one global deadline and merges whatever came
+back in time, so a comparison takes as long as the slowest platform that
+answered rather than the sum of all of them. Platforms that failed or missed
+the deadline are reported, and the result is flagged as partial.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence, TypedDict
+
+from shared.config import get_platform_search_deadline, is_live_scraping_enabled
+
+from .catalog import get_catalog, normalize_name
+
+
+class PlatformStatus(TypedDict, total=False):
+    status: str  # "ok", "error" or "timeout"
+    count: int
+    duration_ms: float
+    error: str
+
+
+class PlatformSearchResult(TypedDict):
+    results: List[Dict[str, Any]]
+    platforms: Dict[str, PlatformStatus]
+    partial: bool
+
+
+class PlatformAdapter:
+    """Searches one delivery platform."""
+
+    name = "platform"
+
+    async def search(self, postal_code: str, keywords: str) -> List[Dict[str, Any]]:
+        """Return result records (dishes or restaurants) for a search."""
+        raise NotImplementedError
+
+
+class CatalogAdapter(PlatformAdapter):
+    """Answers from the local restaurant catalog for one platform."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    async def search(self, postal_code: str, keywords: str) -> List[Dict[str, Any]]:
+        return get_catalog().restaurants_by_keywords(keywords, platform=self.name, limit=10)
+
+
+class DeliverooScraperAdapter(PlatformAdapter):
+    """Drives the live Deliveroo site through the pooled, cached scraper."""
+
+    name = "Deliveroo"
+
+    async def search(self, postal_code: str, keywords: str) -> List[Dict[str, Any]]:
+        from .uber_eats_scraper import scrape_ubereats
+
+        return await scrape_ubereats(postal_code, keywords)
+
+
+def default_adapters() -> List[PlatformAdapter]:
+    """
+    Build the adapters for every supported platform.
+
+    Returns:
+        List[PlatformAdapter]: Live scrapers where enabled, catalog adapters otherwise
+    """
+    deliveroo = DeliverooScraperAdapter() if is_live_scraping_enabled() else CatalogAdapter("Deliveroo")
+    return [CatalogAdapter("UberEats"), deliveroo, CatalogAdapter("Just Eat")]
+
+
+def _dedupe_key(platform: str, record: Dict[str, Any]):
+    restaurant = record.get("restaurant") or record.get("name") or ""
+    item = record.get("name") if record.get("restaurant") else ""
+    return platform, normalize_name(str(restaurant)), normalize_name(str(item or ""))
+
+
+def merge_results(results_by_platform: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Merge per-platform results, tagging each record with its platform.
+
+    Args:
+        results_by_platform: Records returned by each platform, in adapter order
+
+    Returns:
+        List[Dict[str, Any]]: De-duplicated records, interleaving each platform's best
+        matches first and ordering each rank by rating
+    """
+    merged: Dict[Any, Any] = {}
+    for platform, records in results_by_platform.items():
+        for rank, record in enumerate(records):
+            key = _dedupe_key(platform, record)
+            if key not in merged:
+                merged[key] = (rank, {**record, "platform": platform})
+    # Stable sort keeps adapter order among equally ranked, equally rated records
+    ordered = sorted(merged.values(), key=lambda item: (item[0], -(item[1].get("rating") or 0)))
+    return [record for _, record in ordered]
+
+
+async def _timed_search(adapter: PlatformAdapter, postal_code: str, keywords: str):
+    start = time.perf_counter()
+    records = await adapter.search(postal_code, keywords)
+    return records, (time.perf_counter() - start) * 1000
+
+
+async def search_all_platforms(
+    postal_code: str,
+    keywords: str,
+    adapters: Optional[Sequence[PlatformAdapter]] = None,
+    deadline: Optional[float] = None,
+) -> PlatformSearchResult:
+    """
+    Search every platform concurrently and merge the answers that arrive in time.
+
+    Args:
+        postal_code: Delivery postcode
+        keywords: Search keywords
+        adapters: Platforms to query; defaults to ``default_adapters()``
+        deadline: Seconds to wait for platforms; defaults to PLATFORM_SEARCH_DEADLINE_SECONDS
+
+    Returns:
+        PlatformSearchResult: Merged results plus a status per platform
+    """
+    adapters = list(adapters) if adapters is not None else default_adapters()
+    deadline = deadline if deadline is not None else get_platform_search_deadline()
+
+    tasks = {
+        asyncio.ensure_future(_timed_search(adapter, postal_code, keywords)): adapter
+        for adapter in adapters
+    }
+    done, pending = await asyncio.wait(tasks, timeout=deadline) if tasks else (set(), set())
+    for task in pending:
+        task.cancel()
+
+    results_by_platform: Dict[str, List[Dict[str, Any]]] = {}
+    platforms: Dict[str, PlatformStatus] = {}
+    for task, adapter in tasks.items():
+        if task in pending:
+            logging.warning(f"Platform search on {adapter.name} missed the {deadline}s deadline")
+            platforms[adapter.name] = PlatformStatus(status="timeout", count=0)
+        elif task.exception() is not None:
+            logging.warning(f"Platform search on {adapter.name} failed: {str(task.exception())}")
+            platforms[adapter.name] = PlatformStatus(status="error", count=0, error=str(task.exception()))
+        else:
+            records, duration_ms = task.result()
+            results_by_platform[adapter.name] = records
+            platforms[adapter.name] = PlatformStatus(status="ok", count=len(records), duration_ms=duration_ms)
+
+    return PlatformSearchResult(
+        results=merge_results(results_by_platform),
+        platforms=platforms,
+        partial=any(status["status"] != "ok" for status in platforms.values()),
+    )
+
+
+def search_all_platforms_sync(postal_code: str, keywords: str, **kwargs: Any) -> PlatformSearchResult:
+    """Blocking variant of ``search_all_platforms`` for synchronous callers such as crew tools."""
+    return asyncio.run(search_all_platforms(postal_code, keywords, **kwargs))
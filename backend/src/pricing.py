@@ -0,0 +1,407 @@
+"""
+Pricing engine shared by the cart tools.
+
+Carts are priced in batches: every cart in a call is reduced to a subtotal
+first, then the fee tiers, promotions and minimum-order rules of each rule
+set are applied to all of its carts in one pass. Comparing dozens of
+candidate carts across restaurants and platforms is therefore a single
+computation, and the single-cart tools use the same code so their numbers
+always agree.
+
+Rules per cart, in order:
+1. Combos replace a set of items with a bundle price.
+2. The delivery fee comes from the highest fee tier the subtotal reaches.
+3. The promotion saving the most is applied; it may also set its own delivery fee.
+4. Carts below the minimum order pay the small-order fee and rank last.
+"""
+import bisect
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, TypedDict, Union
+
+from .catalog import Catalog, get_catalog, normalize_name
+
+
+class FeeTier(TypedDict):
+    min_subtotal: float
+    fee: float
+
+
+class Promotion(TypedDict, total=False):
+    name: str
+    min_subtotal: float
+    percent_off: float  # fraction of the subtotal, e.g. 0.15
+    amount_off: float
+    delivery_fee: float  # charged instead of the tier fee while the promotion applies
+
+
+class Combo(TypedDict):
+    name: str
+    items: List[str]
+    price: float
+
+
+class CartItem(TypedDict, total=False):
+    name: str
+    price: float
+    quantity: int
+
+
+class Cart(TypedDict, total=False):
+    restaurant: str
+    platform: str
+    items: List[CartItem]
+
+
+class Quote(TypedDict, total=False):
+    restaurant: str
+    platform: str
+    items: List[CartItem]
+    subtotal: float
+    combo_savings: float
+    discount: float
+    delivery_fee: float
+    small_order_fee: float
+    total: float
+    promotion: str
+    meets_minimum: bool
+
+
+def _quantity(value: Any) -> int:
+    """Read a quantity as a positive whole number; missing or unreadable values count as one."""
+    try:
+        return max(1, int(value or 1))
+    except (TypeError, ValueError):
+        try:
+            return max(1, int(float(value)))
+        except (TypeError, ValueError, OverflowError):
+            logging.warning(f"Ignoring unreadable item quantity {value!r}")
+            return 1
+
+
+def _price(value: Any) -> float:
+    """Read a price as a float; missing or unreadable values count as zero."""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        logging.warning(f"Ignoring unreadable item price {value!r}")
+        return 0.0
+
+
+def _normalize_item(item: Any) -> CartItem:
+    """
+    Coerce a cart item from a tool call into a well-typed ``CartItem``.
+
+    The LLM fills cart items in, so quantities may arrive as strings or None
+    and prices as strings; bare strings are taken as item names.
+
+    Args:
+        item: A cart item dict, or an item name
+
+    Returns:
+        CartItem: The item with a float price and a quantity of at least one
+    """
+    if not isinstance(item, dict):
+        return CartItem(name=str(item), price=0.0, quantity=1)
+    normalized: CartItem = {
+        **item,
+        "name": str(item.get("name") or ""),
+        "price": _price(item.get("price")),
+        "quantity": _quantity(item.get("quantity")),
+    }
+    return normalized
+
+
+class PricingRules:
+    """Fee tiers, promotions, combos and minimum order for one platform or restaurant."""
+
+    def __init__(
+        self,
+        fee_tiers: Optional[Sequence[FeeTier]] = None,
+        promotions: Optional[Sequence[Promotion]] = None,
+        combos: Optional[Sequence[Combo]] = None,
+        minimum_order: float = 0.0,
+        small_order_fee: float = 0.0,
+    ):
+        """
+        Initialize the rules.
+
+        Args:
+            fee_tiers: Delivery fee by minimum subtotal; defaults to a flat £2.99
+            promotions: Candidate promotions; the one saving the most applies
+            combos: Bundles of item names sold for a fixed price
+            minimum_order: Subtotal below which the small-order fee is charged
+            small_order_fee: Surcharge for carts below the minimum order
+        """
+        tiers = sorted(fee_tiers or [FeeTier(min_subtotal=0.0, fee=2.99)], key=lambda tier: tier["min_subtotal"])
+        self._tier_thresholds = [tier["min_subtotal"] for tier in tiers]
+        self._tier_fees = [tier["fee"] for tier in tiers]
+        self.promotions = sorted(promotions or [], key=lambda promotion: promotion.get("min_subtotal", 0.0))
+        self._promotion_thresholds = [promotion.get("min_subtotal", 0.0) for promotion in self.promotions]
+        self.combos = [
+            (combo["name"], Counter(normalize_name(item) for item in combo["items"]), combo["price"])
+            for combo in combos or []
+        ]
+        self.minimum_order = minimum_order
+        self.small_order_fee = small_order_fee
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PricingRules":
+        """Build rules from their JSON form (the keys of ``__init__``)."""
+        return cls(
+            fee_tiers=data.get("fee_tiers"),
+            promotions=data.get("promotions"),
+            combos=data.get("combos"),
+            minimum_order=data.get("minimum_order", 0.0),
+            small_order_fee=data.get("small_order_fee", 0.0),
+        )
+
+    def _combo_savings(self, items: Sequence[CartItem]) -> float:
+        if not self.combos:
+            return 0.0
+        # Cheapest unit price per item name, so a combo never costs more than its parts
+        counts: Counter = Counter()
+        prices: Dict[str, float] = {}
+        for item in items:
+            name = normalize_name(item["name"])
+            counts[name] += item["quantity"]
+            prices[name] = min(prices.get(name, item["price"]), item["price"])
+        savings = 0.0
+        for _, needed, price in self.combos:
+            times = min(counts[name] // count for name, count in needed.items())
+            if times <= 0:
+                continue
+            saving = sum(prices[name] * count for name, count in needed.items()) - price
+            if saving <= 0:
+                continue
+            for name, count in needed.items():
+                counts[name] -= count * times
+            savings += saving * times
+        return savings
+
+    def quote_many(self, carts: Sequence[Cart]) -> List[Quote]:
+        """
+        Price carts that share these rules.
+
+        Args:
+            carts: Carts to price
+
+        Returns:
+            List[Quote]: One quote per cart, in input order
+        """
+        cart_items = [[_normalize_item(item) for item in cart.get("items") or []] for cart in carts]
+        subtotals = [sum(item["price"] * item["quantity"] for item in items) for items in cart_items]
+        combo_savings = [self._combo_savings(items) for items in cart_items]
+        bases = [subtotal - savings for subtotal, savings in zip(subtotals, combo_savings)]
+        tier_fees = [
+            self._tier_fees[max(0, bisect.bisect_right(self._tier_thresholds, base) - 1)] for base in bases
+        ]
+
+        quotes: List[Quote] = []
+        for cart, items, subtotal, savings, base, tier_fee in zip(
+            carts, cart_items, subtotals, combo_savings, bases, tier_fees
+        ):
+            discount, delivery_fee, promotion = 0.0, tier_fee, None
+            # Only promotions whose threshold the cart reaches are considered
+            for candidate in self.promotions[:bisect.bisect_right(self._promotion_thresholds, base)]:
+                candidate_discount = min(
+                    base, base * candidate.get("percent_off", 0.0) + candidate.get("amount_off", 0.0)
+                )
+                candidate_fee = candidate.get("delivery_fee", tier_fee)
+                if candidate_discount + tier_fee - candidate_fee > discount + tier_fee - delivery_fee:
+                    discount, delivery_fee, promotion = candidate_discount, candidate_fee, candidate
+            meets_minimum = base >= self.minimum_order
+            small_order_fee = 0.0 if meets_minimum else self.small_order_fee
+            total = base - discount + delivery_fee + small_order_fee
+
+            quote = Quote(
+                restaurant=cart.get("restaurant", ""),
+                platform=cart.get("platform", ""),
+                items=items,
+                subtotal=round(subtotal, 2),
+                combo_savings=round(savings, 2),
+                discount=round(discount, 2),
+                delivery_fee=round(delivery_fee, 2),
+                small_order_fee=round(small_order_fee, 2),
+                total=round(total, 2),
+                meets_minimum=meets_minimum,
+            )
+            if promotion is not None:
+                quote["promotion"] = promotion.get("name", "")
+            quotes.append(quote)
+        return quotes
+
+
+# The house offer: 15% off and cheaper delivery on orders of £18 or more
+DEFAULT_RULES = PricingRules(
+    fee_tiers=[FeeTier(min_subtotal=0.0, fee=2.99)],
+    promotions=[Promotion(name="15% off orders of £18 or more", min_subtotal=18.0, percent_off=0.15, delivery_fee=1.69)],
+)
+
+
+class PricingEngine:
+    """Chooses the rules for each cart and prices carts in batches."""
+
+    def __init__(
+        self,
+        default_rules: PricingRules = DEFAULT_RULES,
+        platform_rules: Optional[Dict[str, PricingRules]] = None,
+        restaurant_rules: Optional[Dict[str, PricingRules]] = None,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            default_rules: Rules for carts without a more specific rule set
+            platform_rules: Rules by platform name
+            restaurant_rules: Rules by restaurant name, taking precedence over the platform's
+        """
+        self.default_rules = default_rules
+        self.platform_rules = {normalize_name(name): rules for name, rules in (platform_rules or {}).items()}
+        self.restaurant_rules = {normalize_name(name): rules for name, rules in (restaurant_rules or {}).items()}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PricingEngine":
+        """
+        Build an engine from the "pricing" section of the catalog.
+
+        Args:
+            config: {"default": rules, "platforms": {name: rules}, "restaurants": {name: rules}}
+
+        Returns:
+            PricingEngine: The engine; missing sections fall back to ``DEFAULT_RULES``
+        """
+        default = PricingRules.from_dict(config["default"]) if config.get("default") else DEFAULT_RULES
+        return cls(
+            default,
+            {name: PricingRules.from_dict(rules) for name, rules in config.get("platforms", {}).items()},
+            {name: PricingRules.from_dict(rules) for name, rules in config.get("restaurants", {}).items()},
+        )
+
+    def rules_for(self, cart: Cart) -> PricingRules:
+        """Return the rules that apply to a cart."""
+        rules = self.restaurant_rules.get(normalize_name(cart.get("restaurant") or ""))
+        if rules is None:
+            rules = self.platform_rules.get(normalize_name(cart.get("platform") or ""))
+        return rules if rules is not None else self.default_rules
+
+    def quote(self, carts: Sequence[Cart]) -> List[Quote]:
+        """
+        Price many carts at once.
+
+        Args:
+            carts: Carts to price
+
+        Returns:
+            List[Quote]: One quote per cart, in input order
+        """
+        groups: Dict[int, Tuple[PricingRules, List[int]]] = {}
+        for index, cart in enumerate(carts):
+            rules = self.rules_for(cart)
+            groups.setdefault(id(rules), (rules, []))[1].append(index)
+
+        quotes: List[Optional[Quote]] = [None] * len(carts)
+        for rules, indexes in groups.values():
+            for index, quote in zip(indexes, rules.quote_many([carts[index] for index in indexes])):
+                quotes[index] = quote
+        return quotes
+
+    def quote_one(self, cart: Cart) -> Quote:
+        """Price a single cart."""
+        return self.quote([cart])[0]
+
+    def compare(self, carts: Sequence[Cart], limit: Optional[int] = None) -> List[Quote]:
+        """
+        Price carts and rank them, cheapest first.
+
+        Args:
+            carts: Candidate carts
+            limit: Maximum number of quotes returned
+
+        Returns:
+            List[Quote]: Quotes meeting their minimum order first, then by total
+        """
+        ranked = sorted(
+            self.quote(carts),
+            key=lambda quote: (not quote["meets_minimum"], quote["total"], quote["restaurant"], quote["platform"]),
+        )
+        return ranked[:limit] if limit is not None else ranked
+
+
+WantedItem = Union[str, Dict[str, Any]]
+
+
+def _wanted(item: WantedItem) -> Tuple[str, int]:
+    if isinstance(item, dict):
+        return str(item.get("name") or ""), _quantity(item.get("quantity"))
+    return str(item), 1
+
+
+def build_candidate_carts(
+    wanted_items: Iterable[WantedItem], catalog: Optional[Catalog] = None, platform: Optional[str] = None
+) -> Tuple[List[Cart], List[str]]:
+    """
+    Build one cart per restaurant and platform that offers every wanted item.
+
+    Each wanted item is filled with the cheapest matching offer at that
+    restaurant. Offers from restaurants that are not on a delivery platform
+    are skipped, as they cannot be ordered through any of them.
+
+    Args:
+        wanted_items: Item names or keywords, or {"name": ..., "quantity": ...} dicts
+        catalog: Catalog to search; defaults to the process-wide catalog
+        platform: Only build carts on this delivery platform
+
+    Returns:
+        Tuple[List[Cart], List[str]]: The candidate carts, and the wanted items no restaurant offers
+    """
+    catalog = catalog or get_catalog()
+    wanted = [_wanted(item) for item in wanted_items]
+
+    # (restaurant, platform) -> cheapest offer per wanted item
+    cheapest: Dict[Tuple[str, str], Dict[int, Dict[str, Any]]] = defaultdict(dict)
+    missing = []
+    for position, (name, _) in enumerate(wanted):
+        offers = [offer for offer in catalog.find_offers(name, platform=platform) if offer.get("platform")]
+        if not offers:
+            missing.append(name)
+        for offer in offers:
+            key = (offer["restaurant"], offer["platform"])
+            current = cheapest[key].get(position)
+            if current is None or offer["price"] < current["price"]:
+                cheapest[key][position] = offer
+
+    carts: List[Cart] = []
+    for (restaurant, offer_platform), chosen in cheapest.items():
+        if len(chosen) < len(wanted):
+            continue
+        carts.append(Cart(
+            restaurant=restaurant,
+            platform=offer_platform,
+            items=[
+                CartItem(name=chosen[position]["name"], price=chosen[position]["price"], quantity=quantity)
+                for position, (_, quantity) in enumerate(wanted)
+            ],
+        ))
+    logging.debug(f"Built {len(carts)} candidate carts for {len(wanted)} wanted items")
+    return carts, missing
+
+
+_engine: Optional[PricingEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_pricing_engine() -> PricingEngine:
+    """
+    Return the process-wide pricing engine, built on first use.
+
+    Returns:
+        PricingEngine: The engine configured from the catalog's "pricing" section
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = PricingEngine.from_config(get_catalog().pricing)
+    return _engine
@@ -0,0 +1,191 @@
+"""
+Record and replay delivery-site pages for offline scraper runs.
+
+``PageRecorder`` saves the documents and JSON responses a browser receives
+into a fixture directory. ``ReplayServer`` serves those fixtures over local
+HTTP, so pointing DELIVEROO_BASE_URL at it lets the scraper (and its
+benchmark) run repeatably without touching the live site.
+
+Fixture layout: ``index.json`` maps "path?query" to the stored response
+(file name, status, content type); bodies live next to it.
+"""
+import hashlib
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+INDEX_FILE = "index.json"
+
+# Responses worth replaying; images, fonts and scripts are left out
+_RECORDED_TYPES = ("document", "xhr", "fetch")
+
+
+def fixture_key(url: str) -> str:
+    """
+    Key a URL by path and query, so fixtures replay under any host.
+
+    Args:
+        url: Absolute or relative URL
+
+    Returns:
+        str: "path?query" (or just the path)
+    """
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+def load_index(directory: Path) -> Dict[str, Dict[str, Any]]:
+    """Read a fixture directory's index, or return an empty one."""
+    try:
+        with open(directory / INDEX_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+class PageRecorder:
+    """Saves the responses a browser receives as replay fixtures."""
+
+    def __init__(self, directory: str):
+        """
+        Initialize the recorder.
+
+        Args:
+            directory: Fixture directory, created if needed
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index = load_index(self.directory)
+        self._lock = threading.Lock()
+
+    def record(self, url: str, body: bytes, status: int = 200, content_type: str = "text/html") -> None:
+        """
+        Store one response.
+
+        Args:
+            url: URL the response was served from
+            body: Response body
+            status: HTTP status code
+            content_type: Value of the Content-Type header
+        """
+        key = fixture_key(url)
+        file_name = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16] + ".body"
+        (self.directory / file_name).write_bytes(body)
+        with self._lock:
+            self._index[key] = {"file": file_name, "status": status, "content_type": content_type}
+            with open(self.directory / INDEX_FILE, "w", encoding="utf-8") as f:
+                json.dump(self._index, f, indent=2, sort_keys=True)
+        logging.debug(f"Recorded {key} ({len(body)} bytes)")
+
+    async def _on_response(self, response) -> None:
+        if response.request.resource_type not in _RECORDED_TYPES:
+            return
+        try:
+            body = await response.body()
+        except Exception as e:
+            # Redirects and aborted requests have no body
+            logging.debug(f"Skipping recording of {response.url}: {str(e)}")
+            return
+        headers = response.headers
+        self.record(response.url, body, response.status, headers.get("content-type", "text/html"))
+
+    def attach(self, playwright_context) -> None:
+        """
+        Record every page loaded in a Playwright browser context.
+
+        Args:
+            playwright_context: A Playwright ``BrowserContext``
+        """
+        playwright_context.on("response", self._on_response)
+
+
+class ReplayServer:
+    """Local HTTP stand-in for a delivery site, serving recorded fixtures."""
+
+    def __init__(self, directory: str, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize the server; ``start`` binds it.
+
+        Args:
+            directory: Fixture directory written by ``PageRecorder``
+            host: Interface to bind to
+            port: Port to bind to, or 0 for any free port
+        """
+        self.directory = Path(directory)
+        self.index = load_index(self.directory)
+        # First recording of each path, for requests whose query differs
+        self._by_path: Dict[str, Dict[str, Any]] = {}
+        for key, entry in sorted(self.index.items()):
+            self._by_path.setdefault(key.split("?", 1)[0], entry)
+        self.host = host
+        self.port = port
+        self.pages_served = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    def _lookup(self, path: str) -> Optional[Dict[str, Any]]:
+        entry = self.index.get(fixture_key(path))
+        if entry is None:
+            # Fall back to the same page recorded with a different query
+            entry = self._by_path.get(urlsplit(path).path)
+        return entry
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                entry = server._lookup(self.path)
+                with server._lock:
+                    if entry is None:
+                        server.misses += 1
+                    else:
+                        server.pages_served += 1
+                if entry is None:
+                    self.send_error(404, "No fixture recorded for this URL")
+                    return
+                body = (server.directory / entry["file"]).read_bytes()
+                self.send_response(entry.get("status", 200))
+                self.send_header("Content-Type", entry.get("content_type", "text/html"))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logging.debug(f"Replay server: {format % args}")
+
+        return Handler
+
+    def start(self) -> "ReplayServer":
+        """Start serving in a background thread."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        logging.info(f"Replaying {len(self.index)} recorded responses at {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
@@ -0,0 +1,271 @@
+"""
+Result cache in front of the restaurant scraper.
+
+Searches are keyed by postcode outward code and normalized keywords, so
+"SW1A 1AA / Pizzas" and "sw1a2bb / pizza" share an entry. Entries live in an
+in-memory LRU backed by an optional on-disk tier. A fresh entry is returned
+at once; a stale one (past ``ttl`` but within ``stale_ttl``) is returned at
+once while a single background refresh runs; concurrent misses for the same
+key share one scrape.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from shared.config import (
+    get_cache_dir,
+    get_scrape_cache_max_entries,
+    get_scrape_cache_stale_ttl,
+    get_scrape_cache_ttl,
+    is_scrape_cache_disk_enabled,
+)
+from shared.metrics import registry
+
+from .catalog import tokenize
+
+# Bump when the layout of cached entries changes
+CACHE_FORMAT_VERSION = 1
+
+CACHE_REQUESTS = registry.counter(
+    "agent_eat_scrape_cache_requests_total",
+    "Scraper cache lookups by result (hit, disk_hit, stale, miss, coalesced).",
+    ["result"],
+)
+
+_POSTCODE_RE = re.compile(r"[^A-Z0-9 ]+")
+
+
+def postcode_outward_code(postal_code: str) -> str:
+    """
+    Return the outward code of a UK postcode ("SW1A 1AA" -> "SW1A").
+
+    Args:
+        postal_code: Postcode as typed by the user
+
+    Returns:
+        str: The outward code, or the cleaned input if it does not look like a full postcode
+    """
+    cleaned = _POSTCODE_RE.sub("", postal_code.upper()).strip()
+    if " " in cleaned:
+        return cleaned.split()[0]
+    # The inward code is always one digit and two letters
+    if len(cleaned) >= 5 and cleaned[-3].isdigit() and cleaned[-2:].isalpha():
+        return cleaned[:-3]
+    return cleaned
+
+
+def scrape_cache_key(postal_code: str, keywords: str) -> str:
+    """
+    Build the cache key for a search.
+
+    Args:
+        postal_code: Delivery postcode
+        keywords: Search keywords
+
+    Returns:
+        str: Key made of the outward code and the sorted, stemmed keywords
+    """
+    tokens = sorted(set(tokenize(keywords)))
+    return f"{postcode_outward_code(postal_code)}|{' '.join(tokens)}"
+
+
+def _is_cacheable(value: Any) -> bool:
+    """Skip empty results and error payloads so failures are retried."""
+    if not value:
+        return False
+    if isinstance(value, list) and all(isinstance(v, dict) and "error" in v for v in value):
+        return False
+    if isinstance(value, dict) and "error" in value:
+        return False
+    return True
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value: Any, stored_at: float):
+        self.value = value
+        self.stored_at = stored_at
+
+
+class ScrapeCache:
+    """TTL cache with stale-while-revalidate and single-flight fetches."""
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        disk_dir: Optional[Path] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry is served as fresh
+            stale_ttl: Further seconds a stale entry is served while it is refreshed
+            max_entries: Number of entries kept in memory
+            disk_dir: Directory of the on-disk tier, or None to keep entries in memory only
+        """
+        self.ttl = ttl if ttl is not None else get_scrape_cache_ttl()
+        self.stale_ttl = stale_ttl if stale_ttl is not None else get_scrape_cache_stale_ttl()
+        self.max_entries = max_entries if max_entries is not None else get_scrape_cache_max_entries()
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        # Re-entrant: a scrape that completes immediately stores its result from inside _fetch
+        self._lock = threading.RLock()
+
+    def _disk_path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.disk_dir / f"{digest}.json"
+
+    def _load_from_disk(self, key: str) -> Optional[_Entry]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable scrape cache entry {path}: {str(e)}")
+            return None
+        if cached.get("format") != CACHE_FORMAT_VERSION or cached.get("key") != key:
+            return None
+        return _Entry(cached["value"], cached["stored_at"])
+
+    def _save_to_disk(self, key: str, entry: _Entry) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        try:
+            payload = json.dumps({
+                "format": CACHE_FORMAT_VERSION,
+                "key": key,
+                "stored_at": entry.stored_at,
+                "value": entry.value,
+            })
+        except (TypeError, ValueError):
+            logging.debug(f"Scrape result for '{key}' is not JSON-serializable; kept in memory only")
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write atomically so concurrent processes never read a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logging.warning(f"Could not write scrape cache entry {path}: {str(e)}")
+
+    def _lookup(self, key: str) -> Tuple[Optional[_Entry], str]:
+        """Return an entry and whether it came from memory or disk; callers must hold ``_lock``."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry, "hit"
+        entry = self._load_from_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+            return entry, "disk_hit"
+        return None, "miss"
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _fetch(self, key: str, submit: Callable[[], Future]) -> Future:
+        """Start a fetch unless one is already running; callers must hold ``_lock``."""
+        future = self._inflight.get(key)
+        if future is not None:
+            return future
+        future = submit()
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._store(key, done))
+        return future
+
+    def _store(self, key: str, future: Future) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        value = future.result()
+        if not _is_cacheable(value):
+            return
+        entry = _Entry(value, time.time())
+        with self._lock:
+            self._remember(key, entry)
+        self._save_to_disk(key, entry)
+
+    def get_or_submit(self, key: str, submit: Callable[[], Future]) -> Future:
+        """
+        Return a future for a key's value, scraping only when needed.
+
+        Args:
+            key: Value returned by ``scrape_cache_key``
+            submit: Starts the scrape and returns its future
+
+        Returns:
+            Future: Completed at once on a fresh or stale hit, otherwise the scrape's future
+        """
+        with self._lock:
+            entry, source = self._lookup(key)
+            if entry is not None:
+                age = time.time() - entry.stored_at
+                if age <= self.ttl:
+                    CACHE_REQUESTS.inc(result=source)
+                    return _completed(entry.value)
+                if age <= self.ttl + self.stale_ttl:
+                    CACHE_REQUESTS.inc(result="stale")
+                    self._fetch(key, submit)
+                    return _completed(entry.value)
+            CACHE_REQUESTS.inc(result="coalesced" if key in self._inflight else "miss")
+            return self._fetch(key, submit)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (the disk tier is left alone)."""
+        with self._lock:
+            self._entries.clear()
+
+
+def _completed(value: Any) -> Future:
+    future: Future = Future()
+    future.set_result(value)
+    return future
+
+
+_cache: Optional[ScrapeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_scrape_cache() -> ScrapeCache:
+    """
+    Return the process-wide scrape cache, creating it on first use.
+
+    Returns:
+        ScrapeCache: The shared cache
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                disk_dir = get_cache_dir() / "scrape" if is_scrape_cache_disk_enabled() else None
+                _cache = ScrapeCache(disk_dir=disk_dir)
+    return _cache
@@ -1,11 +1,93 @@
 import asyncio
+import logging
+import re
+from urllib.parse import quote_plus
+
 from langchain_openai import ChatOpenAI
-from browser_use import Agent, Browser, BrowserConfig
-from browser_use.browser.context import BrowserContextConfig
+from browser_use import Agent
 
-async def scrape_ubereats(postal_code, keywords):
+from shared.config import (
+    get_deliveroo_base_url,
+    get_deliveroo_search_areas,
+    get_deliveroo_search_url,
+    get_scraper_mode,
+    get_scraper_record_dir,
+)
+from shared.metrics import registry
+
+from .browser_pool import default_context_config, get_browser_pool
+from .listing_extractor import extract_listings, records_from_agent_result
+from .replay import PageRecorder
+from .scrape_cache import get_scrape_cache, postcode_outward_code, scrape_cache_key
+
+SEARCHES = registry.counter(
+    "agent_eat_scraper_searches_total",
+    "Scraper searches by method (extract or agent) and status.",
+    ["method", "status"],
+)
+AGENT_STEPS = registry.counter(
+    "agent_eat_scraper_agent_steps_total",
+    "Steps taken by the scraper's browser agent.",
+)
+
+_POSTCODE_AREA_RE = re.compile(r"^([A-Z]{1,2})\d")
+
+
+def search_page_covers(postal_code):
+    """
+    Check whether the search results page lists restaurants for a postcode.
+
+    The search URL is fixed to one area (London by default), so for a
+    postcode elsewhere it would return that area's listings instead; those
+    searches go to the browser agent.
+
+    Args:
+        postal_code: Postcode as typed by the user
+
+    Returns:
+        bool: True if the postcode's area is in DELIVEROO_SEARCH_AREAS
+    """
+    areas = get_deliveroo_search_areas()
+    if areas is None:
+        return True
+    match = _POSTCODE_AREA_RE.match(postcode_outward_code(postal_code))
+    return bool(match) and match.group(1) in areas
+
+
+def search_url(postal_code, keywords):
+    """Build the Deliveroo search results URL for a postcode and keywords."""
+    return get_deliveroo_search_url().format(
+        postcode=quote_plus(postal_code.strip()), keywords=quote_plus(keywords.strip())
+    )
+
+
+async def _new_context(browser):
+    """Open a fresh context, recording its pages when SCRAPER_RECORD_DIR is set."""
+    context = await browser.new_context(default_context_config())
+    record_dir = get_scraper_record_dir()
+    if record_dir:
+        try:
+            session = await context.get_session()
+            PageRecorder(record_dir).attach(session.context)
+        except Exception as e:
+            logging.warning(f"Could not record scraper pages: {str(e)}")
+    return context
+
+
+async def _extract(browser, postal_code, keywords):
+    """Fast path: load the search results page once and parse the listings out of it."""
+    context = await _new_context(browser)
+    try:
+        page = await context.get_current_page()
+        await page.goto(search_url(postal_code, keywords), wait_until="domcontentloaded")
+        return extract_listings(await page.content(), base_url=page.url)
+    finally:
+        await context.close()
+
+
+async def _run_agent(browser, postal_code, keywords):
     address = f"{postal_code}"
-    task = f"""Go to https://deliveroo.co.uk/ and complete the following tasks:
+    task = f"""Go to {get_deliveroo_base_url()}/ and complete the following tasks:
     1. Enter the delivery address/postal code: {address}
     2. Search for {keywords} food
     3. From the search results, identify the top 10 restaurants
@@ -20,29 +102,65 @@ async def scrape_ubereats(postal_code, keywords):
     - restaurant: the name of the restaurant
     """
 
-    browser = Browser(
-        config=BrowserConfig(
-            # Remove specific path to let Playwright manage the browser instance
-            # chrome_instance_path="/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-            headless=True,
-            new_context_config=BrowserContextConfig(
-                disable_security=False,
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-                minimum_wait_page_load_time=3,
-                maximum_wait_page_load_time=30,
-            )
-        )
-    )
-
+    context = await _new_context(browser)
     agent_1 = Agent(
         task=task,
         llm=ChatOpenAI(model='gpt-4.1-mini'),
         browser=browser,
+        browser_context=context,
     )
 
     try:
         results = await agent_1.run()
         print(results)
-        return results
+        AGENT_STEPS.inc(len(getattr(results, "history", None) or []))
+        return records_from_agent_result(results)
     finally:
-        await browser.close() 
\ No newline at end of file
+        await context.close()
+
+
+async def _scrape(postal_code, keywords):
+    # Runs on the pool's event loop; each search gets a fresh context on a warm browser
+    async with get_browser_pool().lease() as browser:
+        if get_scraper_mode() != "agent":
+            if not search_page_covers(postal_code):
+                # The page would list another area's restaurants, which would then be cached for this one
+                SEARCHES.inc(method="extract", status="out_of_area")
+                logging.info(f"Search page does not cover {postal_code}; using the browser agent")
+            else:
+                try:
+                    listings = await _extract(browser, postal_code, keywords)
+                    if listings:
+                        SEARCHES.inc(method="extract", status="success")
+                        return listings
+                    SEARCHES.inc(method="extract", status="empty")
+                    logging.info(f"No listings extracted for '{keywords}' near {postal_code}; using the browser agent")
+                except Exception as e:
+                    SEARCHES.inc(method="extract", status="error")
+                    logging.warning(f"Listing extraction failed, using the browser agent: {str(e)}")
+        try:
+            records = await _run_agent(browser, postal_code, keywords)
+        except Exception:
+            SEARCHES.inc(method="agent", status="error")
+            raise
+        SEARCHES.inc(method="agent", status="success" if records else "empty")
+        return records
+
+
+def _submit_search(postal_code, keywords):
+    """Answer from the scrape cache, scraping on a pooled browser only on a miss."""
+    return get_scrape_cache().get_or_submit(
+        scrape_cache_key(postal_code, keywords),
+        lambda: get_browser_pool().submit(_scrape, postal_code, keywords),
+    )
+
+
+async def scrape_ubereats(postal_code, keywords):
+    """Search Deliveroo for a dish near a postcode using a pooled browser."""
+    # Shielded so a caller giving up (e.g. a search deadline) lets the scrape finish and fill the cache
+    return await asyncio.shield(asyncio.wrap_future(_submit_search(postal_code, keywords)))
+
+
+def scrape_ubereats_sync(postal_code, keywords, timeout=None):
+    """Blocking variant of scrape_ubereats for synchronous callers such as crew tools."""
+    return _submit_search(postal_code, keywords).result(timeout=timeout)
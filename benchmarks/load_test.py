@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+"""
+End-to-end load test for the chat API.
+
+Runs N concurrent chats against the server: each chat calls /api/initialize
+once, then sends a number of /api/chat turns. Reports p50/p95/p99 latency per
+endpoint, throughput, errors and the server's resident memory, and exits
+non-zero when a threshold given on the command line is missed, so it can
+gate CI.
+
+By default the script starts its own server with LLM_PROVIDER=fake, so no
+API key is needed and results only reflect server-side costs:
+
+    python benchmarks/load_test.py --chats 20 --turns 5 --max-p95 2.0
+
+Point it at a running server instead with --url:
+
+    python benchmarks/load_test.py --url http://localhost:8000 --chats 5
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_MESSAGES = [
+    "hi",
+    "I'd like pizza, my postcode is SW1A 1AA",
+    "show me the menu of the first one",
+    "add a margherita to my cart",
+    "what's the total?",
+]
+
+
+def _request(url: str, payload: Optional[Dict[str, Any]] = None, timeout: float = 300.0) -> Dict[str, Any]:
+    """POST ``payload`` as JSON (or GET when None) and decode the JSON response."""
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def _read_metric(base_url: str, name: str) -> Optional[float]:
+    """Read an unlabeled metric from the server's metrics endpoint."""
+    try:
+        with urllib.request.urlopen(f"{base_url}/api/metrics", timeout=5) as response:
+            text = response.read().decode("utf-8")
+    except (OSError, urllib.error.URLError):
+        return None
+    for line in text.splitlines():
+        if line.startswith(f"{name} "):
+            return float(line.split()[1])
+    return None
+
+
+def _server_rss_bytes(base_url: str) -> Optional[float]:
+    """Read the server's resident memory from its metrics endpoint.
+
+    Metrics are per worker process, so this is only the server's RSS when it
+    runs a single worker.
+    """
+    return _read_metric(base_url, "process_resident_memory_bytes")
+
+
+class RssSampler:
+    """Polls the server's resident memory in the background and keeps the peak."""
+
+    def __init__(self, base_url: str, interval: float = 0.5):
+        self.base_url = base_url
+        self.interval = interval
+        self.start: Optional[float] = None
+        self.peak: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self) -> None:
+        rss = _server_rss_bytes(self.base_url)
+        if rss is not None:
+            self.peak = rss if self.peak is None else max(self.peak, rss)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "RssSampler":
+        self.start = _server_rss_bytes(self.base_url)
+        self.peak = self.start
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def _start_server(port: int, workers: int, env_overrides: Dict[str, str]) -> subprocess.Popen:
+    """Start the server in a subprocess with the fake LLM."""
+    env = dict(os.environ)
+    env.update(env_overrides)
+    return subprocess.Popen(
+        [sys.executable, str(ROOT_DIR / "run.py"), "--port", str(port), "--workers", str(workers)],
+        cwd=str(ROOT_DIR),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _wait_until_ready(base_url: str, timeout: float, server: Optional[subprocess.Popen]) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode} before becoming ready")
+        try:
+            _request(f"{base_url}/api/crews", timeout=2)
+            return
+        except (OSError, urllib.error.URLError, ValueError):
+            time.sleep(0.25)
+    raise RuntimeError(f"Server at {base_url} was not ready after {timeout}s")
+
+
+def _run_chat(base_url: str, turns: int, messages: List[str], samples: List[Dict[str, Any]], lock: threading.Lock) -> None:
+    """Initialize one chat and send its turns, recording each request."""
+    chat_id = str(uuid.uuid4())
+
+    def timed(endpoint: str, payload: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        error = None
+        try:
+            response = _request(f"{base_url}{endpoint}", payload)
+            if response.get("status") not in (None, "success"):
+                error = str(response.get("content") or response.get("message") or response.get("status"))
+        except urllib.error.HTTPError as e:
+            error = f"HTTP {e.code}"
+        except (OSError, urllib.error.URLError, ValueError) as e:
+            error = str(e)
+        sample = {"endpoint": endpoint, "seconds": time.perf_counter() - start, "error": error}
+        with lock:
+            samples.append(sample)
+
+    timed("/api/initialize", {"chat_id": chat_id})
+    for turn in range(turns):
+        timed("/api/chat", {"chat_id": chat_id, "message": messages[turn % len(messages)]})
+
+
+def _summarize(samples: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    endpoints: Dict[str, Any] = {}
+    for endpoint in sorted({sample["endpoint"] for sample in samples}):
+        rows = [sample for sample in samples if sample["endpoint"] == endpoint]
+        latencies = sorted(sample["seconds"] for sample in rows)
+        endpoints[endpoint] = {
+            "requests": len(rows),
+            "errors": sum(1 for sample in rows if sample["error"]),
+            "p50": round(_percentile(latencies, 50), 4),
+            "p95": round(_percentile(latencies, 95), 4),
+            "p99": round(_percentile(latencies, 99), 4),
+            "max": round(latencies[-1], 4) if latencies else 0.0,
+        }
+    errors = sum(1 for sample in samples if sample["error"])
+    chat_turns = endpoints.get("/api/chat", {}).get("requests", 0)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "wall_seconds": round(wall_seconds, 3),
+        "requests_per_second": round(len(samples) / wall_seconds, 2) if wall_seconds else 0.0,
+        "chat_turns_per_second": round(chat_turns / wall_seconds, 2) if wall_seconds else 0.0,
+        "endpoints": endpoints,
+        "first_errors": [sample["error"] for sample in samples if sample["error"]][:5],
+    }
+
+
+def _check_thresholds(summary: Dict[str, Any], args: argparse.Namespace) -> List[str]:
+    """Return a description of every threshold the run missed."""
+    failures = []
+    chat = summary["endpoints"].get("/api/chat", {})
+    if args.max_p95 is not None and chat.get("p95", 0.0) > args.max_p95:
+        failures.append(f"/api/chat p95 {chat['p95']:.3f}s exceeds {args.max_p95:.3f}s")
+    if args.max_p99 is not None and chat.get("p99", 0.0) > args.max_p99:
+        failures.append(f"/api/chat p99 {chat['p99']:.3f}s exceeds {args.max_p99:.3f}s")
+    if summary["error_rate"] > args.max_error_rate:
+        failures.append(f"error rate {summary['error_rate']:.2%} exceeds {args.max_error_rate:.2%}")
+    if args.min_throughput is not None and summary["chat_turns_per_second"] < args.min_throughput:
+        failures.append(
+            f"throughput {summary['chat_turns_per_second']:.2f} turns/s is below {args.min_throughput:.2f}"
+        )
+    peak_mb = summary.get("server_peak_rss_mb")
+    if args.max_rss_mb is not None and peak_mb is not None and peak_mb > args.max_rss_mb:
+        failures.append(f"server peak RSS {peak_mb:.1f} MB exceeds {args.max_rss_mb:.1f} MB")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the chat API with concurrent chats.")
+    parser.add_argument("--url", help="Base URL of a running server (default: start one with the fake LLM)")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the server this script starts")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the server this script starts")
+    parser.add_argument("--chats", type=int, default=10, help="Concurrent chats")
+    parser.add_argument("--turns", type=int, default=5, help="Chat turns per chat")
+    parser.add_argument("--message", action="append", help="Message to send, repeatable (cycled per turn)")
+    parser.add_argument("--fake-latency", type=float, default=0.2, help="Fake LLM seconds to first token")
+    parser.add_argument("--fake-tokens-per-second", type=float, default=50.0, help="Fake LLM output rate")
+    parser.add_argument("--tool-call-every", type=int, default=0, help="Fake LLM calls the crew tool every Nth turn")
+    parser.add_argument("--ready-timeout", type=float, default=120.0, help="Seconds to wait for the server")
+    parser.add_argument("--max-p95", type=float, help="Fail if /api/chat p95 exceeds this many seconds")
+    parser.add_argument("--max-p99", type=float, help="Fail if /api/chat p99 exceeds this many seconds")
+    parser.add_argument("--max-error-rate", type=float, default=0.0, help="Fail if more requests than this fraction fail")
+    parser.add_argument("--min-throughput", type=float, help="Fail below this many chat turns per second")
+    parser.add_argument("--max-rss-mb", type=float, help="Fail if the server's peak RSS exceeds this many MB")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    server = None
+    base_url = (args.url or f"http://127.0.0.1:{args.port}").rstrip("/")
+    if not args.url:
+        server = _start_server(args.port, args.workers, {
+            "LLM_PROVIDER": "fake",
+            "FAKE_LLM_LATENCY_SECONDS": str(args.fake_latency),
+            "FAKE_LLM_TOKENS_PER_SECOND": str(args.fake_tokens_per_second),
+            "FAKE_LLM_TOOL_CALL_EVERY": str(args.tool_call_every),
+            "CHAT_QUEUE_LIMIT": str(max(32, args.chats)),
+        })
+
+    messages = args.message or DEFAULT_MESSAGES
+    samples: List[Dict[str, Any]] = []
+    lock = threading.Lock()
+    try:
+        _wait_until_ready(base_url, args.ready_timeout, server)
+        workers = args.workers if server is not None else int(_read_metric(base_url, "agent_eat_web_workers") or 1)
+        if workers > 1 and args.max_rss_mb is not None:
+            # Each metrics scrape reaches one worker at random, so the sampled RSS is meaningless
+            parser.error(f"--max-rss-mb needs a single-worker server; this one runs {workers} workers")
+        with RssSampler(base_url) as rss:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.chats) as executor:
+                futures = [
+                    executor.submit(_run_chat, base_url, args.turns, messages, samples, lock)
+                    for _ in range(args.chats)
+                ]
+                for future in futures:
+                    future.result()
+            wall_seconds = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    summary = _summarize(samples, wall_seconds)
+    summary["chats"] = args.chats
+    summary["turns"] = args.turns
+    summary["server_workers"] = workers
+    # With several workers the samples come from whichever worker answered; not reported
+    summary["server_start_rss_mb"] = round(rss.start / (1024 * 1024), 1) if rss.start and workers == 1 else None
+    summary["server_peak_rss_mb"] = round(rss.peak / (1024 * 1024), 1) if rss.peak and workers == 1 else None
+    failures = _check_thresholds(summary, args)
+    summary["failures"] = failures
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        header = f"{'endpoint':<18} {'requests':>8} {'errors':>6} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'max s':>8}"
+        print(header)
+        print("-" * len(header))
+        for endpoint, row in summary["endpoints"].items():
+            print(
+                f"{endpoint:<18} {row['requests']:>8} {row['errors']:>6} {row['p50']:>8.3f} "
+                f"{row['p95']:>8.3f} {row['p99']:>8.3f} {row['max']:>8.3f}"
+            )
+        print(
+            f"\n{args.chats} chats x {args.turns} turns in {summary['wall_seconds']:.2f}s: "
+            f"{summary['requests_per_second']:.2f} requests/s, {summary['chat_turns_per_second']:.2f} chat turns/s"
+        )
+        if summary["server_peak_rss_mb"] is not None:
+            print(f"Server RSS: {summary['server_start_rss_mb']} MB at start, {summary['server_peak_rss_mb']} MB peak")
+        for error in summary["first_errors"]:
+            print(f"error: {error}")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
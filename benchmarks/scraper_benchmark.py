@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""
+Offline benchmark for the restaurant scraper.
+
+Replays recorded pages from a local server and runs a fixed list of searches
+through the scraper, reporting per search: pages loaded, browser agent
+steps, wall time and peak memory (this process plus its browser processes).
+
+Record fixtures once against the live site:
+
+    SCRAPER_RECORD_DIR=benchmarks/fixtures/deliveroo python benchmarks/scraper_benchmark.py --live
+
+Then benchmark offline as often as needed:
+
+    python benchmarks/scraper_benchmark.py --fixtures benchmarks/fixtures/deliveroo \\
+        --search "SW1A 1AA:pizza" --search "E1 6AN:sushi" --repeat 3
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from shared.config import load_env
+from shared.metrics import process_rss_bytes
+
+DEFAULT_SEARCHES = ["SW1A 1AA:pizza", "SW1A 1AA:sushi", "E1 6AN:burger"]
+
+
+def _descendants(pid: int):
+    """Yield the ids of a process's descendants (Linux only)."""
+    children = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name is parenthesized and may contain spaces
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+    stack = list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        yield child
+        stack.extend(children.get(child, []))
+
+
+def _tree_rss_bytes() -> float:
+    """Resident memory of this process and every process it started."""
+    total = process_rss_bytes()
+    if not Path("/proc").exists():
+        return total
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for pid in _descendants(os.getpid()):
+        try:
+            total += int(Path(f"/proc/{pid}/statm").read_text().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            continue
+    return total
+
+
+class PeakMemorySampler:
+    """Samples process-tree memory in the background and keeps the peak."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _tree_rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "PeakMemorySampler":
+        self.peak = _tree_rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _tree_rss_bytes())
+
+
+def _parse_search(value: str):
+    postal_code, _, keywords = value.partition(":")
+    if not keywords:
+        raise argparse.ArgumentTypeError(f"Expected POSTCODE:KEYWORDS, got '{value}'")
+    return postal_code.strip(), keywords.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against recorded pages.")
+    parser.add_argument("--fixtures", help="Fixture directory to replay (omit with --live)")
+    parser.add_argument("--live", action="store_true", help="Hit the live site instead of replaying fixtures")
+    parser.add_argument("--search", action="append", type=_parse_search, help="POSTCODE:KEYWORDS, repeatable")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs of the whole search list")
+    parser.add_argument("--mode", choices=["extract", "agent"], help="Override SCRAPER_MODE")
+    parser.add_argument("--with-cache", action="store_true", help="Keep the scrape cache enabled")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if not args.live and not args.fixtures:
+        parser.error("--fixtures is required unless --live is given")
+
+    load_env()
+    if args.mode:
+        os.environ["SCRAPER_MODE"] = args.mode
+    if not args.with_cache:
+        # Every search must reach the scraper to be measured
+        os.environ["SCRAPE_CACHE_TTL_SECONDS"] = "0"
+        os.environ["SCRAPE_CACHE_STALE_SECONDS"] = "0"
+        os.environ["SCRAPE_CACHE_DISK"] = "false"
+
+    from backend.src.replay import ReplayServer
+
+    server = None
+    if not args.live:
+        server = ReplayServer(args.fixtures).start()
+        os.environ["DELIVEROO_BASE_URL"] = server.url
+        os.environ.pop("DELIVEROO_SEARCH_URL", None)
+
+    # Imported after the environment is set up; settings are read on first use
+    from backend.src.browser_pool import get_browser_pool
+    from backend.src.uber_eats_scraper import AGENT_STEPS, scrape_ubereats_sync
+
+    searches = args.search or [_parse_search(value) for value in DEFAULT_SEARCHES]
+    rows = []
+    try:
+        for run in range(args.repeat):
+            for postal_code, keywords in searches:
+                pages_before = server.pages_served if server else 0
+                steps_before = AGENT_STEPS.value()
+                error = None
+                with PeakMemorySampler() as sampler:
+                    start = time.perf_counter()
+                    try:
+                        results = scrape_ubereats_sync(postal_code, keywords)
+                    except Exception as e:
+                        results, error = [], str(e)
+                    wall_seconds = time.perf_counter() - start
+                rows.append({
+                    "run": run + 1,
+                    "postal_code": postal_code,
+                    "keywords": keywords,
+                    "results": len(results),
+                    "pages_loaded": (server.pages_served - pages_before) if server else None,
+                    "agent_steps": int(AGENT_STEPS.value() - steps_before),
+                    "wall_seconds": round(wall_seconds, 3),
+                    "peak_rss_mb": round(sampler.peak / (1024 * 1024), 1),
+                    "error": error,
+                })
+    finally:
+        get_browser_pool().close()
+        if server is not None:
+            server.stop()
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    header = f"{'run':>3}  {'search':<28} {'results':>7} {'pages':>5} {'steps':>5} {'wall s':>8} {'peak MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        search = f"{row['postal_code']}:{row['keywords']}"[:28]
+        pages = "-" if row["pages_loaded"] is None else row["pages_loaded"]
+        print(
+            f"{row['run']:>3}  {search:<28} {row['results']:>7} {pages:>5} {row['agent_steps']:>5} "
+            f"{row['wall_seconds']:>8.3f} {row['peak_rss_mb']:>8.1f}" + (f"  error: {row['error']}" if row["error"] else "")
+        )
+    walls = sorted(row["wall_seconds"] for row in rows)
+    if walls:
+        print(f"\n{len(rows)} searches, median {walls[len(walls) // 2]:.3f}s, max {walls[-1]:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
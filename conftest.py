@@ -0,0 +1 @@
+"""Makes the repository root importable (``backend``, ``frontend``, ``shared``) in tests."""
@@ -1,8 +1,7 @@
 import json
 import logging
-from typing import Dict, List, Any, Optional, Union, cast, TypedDict
+from typing import Callable, Dict, Iterable, List, Any, Optional, Set, Union, cast, TypedDict
 import threading
-import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -32,8 +31,102 @@ from crewai.cli.crew_chat import (
     run_crew_tool
 )
 
+from shared.config import is_token_streaming_enabled
+from shared.fake_llm import create_llm_override
+from frontend.src.context_window import ContextWindowPolicy
+from frontend.src.chat_metrics import LLM_CACHE_REQUESTS
+from frontend.src.crew_cache import crew_fingerprint, load_crew_analysis, save_crew_analysis
+from frontend.src.llm_cache import get_llm_response_cache, model_params, prefix_digest, prefix_key, prompt_key
+from frontend.src.llm_stream import install_crewai_bridge, token_listener
+from frontend.src.progress import progress
+
+# Receives progress events ({"type": ..., ...}) while a message is processed
+EventCallback = Callable[[Dict[str, Any]], None]
+
+def _track_invocation(name: str, function: Callable[..., Any], invoked: List[str]) -> Callable[..., Any]:
+    """Wrap a tool function so calls to it are recorded in ``invoked``."""
+    def tracked(*args, **kwargs):
+        invoked.append(name)
+        return function(*args, **kwargs)
+    return tracked
+
+
+def _field(value: Any, name: str) -> Any:
+    """Read a field of a litellm response object or of its dict form."""
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
+# Crew tool names offered to the chat LLM, checked for calls CrewAI drops
+_crew_tool_names: Set[str] = set()
+_tool_call_monitor_installed = False
+_tool_call_monitor_lock = threading.Lock()
+
+
+def warn_dropped_tool_calls(
+    kwargs: Dict[str, Any], completion_response: Any, start_time: Any = None, end_time: Any = None
+) -> None:
+    """litellm success callback warning when one response calls the crew tool more than once.
+
+    CrewAI's ``LLM.call`` runs only the first tool call of a response and
+    returns its output, so any further crew calls are dropped; this makes
+    them visible in the logs.
+    """
+    response = kwargs.get("complete_streaming_response") or completion_response
+    choices = _field(response, "choices") or []
+    if not choices:
+        return
+    tool_calls = _field(_field(choices[0], "message"), "tool_calls") or []
+    crew_calls = [call for call in tool_calls if _field(_field(call, "function"), "name") in _crew_tool_names]
+    if len(crew_calls) > 1:
+        logging.warning(
+            f"Chat LLM requested {len(crew_calls)} crew tool calls in one response; "
+            f"CrewAI runs only the first, so {len(crew_calls) - 1} were dropped"
+        )
+
+
+def watch_crew_tool_calls(tool_names: Iterable[str]) -> bool:
+    """
+    Log a warning whenever a chat LLM response calls one of these tools more than once.
+
+    Args:
+        tool_names: Names the chat LLM calls the crew tool by
+
+    Returns:
+        bool: True if litellm is available to report responses
+    """
+    global _tool_call_monitor_installed
+    with _tool_call_monitor_lock:
+        _crew_tool_names.update(tool_names)
+        if _tool_call_monitor_installed:
+            return True
+        try:
+            import litellm
+        except ImportError:
+            return False
+        litellm.success_callback.append(warn_dropped_tool_calls)
+        _tool_call_monitor_installed = True
+        return True
+
+
+def _is_cacheable(response: Any) -> bool:
+    """Only plain answers are reused; tool requests and empty replies are not."""
+    if isinstance(response, str):
+        return bool(response.strip())
+    if isinstance(response, dict):
+        return bool(response.get("content")) and not response.get("tool_calls")
+    return False
+
 
 class ChatHandler:
+    """Crew-level chat state shared by every conversation.
+
+    The crew, chat LLM, tool schema and system message are computed once by
+    ``initialize`` and treated as read-only afterwards. Per-chat history lives
+    in ``ChatSession`` objects created through ``create_session``.
+    """
+
     def __init__(self, crew: Crew, crew_name: str):
         """
         Initialize the chat handler.
@@ -45,11 +138,16 @@ class ChatHandler:
         self.crew = crew
         self.crew_name = crew_name
         self.chat_llm = self._initialize_chat_llm()
-        self.messages: List[Dict[str, str]] = []
         self.crew_chat_inputs = None
         self.crew_tool_schema = None
-        self.available_functions: Dict[str, Any] = {}
+        self.system_message: Optional[str] = None
+        self.intro_content: Optional[str] = None
         self.is_initialized = False
+        self.context_policy = ContextWindowPolicy()
+        # Opt-in (LLM_CACHE_ENABLED); None when disabled
+        self.response_cache = get_llm_response_cache()
+        self._opening_digest: Optional[str] = None
+        self._init_lock = threading.Lock()
         
     def _initialize_chat_llm(self) -> LLM:
         """Initialize the chat LLM from the crew.
@@ -61,9 +159,14 @@ class ChatHandler:
             RuntimeError: If unable to initialize the chat LLM
         """
         try:
-            llm = create_llm(self.crew.chat_llm)
+            # LLM_PROVIDER=fake swaps in the offline stand-in
+            llm = create_llm_override() or create_llm(self.crew.chat_llm)
             if llm is None:
                 raise RuntimeError("LLM initialization returned None")
+            # Stream tokens when CrewAI can report them; the full response is
+            # still returned from call() either way
+            if is_token_streaming_enabled() and install_crewai_bridge() and hasattr(llm, "stream"):
+                llm.stream = True
             return llm
         except Exception as e:
             raise RuntimeError(f"Unable to initialize chat LLM: {str(e)}")
@@ -91,23 +194,70 @@ class ChatHandler:
     
     def initialize(self):
         """Initialize the chat handler by analyzing the crew and setting up schemas."""
-        if self.is_initialized:
+        with self._init_lock:
+            if self.is_initialized:
+                return self.intro_content
+            if self._load_cached_analysis():
+                return self.intro_content
+            return self._initialize()
+
+    def _fingerprint(self) -> Optional[str]:
+        """Fingerprint of the crew analysis inputs, or None if it cannot be computed."""
+        try:
+            return crew_fingerprint(
+                self.crew, self.crew_name, getattr(self.chat_llm, "model", None)
+            )
+        except Exception as e:
+            logging.warning(f"Could not fingerprint crew for caching: {str(e)}")
+            return None
+
+    def _load_cached_analysis(self) -> bool:
+        """Restore the crew analysis from the on-disk cache.
+
+        Returns:
+            bool: True if a valid cached analysis was applied
+        """
+        fingerprint = self._fingerprint()
+        if fingerprint is None:
+            return False
+        cached = load_crew_analysis(self.crew_name, fingerprint)
+        if not cached:
+            return False
+        try:
+            self.crew_chat_inputs = ChatInputs.model_validate(cached["crew_chat_inputs"])
+            self.crew_tool_schema = cached["crew_tool_schema"]
+            self.system_message = cached["system_message"]
+            self.intro_content = cached["intro_content"]
+        except Exception as e:
+            logging.warning(f"Ignoring invalid crew analysis cache: {str(e)}")
+            return False
+        logging.info("Loaded crew analysis from cache")
+        self.is_initialized = True
+        return True
+
+    def _save_analysis(self) -> None:
+        """Persist the crew analysis so later process starts can skip it."""
+        fingerprint = self._fingerprint()
+        if fingerprint is None:
             return
-        
+        save_crew_analysis(self.crew_name, fingerprint, {
+            "crew_chat_inputs": self.crew_chat_inputs.model_dump(),
+            "crew_tool_schema": self.crew_tool_schema,
+            "system_message": self.system_message,
+            "intro_content": self.intro_content,
+        })
+
+    def _initialize(self):
+        """Run the crew analysis; callers must hold ``_init_lock``."""
         # Indicate that the crew is being analyzed
         logging.info("Analyzing crew and required inputs...")
         
-        # Start loading indicator in a separate thread
-        loading_complete = threading.Event()
-        loading_thread = threading.Thread(target=self._show_loading, args=(loading_complete,))
-        loading_thread.daemon = True
-        loading_thread.start()
-        
         try:
             # Generate crew chat inputs
-            self.crew_chat_inputs = generate_crew_chat_inputs(
-                self.crew, self.crew_name, self.chat_llm
-            )
+            with progress.phase("crew_analysis"):
+                self.crew_chat_inputs = generate_crew_chat_inputs(
+                    self.crew, self.crew_name, self.chat_llm
+                )
             
             # Generate tool schema
             crew_tool_schema = generate_crew_tool_schema(self.crew_chat_inputs)
@@ -116,11 +266,13 @@ class ChatHandler:
             
             # Set up system message
             system_message = build_system_message(self.crew_chat_inputs)
+            self.system_message = system_message
             
             # Generate introductory message
-            introductory_message = self.chat_llm.call(
-                messages=[{"role": "system", "content": system_message}]
-            )
+            with progress.phase("intro_call"):
+                introductory_message = self.call_llm(
+                    messages=[{"role": "system", "content": system_message}], call="intro"
+                )
             
             # Log a shorter version of the introductory message for debugging
             if isinstance(introductory_message, str):
@@ -140,75 +292,239 @@ class ChatHandler:
                 if not intro_content:
                     intro_content = f"Hello! I'm your CrewAI assistant for the '{self.crew_name}' crew. How can I help you today?"
             
-            # Initialize messages
-            self.messages = [
-                {"role": "system", "content": system_message},
-                {"role": "assistant", "content": intro_content},
-            ]
-            
-            # Track the sanitized name from the tool schema
-            sanitized_function_name = self.crew_tool_schema['function']['name']
-            original_name = self.crew_chat_inputs.crew_name
-            
-            # Set up available functions using the sanitized name
-            self.available_functions = {
-                sanitized_function_name: self._create_tool_function(),
-            }
-            
-            # Add the original name as well as a fallback
-            if original_name != sanitized_function_name:
-                self.available_functions[original_name] = self._create_tool_function()
-            
+            self.intro_content = intro_content
             self.is_initialized = True
-            return introductory_message
+            self._save_analysis()
+            return intro_content
             
         except Exception as e:
             error_message = f"Error initializing chat handler: {str(e)}"
             logging.error(error_message)
             return error_message
-            
-        finally:
-            # Stop loading indicator
-            loading_complete.set()
-            if loading_thread.is_alive():
-                loading_thread.join(timeout=1.0)
-    
-    def _show_loading(self, event: threading.Event):
-        """Display animated loading indicator while processing."""
-        chars = "-\|/"
-        i = 0
-        while not event.is_set():
-            logging.debug(f"Processing... {chars[i % len(chars)]}")
-            i += 1
-            time.sleep(0.5)
     
-    def _create_tool_function(self):
-        """Create the tool function wrapper."""
+    def call_llm(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        call: str = "chat",
+        on_token: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Call the chat LLM, answering from the response cache when possible.
+
+        Prompts are looked up by an exact-match key over the normalized
+        messages, tools and model settings; the first message of a chat is
+        also looked up by the shared opening prefix plus the loosely
+        normalized message. Responses that requested tools, or during which
+        a tool ran, are never cached since replaying them would skip the
+        tool's side effects.
+
+        Args:
+            messages: Messages to send
+            tools: Tool schemas offered to the LLM
+            available_functions: Functions the LLM may call
+            call: Kind of call ("intro" or "chat"), for metrics
+            on_token: Receives a cached response in place of streamed tokens
+
+        Returns:
+            The LLM response
+        """
+        cache = self.response_cache
+        if cache is None:
+            return self.chat_llm.call(messages=messages, tools=tools, available_functions=available_functions)
+
+        params = model_params(self.chat_llm)
+        keys = [("hit", prompt_key(messages, tools, params))]
+        opening = self.opening_digest
+        if (
+            opening is not None
+            and len(messages) > 1
+            and messages[-1].get("role") == "user"
+            and prefix_digest(messages[:-1]) == opening
+        ):
+            keys.append(("prefix_hit", prefix_key(opening, str(messages[-1].get("content") or ""), tools, params)))
+
+        for result, key in keys:
+            response = cache.get(key)
+            if response is not None:
+                LLM_CACHE_REQUESTS.inc(call=call, result=result)
+                logging.debug(f"Answered {call} LLM call from the response cache ({result})")
+                if on_token is not None and isinstance(response, str):
+                    on_token(response)
+                return response
+        LLM_CACHE_REQUESTS.inc(call=call, result="miss")
+
+        invoked: List[str] = []
+        if available_functions:
+            available_functions = {
+                name: _track_invocation(name, function, invoked)
+                for name, function in available_functions.items()
+            }
+        response = self.chat_llm.call(messages=messages, tools=tools, available_functions=available_functions)
+        if not invoked and _is_cacheable(response):
+            for _, key in keys:
+                cache.put(key, response)
+        return response
+
+    @property
+    def opening_digest(self) -> Optional[str]:
+        """Digest of the messages every chat starts with, once initialized."""
+        if not self.is_initialized:
+            return None
+        if self._opening_digest is None:
+            self._opening_digest = prefix_digest(self.initial_messages())
+        return self._opening_digest
+
+    def initial_messages(self) -> List[Dict[str, Any]]:
+        """Return the opening history (system prompt and introduction) for a new chat."""
+        return [
+            {"role": "system", "content": self.system_message},
+            {"role": "assistant", "content": self.intro_content},
+        ]
+
+    def create_session(self, chat_id: str, crew_id: Optional[str] = None) -> "ChatSession":
+        """
+        Create a new conversation bound to this handler.
+        
+        Args:
+            chat_id: Identifier of the chat thread
+            crew_id: Identifier of the crew serving the thread
+            
+        Returns:
+            ChatSession: A session seeded with the initial messages
+        """
+        if not self.is_initialized:
+            self.initialize()
+        if not self.is_initialized:
+            raise RuntimeError(f"Chat handler for '{self.crew_name}' failed to initialize")
+        return ChatSession(self, chat_id, crew_id)
+
+
+class ChatSession:
+    """A single chat thread: its message history plus the shared ``ChatHandler``.
+
+    Sessions are cheap to create. Turns within one session are serialized by
+    ``lock``; different sessions can process messages in parallel.
+    """
+
+    def __init__(
+        self,
+        handler: ChatHandler,
+        chat_id: str,
+        crew_id: Optional[str] = None,
+        messages: Optional[List[Dict[str, Any]]] = None,
+    ):
+        """
+        Initialize the chat session.
+        
+        Args:
+            handler: The initialized handler providing crew, LLM and schemas
+            chat_id: Identifier of the chat thread
+            crew_id: Identifier of the crew serving the thread
+            messages: Existing history to resume; defaults to the handler's initial messages
+        """
+        self.handler = handler
+        self.chat_id = chat_id
+        self.crew_id = crew_id
+        self.messages: List[Dict[str, Any]] = (
+            messages if messages is not None else handler.initial_messages()
+        )
+        self.lock = threading.Lock()
+        # Listener and crew run count of the turn in progress, read by the
+        # tool function CrewAI calls from inside the LLM call
+        self._listener: Optional[EventCallback] = None
+        self._tool_runs = 0
+
+        # Track the sanitized name from the tool schema
+        sanitized_function_name = handler.crew_tool_schema['function']['name']
+        original_name = handler.crew_chat_inputs.crew_name
+
+        # Set up available functions using the sanitized name
+        self.available_functions: Dict[str, Any] = {
+            sanitized_function_name: self._create_tool_function(sanitized_function_name),
+        }
+
+        # Add the original name as well as a fallback
+        if original_name != sanitized_function_name:
+            self.available_functions[original_name] = self._create_tool_function(original_name)
+        watch_crew_tool_calls(self.available_functions)
+
+    @property
+    def chat_llm(self) -> LLM:
+        return self.handler.chat_llm
+
+    @property
+    def crew_tool_schema(self) -> Dict[str, Any]:
+        return self.handler.crew_tool_schema
+
+    def _create_tool_function(self, tool_name: str):
+        """Create the tool function wrapper.
+
+        CrewAI runs the first tool call of a response inside ``LLM.call`` and
+        returns its output as the response, so the crew run is timed,
+        counted and reported to the turn's listener from here. Further tool
+        calls in the same response are dropped by CrewAI; a turn makes at
+        most one crew run, and ``warn_dropped_tool_calls`` logs the rest.
+
+        Args:
+            tool_name: Name the LLM calls the tool by, for metrics and progress
+        """
         def run_crew_tool_with_messages(**kwargs):
-            return run_crew_tool(self.crew, self.messages, **kwargs)
+            self._tool_runs += 1
+            with progress.phase("tool_call", self._listener, tool=tool_name):
+                # Kick off a copy so concurrent sessions never share task state
+                return run_crew_tool(self.handler.crew.copy(), self.messages, **kwargs)
         return run_crew_tool_with_messages
-    
-    def process_message(self, user_message: str) -> Dict[str, Any]:
+
+    def process_message(
+        self, user_message: str, on_event: Optional[EventCallback] = None
+    ) -> Dict[str, Any]:
         """
         Process a user message and return a response.
         
         Args:
             user_message: The message from the user
+            on_event: Optional callback receiving streamed tokens and tool progress
             
         Returns:
             Dict with response content and status
         """
-        if not self.is_initialized:
-            self.initialize()
-        
+        with self.lock:
+            self._listener = on_event
+            try:
+                return self._process_message(user_message, on_event)
+            finally:
+                self._listener = None
+
+    def _call_llm(self, on_event: Optional[EventCallback]):
+        """Call the chat LLM with the session history, streaming tokens to ``on_event``.
+
+        When the LLM calls the crew tool, CrewAI runs it before returning and
+        the response is the crew's output.
+        """
+        # Keep the history within the context budget so per-turn cost stays flat
+        self.messages[:] = self.handler.context_policy.apply(self.messages)
+
+        on_token = None
+        if on_event is not None:
+            # Tokens only go to the caller; global subscribers see phase timings
+            on_token = lambda chunk: on_event({"type": "token", "content": chunk})
+        with progress.phase("llm_call", on_event), token_listener(on_token):
+            return self.handler.call_llm(
+                messages=self.messages,
+                tools=[self.crew_tool_schema],
+                available_functions=self.available_functions,
+                on_token=on_token,
+            )
+
+    def _process_message(
+        self, user_message: str, on_event: Optional[EventCallback] = None
+    ) -> Dict[str, Any]:
+        """Run one turn; callers must hold ``lock``."""
         # Add user message to history
         self.messages.append({"role": "user", "content": user_message})
-        
-        # Start loading indicator in a separate thread
-        loading_complete = threading.Event()
-        loading_thread = threading.Thread(target=self._show_loading, args=(loading_complete,))
-        loading_thread.daemon = True
-        loading_thread.start()
+        self._tool_runs = 0
         
         try:
             # Ensure chat_llm is initialized - log minimal info
@@ -216,11 +532,7 @@ class ChatHandler:
             logging.debug(f"Using tool schema name: {self.crew_tool_schema['function']['name']}")
                 
             # Call the LLM with the updated messages including tool schema and available functions
-            response = self.chat_llm.call(
-                messages=self.messages,
-                tools=[self.crew_tool_schema],
-                available_functions=self.available_functions
-            )
+            response = self._call_llm(on_event)
             
             # Handle the response
             # Check if response is a string or dictionary
@@ -228,116 +540,29 @@ class ChatHandler:
                 # If response is an empty string, provide fallback content
                 if not response.strip():
                     logging.warning("Empty string response from LLM, providing fallback")
+                    progress.emit({"type": "fallback", "reason": "empty_llm_response"}, on_event)
                     content = "I'll help you with that. Let me process your request about AI agents in 2024."
                 else:
                     content = response
-                tool_calls = []
             else:
                 # It's a dictionary or similar object with get method
                 content = response.get("content", "")
                 # If content is empty but we have a response object, provide fallback
                 if not content and isinstance(response, dict):
                     logging.warning("Empty content in response dict, providing fallback")
+                    progress.emit({"type": "fallback", "reason": "empty_llm_content"}, on_event)
                     content = "I'll help you with that. Let me process your request about AI agents in 2024."
-                tool_calls = response.get("tool_calls", [])
                 
             logging.debug(f"Extracted content length: {len(content) if content else 0}")
-            logging.debug(f"Number of tool calls: {len(tool_calls) if tool_calls else 0}")
+            logging.debug(f"Crew tool runs: {self._tool_runs}")
             
             # Add assistant response to messages
             self.messages.append({"role": "assistant", "content": content})
             
-            # Process any tool calls
-            if tool_calls:
-                for tool_call in tool_calls:
-                    # Extract function name and arguments
-                    function_name = tool_call["function"]["name"]
-                    function_args = tool_call["function"]["arguments"]
-                    
-                    # Add the tool call to messages with proper typing
-                    tool_call_message: AssistantMessageWithToolCalls = {
-                        "role": "assistant",
-                        "content": None,  # Can be None with our custom type
-                        "tool_calls": [cast(ToolCall, tool_call)]
-                    }
-                    # Type cast to allow adding to messages list
-                    self.messages.append(cast(Dict[str, Any], tool_call_message))
-                    
-                    # Try to find a matching function, even with slight name differences
-                    function_to_call = None
-                    if function_name in self.available_functions:
-                        function_to_call = self.available_functions[function_name]
-                    else:
-                        # Try case-insensitive matching as fallback
-                        function_name_lower = function_name.lower()
-                        for available_name in self.available_functions:
-                            if available_name.lower() == function_name_lower:
-                                function_to_call = self.available_functions[available_name]
-                                break
-                                
-                    # Log the result, but only if there's a problem
-                    if not function_to_call:
-                        logging.warning(f"Tool call requested unknown function '{function_name}'. Available: {list(self.available_functions.keys())}")
-                    
-                    # Execute the function if found
-                    if function_to_call:
-                        # Handle parsing function arguments
-                        try:
-                            function_args_dict = json.loads(function_args)
-                            logging.debug(f"Calling function {function_name}")
-                            function_response = function_to_call(**function_args_dict)
-                        except json.JSONDecodeError as e:
-                            logging.error(f"Error parsing function arguments: {str(e)}")
-                            function_response = f"Error: Could not parse function arguments: {str(e)}"
-                        except Exception as e:
-                            logging.error(f"Error executing function {function_name}: {str(e)}")
-                            function_response = f"Error executing function: {str(e)}"
-                        
-                        # Add the function response to messages with proper typing
-                        tool_response_message: Dict[str, str] = {
-                            "role": "tool",
-                            "tool_call_id": tool_call["id"],
-                            "content": str(function_response)  # Ensure content is a string
-                        }
-                        self.messages.append(tool_response_message)
-                        
-                        # Log that we're processing the function response (minimal info)
-                        logging.debug("Processing function response")
-                        
-                        # Get LLM to summarize the function response with appropriate parameters
-                        try:
-                            summary_response = self.chat_llm.call(
-                                messages=self.messages,
-                                tools=[self.crew_tool_schema],
-                                available_functions=self.available_functions
-                            )
-                            
-                            # Handle string or dict response
-                            if isinstance(summary_response, str):
-                                summary_content = summary_response
-                            else:
-                                summary_content = summary_response.get("content", "")
-                                
-                            # Provide a fallback if summary is empty
-                            if not summary_content:
-                                summary_content = f"I've processed your request and received a response. Here's what I found: {function_response[:500]}"
-                        except Exception as e:
-                            logging.error(f"Error getting summary response: {str(e)}")
-                            summary_content = f"I've processed your request, but encountered an issue summarizing the results. Here's the raw output: {function_response[:500]}"
-                        
-                        # Add the summary response to messages
-                        self.messages.append({
-                            "role": "assistant", 
-                            "content": summary_content
-                        })
-                        
-                        # Update the content for the return value
-                        content = summary_content
-            
             result = {
                 "status": "success",
                 "content": content,
-                "has_tool_call": bool(tool_calls)
+                "has_tool_call": self._tool_runs > 0
             }
             logging.debug("Returning success result")
             return result
@@ -346,6 +571,7 @@ class ChatHandler:
             error_message = f"An error occurred: {str(e)}"
             logging.error(f"Exception in process_message: {error_message}")
             logging.error(f"Exception details:", exc_info=True)
+            progress.emit({"type": "phase_error", "phase": "process_message"}, on_event)
             self.messages.append({"role": "assistant", "content": error_message})
             result = {
                 "status": "error",
@@ -354,8 +580,3 @@ class ChatHandler:
             }
             logging.debug("Returning error result")
             return result
-        finally:
-            # Stop loading indicator
-            loading_complete.set()
-            if loading_thread.is_alive():
-                loading_thread.join(timeout=1.0)
@@ -0,0 +1,68 @@
+from typing import Any, Dict
+
+from shared.metrics import registry
+
+# Latency of each step of a chat turn (and of handler initialization); an
+# llm_call includes the tool_call CrewAI runs inside it
+PHASE_SECONDS = registry.histogram(
+    "agent_eat_chat_phase_seconds",
+    "Duration of chat pipeline phases in seconds.",
+    ["phase"],
+)
+
+TOOL_CALLS = registry.counter(
+    "agent_eat_chat_tool_calls_total",
+    "Crew tool calls made while answering chat messages.",
+    ["tool", "status"],
+)
+
+ERRORS = registry.counter(
+    "agent_eat_chat_errors_total",
+    "Errors raised while processing chat messages, by phase.",
+    ["phase"],
+)
+
+FALLBACKS = registry.counter(
+    "agent_eat_chat_fallbacks_total",
+    "Canned responses returned in place of LLM output, by reason.",
+    ["reason"],
+)
+
+LLM_CACHE_REQUESTS = registry.counter(
+    "agent_eat_llm_cache_requests_total",
+    "Chat LLM response cache lookups by kind of call and result (hit, prefix_hit or miss).",
+    ["call", "result"],
+)
+
+REQUESTS = registry.counter(
+    "agent_eat_http_requests_total",
+    "Chat API requests by endpoint and HTTP status code.",
+    ["endpoint", "code"],
+)
+
+REQUEST_SECONDS = registry.histogram(
+    "agent_eat_http_request_seconds",
+    "End-to-end latency of chat API requests in seconds.",
+    ["endpoint"],
+)
+
+
+def record_progress_event(event: Dict[str, Any]) -> None:
+    """
+    Progress subscriber that turns chat pipeline events into metrics.
+
+    Args:
+        event: Event published through ``frontend.src.progress.progress``
+    """
+    event_type = event.get("type")
+    if event_type == "phase_end":
+        phase = event.get("phase", "unknown")
+        PHASE_SECONDS.observe(event.get("duration_ms", 0.0) / 1000, phase=phase)
+        if phase == "tool_call":
+            TOOL_CALLS.inc(tool=event.get("tool", "unknown"), status=event.get("status", "success"))
+        if event.get("status") == "error":
+            ERRORS.inc(phase=phase)
+    elif event_type == "fallback":
+        FALLBACKS.inc(reason=event.get("reason", "unknown"))
+    elif event_type == "phase_error":
+        ERRORS.inc(phase=event.get("phase", "unknown"))
@@ -0,0 +1,162 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from shared.config import (
+    get_context_keep_last,
+    get_context_max_tokens,
+    get_context_summary_max_chars,
+    get_tool_output_max_chars,
+)
+from shared.tool_results import truncate_text
+
+# Marks the system message that holds the rolling summary of older turns
+SUMMARY_PREFIX = "Summary of the earlier conversation (older messages were compacted):"
+
+# Rough per-message overhead of the chat format, in tokens
+_MESSAGE_OVERHEAD_TOKENS = 4
+# Length of each message excerpt folded into the summary
+_SUMMARY_LINE_CHARS = 200
+
+
+def _content_text(message: Dict[str, Any]) -> str:
+    content = message.get("content")
+    return content if isinstance(content, str) else ""
+
+
+def _is_summary(message: Dict[str, Any]) -> bool:
+    return message.get("role") == "system" and _content_text(message).startswith(SUMMARY_PREFIX)
+
+
+class ContextWindowPolicy:
+    """Keeps the chat history sent to the LLM within a fixed budget.
+
+    Leading system messages are always kept. The most recent messages are
+    kept verbatim (at least one full turn, otherwise up to ``keep_last``
+    messages and ``max_tokens`` estimated tokens); everything older is folded
+    into a single extractive summary message so latency and token cost stay
+    flat as a chat grows. Tool outputs are capped at ``max_tool_chars``.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        keep_last: Optional[int] = None,
+        max_tool_chars: Optional[int] = None,
+        max_summary_chars: Optional[int] = None,
+    ):
+        """
+        Initialize the policy; unset limits are read from the environment.
+
+        Args:
+            max_tokens: Approximate token budget per LLM call
+            keep_last: Maximum number of recent messages kept verbatim
+            max_tool_chars: Maximum characters kept from each tool result
+            max_summary_chars: Maximum length of the rolling summary
+        """
+        self.max_tokens = max_tokens if max_tokens is not None else get_context_max_tokens()
+        self.keep_last = keep_last if keep_last is not None else get_context_keep_last()
+        self.max_tool_chars = max_tool_chars if max_tool_chars is not None else get_tool_output_max_chars()
+        self.max_summary_chars = (
+            max_summary_chars if max_summary_chars is not None else get_context_summary_max_chars()
+        )
+
+    @staticmethod
+    def estimate_tokens(message: Dict[str, Any]) -> int:
+        """Estimate the tokens a message costs (about four characters per token)."""
+        chars = len(_content_text(message))
+        if message.get("tool_calls"):
+            chars += len(json.dumps(message["tool_calls"], default=str))
+        return chars // 4 + _MESSAGE_OVERHEAD_TOKENS
+
+    def truncate_tool_output(self, text: str) -> str:
+        """Cap a tool result at ``max_tool_chars`` characters."""
+        return truncate_text(text, self.max_tool_chars)
+
+    @staticmethod
+    def _safe_start(body: List[Dict[str, Any]], index: int) -> int:
+        """Move a cut point back so it never separates tool results from their call."""
+        while 0 < index < len(body) and body[index].get("role") == "tool":
+            index -= 1
+        return index
+
+    @staticmethod
+    def _last_turn_start(body: List[Dict[str, Any]]) -> int:
+        for index in range(len(body) - 1, -1, -1):
+            if body[index].get("role") == "user":
+                return index
+        return 0
+
+    def _summarize(self, previous: str, dropped: List[Dict[str, Any]]) -> str:
+        lines = [previous] if previous else []
+        for message in dropped:
+            role = message.get("role")
+            text = " ".join(_content_text(message).split())
+            if not text:
+                continue
+            label = {"user": "User", "assistant": "Assistant", "tool": "Tool result"}.get(role)
+            if label is None:
+                continue
+            lines.append(f"- {label}: {truncate_text(text, _SUMMARY_LINE_CHARS)}")
+        summary = "\n".join(lines)
+        if len(summary) > self.max_summary_chars:
+            # The most recent facts matter most; drop the oldest lines first
+            summary = summary[-self.max_summary_chars:]
+            summary = summary[summary.find("\n") + 1:] if "\n" in summary else summary
+        return summary
+
+    def apply(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Return a compacted copy of the history that fits the policy.
+
+        Args:
+            messages: The full chat history
+
+        Returns:
+            List[Dict[str, Any]]: The history to keep and send to the LLM
+        """
+        head: List[Dict[str, Any]] = []
+        previous_summary = ""
+        index = 0
+        while index < len(messages) and messages[index].get("role") == "system":
+            if _is_summary(messages[index]):
+                previous_summary = _content_text(messages[index])[len(SUMMARY_PREFIX):].strip()
+            else:
+                head.append(messages[index])
+            index += 1
+        body = messages[index:]
+
+        # Cap tool outputs first; they are the largest messages by far
+        capped = []
+        for message in body:
+            text = _content_text(message)
+            if message.get("role") == "tool" and len(text) > self.max_tool_chars:
+                message = {**message, "content": self.truncate_tool_output(text)}
+            capped.append(message)
+        body = capped
+
+        budget = self.max_tokens - sum(self.estimate_tokens(m) for m in head)
+        if previous_summary:
+            budget -= len(previous_summary) // 4 + _MESSAGE_OVERHEAD_TOKENS
+
+        # Never cut into the latest turn, whatever the limits say
+        latest_turn = self._last_turn_start(body)
+        start = min(self._safe_start(body, max(0, len(body) - self.keep_last)), latest_turn)
+        used = sum(self.estimate_tokens(m) for m in body[start:])
+        while start < latest_turn and used > budget:
+            next_start = self._safe_start(body, start + 1)
+            if next_start <= start:
+                next_start = start + 1
+                while next_start < len(body) and body[next_start].get("role") == "tool":
+                    next_start += 1
+            used -= sum(self.estimate_tokens(m) for m in body[start:next_start])
+            start = min(next_start, latest_turn)
+
+        if start == 0 and not previous_summary:
+            return head + body
+
+        summary = self._summarize(previous_summary, body[:start])
+        compacted = list(head)
+        if summary:
+            compacted.append({"role": "system", "content": f"{SUMMARY_PREFIX}\n{summary}"})
+        compacted.extend(body[start:])
+        return compacted
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from crewai.crew import Crew
+
+from shared.config import get_cache_dir, get_root_dir, is_crew_cache_enabled
+
+# Bump when the layout of the cached analysis changes
+CACHE_FORMAT_VERSION = 1
+
+# Crew configuration that feeds the analysis
+CREW_CONFIG_FILES = [
+    Path("backend") / "src" / "config" / "agents.yaml",
+    Path("backend") / "src" / "config" / "tasks.yaml",
+]
+
+
+def _tool_signatures(crew: Crew) -> List[Dict[str, Any]]:
+    """Describe every tool registered on the crew's agents."""
+    signatures = []
+    for agent in crew.agents:
+        for tool in getattr(agent, "tools", None) or []:
+            args_schema = getattr(tool, "args_schema", None)
+            schema = None
+            if args_schema is not None and hasattr(args_schema, "model_json_schema"):
+                schema = args_schema.model_json_schema()
+            signatures.append({
+                "agent": getattr(agent, "role", ""),
+                "name": getattr(tool, "name", type(tool).__name__),
+                "description": getattr(tool, "description", ""),
+                "args": schema,
+            })
+    return sorted(signatures, key=lambda s: (s["agent"], s["name"]))
+
+
+def crew_fingerprint(crew: Crew, crew_name: str, llm_model: Optional[str] = None) -> str:
+    """
+    Hash everything the crew analysis depends on.
+
+    Args:
+        crew: The CrewAI crew instance
+        crew_name: Name of the crew
+        llm_model: Model used for the analysis and introduction
+
+    Returns:
+        str: Hex digest that changes whenever the analysis would change
+    """
+    try:
+        from crewai import __version__ as crewai_version
+    except ImportError:
+        crewai_version = "unknown"
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        "format": CACHE_FORMAT_VERSION,
+        "crew_name": crew_name,
+        "llm_model": llm_model or "",
+        "crewai": crewai_version,
+        "tools": _tool_signatures(crew),
+    }, sort_keys=True, default=str).encode("utf-8"))
+
+    root_dir = get_root_dir()
+    for config_file in CREW_CONFIG_FILES:
+        path = root_dir / config_file
+        digest.update(str(config_file).encode("utf-8"))
+        digest.update(path.read_bytes() if path.exists() else b"")
+
+    return digest.hexdigest()
+
+
+def _cache_path(crew_name: str) -> Path:
+    slug = re.sub(r"[^a-zA-Z0-9_-]+", "_", crew_name).strip("_").lower() or "crew"
+    return get_cache_dir() / "crew_analysis" / f"{slug}.json"
+
+
+def load_crew_analysis(crew_name: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a cached crew analysis if it matches the current fingerprint.
+
+    Args:
+        crew_name: Name of the crew
+        fingerprint: Value returned by ``crew_fingerprint``
+
+    Returns:
+        Optional[Dict[str, Any]]: The cached analysis, or None on a miss
+    """
+    if not is_crew_cache_enabled():
+        return None
+
+    path = _cache_path(crew_name)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable crew analysis cache {path}: {str(e)}")
+        return None
+
+    if cached.get("fingerprint") != fingerprint:
+        logging.info("Crew configuration changed; crew analysis cache is stale")
+        return None
+    return cached.get("analysis")
+
+
+def save_crew_analysis(crew_name: str, fingerprint: str, analysis: Dict[str, Any]) -> None:
+    """
+    Persist a crew analysis for later process starts.
+
+    Args:
+        crew_name: Name of the crew
+        fingerprint: Value returned by ``crew_fingerprint``
+        analysis: JSON-serializable analysis to store
+    """
+    if not is_crew_cache_enabled():
+        return
+
+    path = _cache_path(crew_name)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write atomically so concurrently starting workers never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": fingerprint, "analysis": analysis}, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError) as e:
+        logging.warning(f"Could not write crew analysis cache {path}: {str(e)}")
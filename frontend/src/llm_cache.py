@@ -0,0 +1,193 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from shared.config import get_llm_cache_max_entries, get_llm_cache_ttl, is_llm_cache_enabled
+
+# LLM settings that change what a prompt produces
+_MODEL_PARAMS = ("model", "temperature", "top_p", "max_tokens", "max_completion_tokens", "seed", "stop", "response_format")
+
+_TRAILING_PUNCTUATION_RE = re.compile(r"[\s!?.,]+$")
+
+
+def _normalize_content(content: Any) -> Any:
+    if isinstance(content, str):
+        return " ".join(content.split())
+    return content
+
+
+def normalize_messages(messages: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Canonical form of a message list: whitespace in text content collapsed.
+
+    Args:
+        messages: Chat messages
+
+    Returns:
+        List[Dict[str, Any]]: Copies of the messages with normalized content
+    """
+    return [{**message, "content": _normalize_content(message.get("content"))} for message in messages]
+
+
+def normalize_user_text(text: str) -> str:
+    """Loose form of a user message: lowercase, collapsed whitespace, no trailing punctuation."""
+    return _TRAILING_PUNCTUATION_RE.sub("", " ".join(str(text).lower().split()))
+
+
+def model_params(llm: Any) -> Dict[str, Any]:
+    """
+    Collect the LLM settings that affect its output.
+
+    Args:
+        llm: A CrewAI LLM
+
+    Returns:
+        Dict[str, Any]: Settings that are set, by name
+    """
+    params = {}
+    for name in _MODEL_PARAMS:
+        value = getattr(llm, name, None)
+        if value not in (None, [], {}):
+            params[name] = value
+    return params
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def prompt_key(messages: Sequence[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]], params: Dict[str, Any]) -> str:
+    """
+    Exact-match key of an LLM call.
+
+    Args:
+        messages: Messages sent to the LLM
+        tools: Tool schemas offered to the LLM
+        params: Model settings from ``model_params``
+
+    Returns:
+        str: Hex digest of the normalized messages, tools and settings
+    """
+    return _digest({"messages": normalize_messages(messages), "tools": tools or [], "params": params})
+
+
+def prefix_key(
+    prefix_digest: str, user_message: str, tools: Optional[List[Dict[str, Any]]], params: Dict[str, Any]
+) -> str:
+    """
+    Key of a user message sent right after a known conversation prefix.
+
+    Every chat starts from the same system prompt and introduction, so the
+    first message of a chat is keyed by that prefix plus the loosely
+    normalized message: "Hi!" in one chat and "hi" in another share a key.
+
+    Args:
+        prefix_digest: Digest of the shared opening messages (see ``prefix_digest``)
+        user_message: The user message following the prefix
+        tools: Tool schemas offered to the LLM
+        params: Model settings from ``model_params``
+
+    Returns:
+        str: Hex digest
+    """
+    return _digest({
+        "prefix": prefix_digest,
+        "user": normalize_user_text(user_message),
+        "tools": tools or [],
+        "params": params,
+    })
+
+
+def prefix_digest(messages: Sequence[Dict[str, Any]]) -> str:
+    """Digest of a conversation prefix, compared against the start of later prompts."""
+    return _digest(normalize_messages(messages))
+
+
+class LLMResponseCache:
+    """Size-bounded LRU cache of LLM responses with a time-to-live.
+
+    Entries older than ``ttl`` seconds are treated as missing and dropped on
+    lookup; once ``max_entries`` are stored, the least recently used entry is
+    evicted.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a response is reused
+            max_entries: Maximum number of stored responses
+        """
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a response.
+
+        Args:
+            key: Key from ``prompt_key`` or ``prefix_key``
+
+        Returns:
+            Optional[Any]: The cached response, or None on a miss or expiry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, response: Any) -> None:
+        """
+        Store a response, evicting the least recently used one when full.
+
+        Args:
+            key: Key from ``prompt_key`` or ``prefix_key``
+            response: The LLM response
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Return the process-wide LLM response cache.
+
+    Returns:
+        Optional[LLMResponseCache]: The cache, or None unless LLM_CACHE_ENABLED is set
+    """
+    global _cache
+    if not is_llm_cache_enabled():
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache(get_llm_cache_ttl(), get_llm_cache_max_entries())
+    return _cache
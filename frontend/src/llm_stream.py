@@ -0,0 +1,69 @@
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+# Listeners are tracked per thread: each chat turn runs its LLM calls on a
+# single worker thread, so a thread-local is enough to route streamed chunks
+# back to the turn that asked for them.
+_local = threading.local()
+_bridge_installed = False
+_bridge_lock = threading.Lock()
+
+
+@contextmanager
+def token_listener(callback: Optional[Callable[[str], None]]) -> Iterator[None]:
+    """
+    Forward tokens streamed by LLM calls on this thread to ``callback``.
+
+    Args:
+        callback: Called with each text chunk; None disables forwarding
+    """
+    previous = getattr(_local, "callback", None)
+    _local.callback = callback
+    try:
+        yield
+    finally:
+        _local.callback = previous
+
+
+def emit_token(chunk: str) -> None:
+    """
+    Deliver a streamed text chunk to the listener registered on this thread.
+
+    Args:
+        chunk: The streamed text
+    """
+    callback = getattr(_local, "callback", None)
+    if callback is None or not chunk:
+        return
+    try:
+        callback(chunk)
+    except Exception as e:
+        logging.debug(f"Token listener failed: {str(e)}")
+
+
+def install_crewai_bridge() -> bool:
+    """
+    Subscribe to CrewAI's stream chunk events and forward them to ``emit_token``.
+
+    Returns:
+        bool: True if the installed CrewAI version emits stream chunk events
+    """
+    global _bridge_installed
+    with _bridge_lock:
+        if _bridge_installed:
+            return True
+        try:
+            from crewai.utilities.events import crewai_event_bus
+            from crewai.utilities.events.llm_events import LLMStreamChunkEvent
+        except ImportError:
+            logging.info("CrewAI stream events unavailable; responses will not stream tokens")
+            return False
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def _forward_chunk(source, event):
+            emit_token(event.chunk)
+
+        _bridge_installed = True
+        return True
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Progress events are plain dicts with a "type" key, e.g.
+#   {"type": "phase_start", "phase": "llm_call"}
+#   {"type": "phase_end", "phase": "llm_call", "status": "success", "duration_ms": 812.4}
+Event = Dict[str, Any]
+Subscriber = Callable[[Event], None]
+
+# Shared no-op context returned when nobody is listening
+_NULL_PHASE = nullcontext()
+
+
+def _deliver(subscriber: Subscriber, event: Event) -> None:
+    try:
+        subscriber(event)
+    except Exception as e:
+        logging.debug(f"Progress subscriber failed: {str(e)}")
+
+
+class _Phase:
+    """Times one phase and reports its start and end."""
+
+    __slots__ = ("_hooks", "_listener", "_name", "_attrs", "_start")
+
+    def __init__(self, hooks: "ProgressHooks", listener: Optional[Subscriber], name: str, attrs: Dict[str, Any]):
+        self._hooks = hooks
+        self._listener = listener
+        self._name = name
+        self._attrs = attrs
+        self._start = 0.0
+
+    def __enter__(self) -> "_Phase":
+        self._start = time.perf_counter()
+        self._hooks.emit({"type": "phase_start", "phase": self._name, **self._attrs}, self._listener)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration_ms = (time.perf_counter() - self._start) * 1000
+        self._hooks.emit({
+            "type": "phase_end",
+            "phase": self._name,
+            "status": "error" if exc_type is not None else "success",
+            "duration_ms": duration_ms,
+            **self._attrs,
+        }, self._listener)
+        return False
+
+
+class ProgressHooks:
+    """Publishes phase timings and events to interested subscribers.
+
+    Subscribers registered with ``subscribe`` see every event (metrics,
+    logging); a per-call ``listener`` sees only the events of the call it was
+    passed to (for example one streaming chat turn). When neither exists,
+    ``phase`` returns a shared no-op context and ``emit`` returns at once, so
+    instrumentation costs nothing.
+    """
+
+    def __init__(self):
+        # Copy-on-write tuple so emit can iterate without taking the lock
+        self._subscribers: Tuple[Subscriber, ...] = ()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """True if at least one global subscriber is attached."""
+        return bool(self._subscribers)
+
+    def subscribe(self, subscriber: Subscriber) -> Subscriber:
+        """
+        Attach a subscriber that receives every event; attaching the same
+        subscriber twice has no effect.
+
+        Args:
+            subscriber: Callable taking one event dict
+
+        Returns:
+            Subscriber: The subscriber, so this can be used as a decorator
+        """
+        with self._lock:
+            if subscriber not in self._subscribers:
+                self._subscribers = self._subscribers + (subscriber,)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Detach a subscriber added with ``subscribe``."""
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not subscriber)
+
+    def emit(self, event: Event, listener: Optional[Subscriber] = None) -> None:
+        """
+        Publish an event.
+
+        Args:
+            event: Event dict with at least a "type" key
+            listener: Optional per-call listener that also receives the event
+        """
+        for subscriber in self._subscribers:
+            _deliver(subscriber, event)
+        if listener is not None:
+            _deliver(listener, event)
+
+    def phase(self, name: str, listener: Optional[Subscriber] = None, **attrs: Any):
+        """
+        Context manager that reports the start, end and duration of a phase.
+
+        Args:
+            name: Phase name, e.g. "llm_call" or "tool_call"
+            listener: Optional per-call listener
+            **attrs: Extra fields added to both events
+
+        Returns:
+            A context manager; a shared no-op one when nobody is listening
+        """
+        if listener is None and not self._subscribers:
+            return _NULL_PHASE
+        return _Phase(self, listener, name, attrs)
+
+
+# Process-wide hooks used by the chat handler
+progress = ProgressHooks()
@@ -1,26 +1,41 @@
+import asyncio
 import json
 import logging
 import os
 import sys
 from pathlib import Path
-import threading
 import time
-from typing import Dict, Optional, List
-
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse, FileResponse, HTMLResponse
+import argparse
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional, List
+
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.responses import (
+    JSONResponse,
+    FileResponse,
+    HTMLResponse,
+    PlainTextResponse,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
-import click
 import socket
 
 # Add project root to sys.path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 # Import shared utilities
-from shared.config import load_env
+from shared.metrics import registry as metrics_registry
+from shared.config import (
+    load_env,
+    get_chat_workers,
+    get_chat_queue_limit,
+    get_chat_timeout,
+    get_thread_store_backend,
+    get_web_workers,
+)
 
 # Import local modules
 from frontend.src.crew_loader import (
@@ -29,6 +44,11 @@ from frontend.src.crew_loader import (
     discover_available_crews,
 )
 from frontend.src.chat_handler import ChatHandler
+from frontend.src.chat_metrics import REQUEST_SECONDS, REQUESTS, record_progress_event
+from frontend.src.progress import progress
+from frontend.src.session_manager import SessionManager
+from frontend.src.thread_store import create_thread_store
+from frontend.src.worker_pool import BoundedExecutor, QueueFullError
 
 # Load environment variables
 load_env()
@@ -42,38 +62,103 @@ logging.basicConfig(
 log = logging.getLogger("werkzeug")
 log.setLevel(logging.ERROR)
 
-# Create FastAPI app
-app = FastAPI()
-
-# Enable CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
 # Get the directory containing the built React app
 ui_dir = Path(__file__).parent / "ui" / "build" / "client"
 
-# Mount the static files from the React build
-# Add error handling for the static files mounting
-assets_dir = ui_dir / "assets"
-try:
-    if not assets_dir.exists():
-        os.makedirs(assets_dir, exist_ok=True)
-        logging.warning(f"Created missing assets directory: {assets_dir}")
-    app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
-except Exception as e:
-    logging.error(f"Error mounting static files: {str(e)}")
-    # Continue without static files, the app will still work but without styles
-
-# Global state
-chat_handler = None
-chat_handlers: Dict[str, ChatHandler] = {}
-chat_threads: Dict[str, Dict[str, List]] = {}
-discovered_crews: List[Dict] = []
+# Import string uvicorn uses to build the app in each worker process
+APP_FACTORY = "frontend.src.server:create_app"
+
+_METERED_ENDPOINTS = {"/api/chat", "/api/chat/stream", "/api/initialize", "/api/crews"}
+
+
+class ServerState:
+    """Per-process state shared by the API endpoints.
+
+    Every worker process builds its own state in ``create_app``; chat
+    histories live in the thread store, so with the SQLite store any worker
+    can serve any chat thread.
+    """
+
+    def __init__(self):
+        self.chat_handler: Optional[ChatHandler] = None
+        self.chat_handlers: Dict[str, ChatHandler] = {}
+        self.sessions = SessionManager(create_thread_store())
+        self.discovered_crews: List[Dict] = []
+
+        # Chat turns block on LLM and crew calls, so they run on a bounded pool
+        self.chat_executor = BoundedExecutor(
+            max_workers=get_chat_workers(),
+            max_queue=get_chat_queue_limit(),
+            thread_name_prefix="chat-worker",
+        )
+
+    def warm_up(self) -> None:
+        """Load the crew and run its analysis before the first request arrives."""
+        self.discovered_crews = discover_available_crews()
+        crew_instance, crew_name = load_crew()
+        self.chat_handler = ChatHandler(crew_instance, crew_name)
+        self.chat_handlers[self.discovered_crews[0]["id"]] = self.chat_handler
+
+        # Reuses the on-disk crew analysis when another worker already ran it
+        self.chat_handler.initialize()
+        if not self.chat_handler.is_initialized:
+            logging.warning("Crew analysis failed during warm-up; retrying on first request")
+        logging.info(f"Worker {os.getpid()} warmed up crew '{crew_name}'")
+
+    def register_metrics(self) -> None:
+        """Point the pool and session gauges at this state."""
+        metrics_registry.gauge(
+            "agent_eat_chat_pool_in_flight",
+            "Chat turns running or waiting for a worker.",
+            lambda: self.chat_executor.in_flight,
+        )
+        metrics_registry.gauge(
+            "agent_eat_chat_pool_queued",
+            "Chat turns waiting for a worker.",
+            lambda: self.chat_executor.queued,
+        )
+        metrics_registry.gauge(
+            "agent_eat_chat_sessions",
+            "Chat sessions resident in this process.",
+            lambda: len(self.sessions),
+        )
+        workers = get_web_workers()
+        metrics_registry.gauge(
+            "agent_eat_web_workers",
+            "Worker processes serving the API; every other metric covers only the worker that answered.",
+            lambda: workers,
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker pool and release the thread store."""
+        self.chat_executor.shutdown()
+        self.sessions.store.close()
+
+
+def _state(request: Request) -> ServerState:
+    return request.app.state.server
+
+
+async def record_request_metrics(request: Request, call_next):
+    """Count API requests and time them (until the response starts)."""
+    path = request.url.path
+    if not path.startswith("/api/"):
+        return await call_next(request)
+
+    # Keep label cardinality bounded regardless of what clients request
+    endpoint = path if path in _METERED_ENDPOINTS else "other"
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+        REQUESTS.inc(endpoint=endpoint, code=str(status_code))
+
+
+router = APIRouter()
 
 
 # Pydantic models for request/response validation
@@ -88,207 +173,271 @@ class InitializeRequest(BaseModel):
     chat_id: Optional[str] = None
 
 
-@app.post("/api/chat")
-async def chat(message: ChatMessage) -> JSONResponse:
-    """API endpoint to handle chat messages."""
-    global chat_handler
+def _resolve_handler(state: ServerState, crew_id: Optional[str]) -> Optional[ChatHandler]:
+    """Return the handler for a crew, falling back to the default handler."""
+    handler = state.chat_handlers.get(crew_id) if crew_id else None
+    return handler if handler is not None else state.chat_handler
+
+
+def _process_chat_turn(
+    state: ServerState,
+    chat_id: str,
+    handler: ChatHandler,
+    crew_id: Optional[str],
+    user_message: str,
+    on_event: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """Run one chat turn; executed on the chat worker pool."""
+    # Each chat thread owns its own session and message history
+    with progress.phase("session_bookkeeping"):
+        session = state.sessions.get_or_create(chat_id, handler, crew_id)
+
+    logging.debug(f"Processing message with chat session for chat_id: {chat_id}")
+    response = session.process_message(user_message, on_event=on_event)
+
+    with progress.phase("session_bookkeeping"):
+        state.sessions.save(session)
+
+    # Ensure we have content in the response
+    if not response.get("content") and response.get("status") == "success":
+        logging.warning("Response content is empty despite successful status")
+        response["content"] = (
+            "I'm sorry, but I couldn't generate a response. Please try again."
+        )
 
-    user_message = message.message
-    crew_id = message.crew_id
-    chat_id = message.chat_id
-    logging.debug(f"Received chat message for chat_id: {chat_id}, crew_id: {crew_id}")
+    # Always include the chat_id in the response to ensure proper thread tracking
+    response["chat_id"] = chat_id
+    response["crew_id"] = crew_id if crew_id else handler.crew_name
+    logging.debug(
+        f"Sending response for chat_id: {chat_id}, crew_id: {response['crew_id']}"
+    )
+    return response
 
-    if not user_message:
-        logging.warning("No message provided in request")
-        raise HTTPException(status_code=400, detail="No message provided")
 
+def _initialize_chat(state: ServerState, chat_id: Optional[str]) -> Dict:
+    """Set up the default handler and chat session; executed on the chat worker pool."""
+    # We're only using the single pre-initialized ChatbotCrew
+    crew_id = state.discovered_crews[0]["id"]
+    if not state.chat_handler:
+        crew_instance, crew_name = load_crew()
+        state.chat_handler = ChatHandler(crew_instance, crew_name)
+        # Add this to chat_handlers
+        state.chat_handlers[crew_id] = state.chat_handler
+    chat_handler = state.chat_handler
+
+    # Initialize the chat handler (the crew analysis only runs once)
+    initial_message = chat_handler.initialize()
+
+    # If a chat_id is provided, make sure it has a session
+    if chat_id:
+        state.sessions.get_or_create(chat_id, chat_handler, crew_id)
+
+    return {
+        "status": "success",
+        "message": initial_message,
+        "required_inputs": [
+            {"name": field.name, "description": field.description}
+            for field in chat_handler.crew_chat_inputs.inputs
+        ],
+        "crew_id": crew_id,
+        "crew_name": chat_handler.crew_name,
+        "crew_description": chat_handler.crew_chat_inputs.crew_description,
+        "chat_id": chat_id,
+    }
+
+
+def _busy_exception() -> HTTPException:
+    """Build the 429 returned when the chat worker pool is saturated."""
+    return HTTPException(
+        status_code=429,
+        detail="The assistant is busy right now. Please try again shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _run_on_chat_pool(state: ServerState, fn, *args):
+    """Run blocking chat work on the worker pool, translating overload into HTTP errors."""
     try:
-        # If no chat_id is provided, we can't properly track the thread
-        if not chat_id:
-            raise HTTPException(
-                status_code=400,
-                detail="No chat ID provided. Unable to track conversation thread.",
-            )
+        return await state.chat_executor.run(fn, state, *args, timeout=get_chat_timeout())
+    except QueueFullError as e:
+        logging.warning(f"Rejecting chat request: {str(e)}")
+        raise _busy_exception()
+    except asyncio.TimeoutError:
+        logging.warning(f"Chat request timed out after {get_chat_timeout()}s")
+        raise HTTPException(
+            status_code=503,
+            detail="The assistant took too long to respond. Please try again.",
+            headers={"Retry-After": "5"},
+        )
 
-        # If a specific crew_id is provided, use that chat handler
-        if crew_id and crew_id in chat_handlers:
-            handler = chat_handlers[crew_id]
-            # Update the global chat handler to track the currently active one
-            chat_handler = handler
-        elif chat_handler is None:
-            raise HTTPException(
-                status_code=400,
-                detail="No crew has been initialized. Please select a crew first.",
-            )
 
-        # Always store messages in the appropriate chat thread
-        # Initialize the thread if it doesn't exist
-        if chat_id not in chat_threads:
-            chat_threads[chat_id] = {"crew_id": crew_id, "messages": []}
-            logging.debug(f"Created new chat thread for chat_id: {chat_id}")
+def _validate_chat_message(state: ServerState, message: ChatMessage) -> ChatHandler:
+    """Check a chat request and return the handler that should serve it."""
+    if not message.message:
+        logging.warning("No message provided in request")
+        raise HTTPException(status_code=400, detail="No message provided")
 
-        # Add user message to the thread
-        chat_threads[chat_id]["messages"].append(
-            {"role": "user", "content": user_message}
+    # If no chat_id is provided, we can't properly track the thread
+    if not message.chat_id:
+        raise HTTPException(
+            status_code=400,
+            detail="No chat ID provided. Unable to track conversation thread.",
         )
-        logging.debug(
-            f"Added user message to chat_id: {chat_id}, message count: {len(chat_threads[chat_id]['messages'])}"
-        )
-
-        # Always restore the conversation history for this thread
-        if hasattr(chat_handler, "messages"):
-            # Save the current thread first if it exists and is different
-            current_thread = getattr(chat_handler, "current_chat_id", None)
-            if (
-                current_thread
-                and current_thread != chat_id
-                and hasattr(chat_handler, "messages")
-            ):
-                # Create a deep copy of the messages to avoid reference issues
-                chat_threads[current_thread] = {
-                    "crew_id": (
-                        crew_id
-                        if crew_id
-                        else getattr(chat_handler, "crew_name", "default")
-                    ),
-                    "messages": (
-                        chat_handler.messages.copy()
-                        if isinstance(chat_handler.messages, list)
-                        else []
-                    ),
-                }
-                logging.debug(
-                    f"Saved {len(chat_handler.messages)} messages from previous thread: {current_thread}"
-                )
 
-            # Restore the thread we're working with - create a deep copy to avoid reference issues
-            if chat_id in chat_threads:
-                chat_handler.messages = (
-                    chat_threads[chat_id]["messages"].copy()
-                    if isinstance(chat_threads[chat_id]["messages"], list)
-                    else []
-                )
-                # Mark the current thread
-                chat_handler.current_chat_id = chat_id
-                logging.debug(
-                    f"Restored {len(chat_handler.messages)} messages for chat_id: {chat_id}"
-                )
+    # If a specific crew_id is provided, use that chat handler
+    handler = _resolve_handler(state, message.crew_id)
+    if handler is None:
+        raise HTTPException(
+            status_code=400,
+            detail="No crew has been initialized. Please select a crew first.",
+        )
+    return handler
 
-        logging.debug(f"Processing message with chat_handler for chat_id: {chat_id}")
-        response = chat_handler.process_message(user_message)
 
-        # Ensure we have content in the response
-        if not response.get("content") and response.get("status") == "success":
-            logging.warning("Response content is empty despite successful status")
-            response["content"] = (
-                "I'm sorry, but I couldn't generate a response. Please try again."
-            )
+def _sse_event(event: Dict) -> str:
+    """Format an event as a Server-Sent Events frame."""
+    return f"data: {json.dumps(event)}\n\n"
 
-        # Always add the response to the chat thread if it's valid
-        if response.get("status") == "success" and response.get("content"):
-            # Add the assistant response to the chat thread
-            chat_threads[chat_id]["messages"].append(
-                {"role": "assistant", "content": response["content"]}
-            )
 
-            # Ensure chat_handler.messages is synchronized with chat_threads
-            # This is critical to ensure messages are preserved correctly
-            if hasattr(chat_handler, "messages"):
-                # Synchronize the chat handler's messages with the thread
-                chat_handler.messages = chat_threads[chat_id]["messages"].copy()
+@router.post("/api/chat")
+async def chat(message: ChatMessage, request: Request) -> JSONResponse:
+    """API endpoint to handle chat messages."""
+    user_message = message.message
+    crew_id = message.crew_id
+    chat_id = message.chat_id
+    logging.debug(f"Received chat message for chat_id: {chat_id}, crew_id: {crew_id}")
 
-            logging.debug(
-                f"Added assistant response to chat_id: {chat_id}, message count: {len(chat_threads[chat_id]['messages'])}"
-            )
+    try:
+        state = _state(request)
+        handler = _validate_chat_message(state, message)
 
-        # Always include the chat_id in the response to ensure proper thread tracking
-        response["chat_id"] = chat_id
-        response["crew_id"] = (
-            crew_id if crew_id else getattr(chat_handler, "crew_name", "default")
-        )
-        logging.debug(
-            f"Sending response for chat_id: {chat_id}, crew_id: {response['crew_id']}"
+        # The turn blocks on LLM and crew calls, so keep it off the event loop
+        response = await _run_on_chat_pool(
+            state, _process_chat_turn, chat_id, handler, crew_id, user_message
         )
-
         return JSONResponse(content=response)
+    except HTTPException:
+        raise
     except Exception as e:
         error_message = f"Error processing chat message: {str(e)}"
         logging.error(error_message, exc_info=True)
         raise HTTPException(status_code=500, detail=error_message)
 
 
-@app.post("/api/initialize")
-@app.get("/api/initialize")
-async def initialize(request: InitializeRequest = None) -> JSONResponse:
-    """Initialize the chat handler and return initial message."""
-    global chat_handler
+@router.post("/api/chat/stream")
+async def chat_stream(message: ChatMessage, request: Request) -> StreamingResponse:
+    """Streaming variant of /api/chat.
+
+    Emits Server-Sent Events as the turn progresses: ``token`` events carry
+    LLM output as it is generated, ``phase_start``/``phase_end`` report the
+    LLM call and the crew tool run (phase "tool_call") with timings,
+    ``phase_error`` and ``fallback`` report problems the turn recovered
+    from, and a final ``done`` event carries the same payload /api/chat
+    returns. Only a terminal ``error`` event, sent when the turn times out,
+    ends the stream without ``done``.
+    """
+    chat_id = message.chat_id
+    crew_id = message.crew_id
+    logging.debug(f"Received streaming chat message for chat_id: {chat_id}, crew_id: {crew_id}")
+
+    state = _state(request)
+    handler = _validate_chat_message(state, message)
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_event(event: Dict) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, event)
 
+    def run_turn() -> None:
+        try:
+            response = _process_chat_turn(
+                state, chat_id, handler, crew_id, message.message, on_event=on_event
+            )
+        except Exception as e:
+            logging.error(f"Error processing chat message: {str(e)}", exc_info=True)
+            response = {
+                "status": "error",
+                "content": f"Error processing chat message: {str(e)}",
+                "chat_id": chat_id,
+                "crew_id": crew_id,
+            }
+        on_event({"type": "done", **response})
+
+    try:
+        state.chat_executor.submit(run_turn)
+    except QueueFullError as e:
+        logging.warning(f"Rejecting chat request: {str(e)}")
+        raise _busy_exception()
+
+    async def event_stream():
+        deadline = loop.time() + get_chat_timeout()
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    events.get(), timeout=max(0.0, deadline - loop.time())
+                )
+            except asyncio.TimeoutError:
+                logging.warning(f"Streaming chat request timed out after {get_chat_timeout()}s")
+                yield _sse_event({
+                    "type": "error",
+                    "status": "error",
+                    "content": "The assistant took too long to respond. Please try again.",
+                    "chat_id": chat_id,
+                })
+                return
+            yield _sse_event(event)
+            if event.get("type") == "done":
+                return
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/api/initialize")
+@router.get("/api/initialize")
+async def initialize(request: Request, body: InitializeRequest = None) -> JSONResponse:
+    """Initialize the chat handler and return initial message."""
     # Handle both GET and POST requests
     chat_id = None
-    if request:
-        chat_id = request.chat_id
+    if body:
+        chat_id = body.chat_id
 
     logging.debug(f"Initializing chat with chat_id: {chat_id}")
 
     try:
-        # We're only using the single pre-initialized ChatbotCrew
-        if not chat_handler:
-            crew_instance, crew_name = load_crew()
-            chat_handler = ChatHandler(crew_instance, crew_name)
-            # Add this to chat_handlers
-            crew_id = discovered_crews[0]["id"]
-            chat_handlers[crew_id] = chat_handler
-
-        # Initialize the chat handler
-        initial_message = chat_handler.initialize()
-
-        # If a chat_id is provided, associate it with this chat handler
-        if chat_id:
-            # Set the current chat ID for this handler
-            chat_handler.current_chat_id = chat_id
-
-            # If this chat thread already exists, restore its messages
-            if chat_id in chat_threads:
-                # Create a deep copy of the messages to avoid reference issues
-                chat_handler.messages = (
-                    chat_threads[chat_id]["messages"].copy()
-                    if isinstance(chat_threads[chat_id]["messages"], list)
-                    else []
-                )
-                logging.debug(
-                    f"Restored {len(chat_handler.messages)} messages for chat_id: {chat_id}"
-                )
-            else:
-                # Initialize a new chat thread
-                chat_threads[chat_id] = {"crew_id": discovered_crews[0]["id"], "messages": []}
-                chat_handler.messages = []
-                logging.debug(f"Created new chat thread for chat_id: {chat_id}")
-
-        return JSONResponse(
-            content={
-                "status": "success",
-                "message": initial_message,
-                "required_inputs": [
-                    {"name": field.name, "description": field.description}
-                    for field in chat_handler.crew_chat_inputs.inputs
-                ],
-                "crew_id": discovered_crews[0]["id"],
-                "crew_name": chat_handler.crew_name,
-                "crew_description": chat_handler.crew_chat_inputs.crew_description,
-                "chat_id": chat_id,
-            }
-        )
+        content = await _run_on_chat_pool(_state(request), _initialize_chat, chat_id)
+        return JSONResponse(content=content)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/crews")
-async def get_available_crews() -> JSONResponse:
+@router.get("/api/crews")
+async def get_available_crews(request: Request) -> JSONResponse:
     """Get a list of all available crews."""
-    return JSONResponse(content={"status": "success", "crews": discovered_crews})
+    return JSONResponse(content={"status": "success", "crews": _state(request).discovered_crews})
+
+
+@router.get("/api/metrics")
+async def get_metrics() -> PlainTextResponse:
+    """Expose latency histograms and counters in the Prometheus text format.
+
+    Metrics live in each worker process, so with several workers a scrape
+    reports the one worker that answered it (agent_eat_web_workers says how
+    many there are); scrape each worker's port or run a single worker for
+    totals.
+    """
+    return PlainTextResponse(
+        content=metrics_registry.render(),
+        media_type="text/plain; version=0.0.4",
+    )
 
 
-@app.get("/{full_path:path}")
+@router.get("/{full_path:path}")
 async def serve_react_app(full_path: str):
     """Serve the React application and handle client-side routing."""
     # Check if the path points to an existing file in the build directory
@@ -336,15 +485,56 @@ async def serve_react_app(full_path: str):
     return HTMLResponse(content=fallback_html)
 
 
-def show_loading(stop_event, message):
-    """Display animated loading dots while processing."""
-    counter = 0
-    while not stop_event.is_set():
-        dots = "." * (counter % 4)
-        click.echo(f"\r{message}{dots.ljust(3)}", nl=False)
-        counter += 1
-        threading.Event().wait(0.5)
-    click.echo()  # Final newline
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application; uvicorn calls this once per worker process.
+
+    Returns:
+        FastAPI: The configured application
+    """
+    state = ServerState()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Each worker loads its own crew; the analysis comes from the disk cache
+        # once the first worker (or the parent process) has produced it
+        await asyncio.get_running_loop().run_in_executor(None, state.warm_up)
+        try:
+            yield
+        finally:
+            state.shutdown()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.server = state
+
+    # Enable CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.middleware("http")(record_request_metrics)
+
+    # Mount the static files from the React build
+    # Add error handling for the static files mounting
+    assets_dir = ui_dir / "assets"
+    try:
+        if not assets_dir.exists():
+            os.makedirs(assets_dir, exist_ok=True)
+            logging.warning(f"Created missing assets directory: {assets_dir}")
+        app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
+    except Exception as e:
+        logging.error(f"Error mounting static files: {str(e)}")
+        # Continue without static files, the app will still work but without styles
+
+    app.include_router(router)
+
+    # Feed chat pipeline timings and counters into /api/metrics
+    progress.subscribe(record_progress_event)
+    state.register_metrics()
+    return app
 
 
 def find_available_port(start_port: int = 8000, max_attempts: int = 100) -> int:
@@ -361,21 +551,41 @@ def find_available_port(start_port: int = 8000, max_attempts: int = 100) -> int:
     )
 
 
+def _warm_crew_cache() -> None:
+    """Run the crew analysis once so worker processes start from the disk cache."""
+    crew_instance, crew_name = load_crew()
+    handler = ChatHandler(crew_instance, crew_name)
+    handler.initialize()
+    if not handler.is_initialized:
+        raise RuntimeError(f"Crew analysis for '{crew_name}' failed")
+
+
 def main():
     """Start the web server."""
+    parser = argparse.ArgumentParser(description="Start the Agent Eat Chatbot server.")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind to")
+    parser.add_argument("--port", type=int, default=None, help="Port to bind to (default: first free port from 8000)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=get_web_workers(),
+        help="Number of worker processes (default: WEB_WORKERS or 1)",
+    )
+    args = parser.parse_args()
+    workers = max(1, args.workers)
+    # Workers read the count back for the agent_eat_web_workers gauge
+    os.environ["WEB_WORKERS"] = str(workers)
+
+    if workers > 1 and get_thread_store_backend() != "sqlite":
+        # Chat threads must be visible to every worker, not just the one that saw them last
+        logging.warning("Multiple workers need a shared thread store; using THREAD_STORE=sqlite")
+        os.environ["THREAD_STORE"] = "sqlite"
+
     # Get the single ChatbotCrew from backend/src
-    global discovered_crews, chat_handler
     try:
-        discovered_crews = discover_available_crews()
-        
-        # Pre-initialize the crew for faster startup
-        crew_instance, crew_name = load_crew()
-        chat_handler = ChatHandler(crew_instance, crew_name)
-        
-        # Add ID to the chat handler for tracking
-        crew_id = discovered_crews[0]["id"]
-        chat_handlers[crew_id] = chat_handler
-        
+        discover_available_crews()
+        if workers > 1:
+            _warm_crew_cache()
         print(f"Successfully loaded Agent Eat chatbot crew.")
     except Exception as e:
         logging.error(f"Error initializing chatbot: {str(e)}")
@@ -383,14 +593,14 @@ def main():
         sys.exit(1)
 
     # Find an available port
-    port = find_available_port(start_port=8000)
-    
-    print(f"\nStarting Agent Eat Chatbot server on http://localhost:{port}")
+    port = args.port if args.port else find_available_port(start_port=8000)
+
+    print(f"\nStarting Agent Eat Chatbot server on http://localhost:{port} with {workers} worker(s)")
     print("Press Ctrl+C to stop the server")
-    
+
     try:
-        # Start uvicorn server
-        uvicorn.run(app, host="0.0.0.0", port=port)
+        # Start uvicorn server; workers import the app factory themselves
+        uvicorn.run(APP_FACTORY, factory=True, host=args.host, port=port, workers=workers)
     except KeyboardInterrupt:
         print("\nShutting down server...")
 
@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from shared.config import get_max_resident_threads, get_thread_ttl
+from frontend.src.chat_handler import ChatHandler, ChatSession
+from frontend.src.thread_store import MemoryThreadStore, ThreadStore
+
+
+class _ResidentSession:
+    """A session held in memory plus the store version it was loaded at."""
+
+    __slots__ = ("session", "version", "last_access")
+
+    def __init__(self, session: ChatSession, version: Optional[int]):
+        self.session = session
+        self.version = version
+        self.last_access = time.monotonic()
+
+
+class SessionManager:
+    """Owns one ChatSession per chat thread.
+
+    Only recently used sessions stay resident (an LRU bounded by
+    ``max_resident`` with an idle ``ttl``); every turn is written to the
+    ``ThreadStore`` so evicted or restarted threads are reloaded lazily.
+    With a store shared between processes, a resident session is reloaded
+    when another process has saved a newer version.
+
+    The registry lock is only held while looking up or inserting sessions,
+    never while a message is processed, so turns in different chats run
+    independently.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ThreadStore] = None,
+        max_resident: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the session manager.
+
+        Args:
+            store: Where thread histories are persisted; defaults to an in-memory store
+            max_resident: Number of sessions kept in memory
+            ttl: Seconds an idle session stays resident
+        """
+        self.store = store if store is not None else MemoryThreadStore(ttl=get_thread_ttl())
+        self.max_resident = max_resident if max_resident is not None else get_max_resident_threads()
+        self.ttl = ttl if ttl is not None else get_thread_ttl()
+        self._sessions: "OrderedDict[str, _ResidentSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _resident(self, chat_id: str) -> Optional[_ResidentSession]:
+        """Return a live resident entry; callers must hold ``_lock``."""
+        entry = self._sessions.get(chat_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.last_access > self.ttl:
+            del self._sessions[chat_id]
+            return None
+        entry.last_access = time.monotonic()
+        self._sessions.move_to_end(chat_id)
+        return entry
+
+    def _is_current(self, entry: _ResidentSession) -> bool:
+        """Check a resident session against the store when other processes may write to it."""
+        if not self.store.shared:
+            return True
+        return self.store.version(entry.session.chat_id) == entry.version
+
+    def _insert(self, chat_id: str, entry: _ResidentSession) -> None:
+        """Add a resident entry and evict the least recently used; callers must hold ``_lock``."""
+        self._sessions[chat_id] = entry
+        self._sessions.move_to_end(chat_id)
+        while len(self._sessions) > self.max_resident:
+            evicted_id, _ = self._sessions.popitem(last=False)
+            logging.debug(f"Evicted chat session for chat_id: {evicted_id}")
+
+    def get(self, chat_id: str) -> Optional[ChatSession]:
+        """
+        Return the resident session for a chat thread, if any.
+
+        Args:
+            chat_id: Identifier of the chat thread
+
+        Returns:
+            Optional[ChatSession]: The session or None
+        """
+        with self._lock:
+            entry = self._resident(chat_id)
+            return entry.session if entry is not None else None
+
+    def get_or_create(
+        self, chat_id: str, handler: ChatHandler, crew_id: Optional[str] = None
+    ) -> ChatSession:
+        """
+        Return the session for a chat thread, loading or creating it on first use.
+
+        Args:
+            chat_id: Identifier of the chat thread
+            handler: Handler used to seed a new session
+            crew_id: Identifier of the crew serving the thread
+
+        Returns:
+            ChatSession: The existing, reloaded or newly created session
+        """
+        with self._lock:
+            entry = self._resident(chat_id)
+        if entry is not None and entry.session.handler is handler and self._is_current(entry):
+            return entry.session
+
+        # Load or create outside the registry lock; reading the store or
+        # running the handler's crew analysis can be slow.
+        if not handler.is_initialized:
+            handler.initialize()
+        if not handler.is_initialized:
+            raise RuntimeError(f"Chat handler for '{handler.crew_name}' failed to initialize")
+        record = self.store.load(chat_id)
+        if record is not None:
+            session = ChatSession(
+                handler, chat_id, record["crew_id"] or crew_id, messages=record["messages"]
+            )
+            new_entry = _ResidentSession(session, record["version"])
+            logging.debug(f"Loaded chat session for chat_id: {chat_id} from the thread store")
+        else:
+            new_entry = _ResidentSession(handler.create_session(chat_id, crew_id), None)
+            logging.debug(f"Created new chat session for chat_id: {chat_id}")
+
+        with self._lock:
+            entry = self._resident(chat_id)
+            if (
+                entry is not None
+                and entry.session.handler is handler
+                and entry.version == new_entry.version
+            ):
+                return entry.session
+            self._insert(chat_id, new_entry)
+            return new_entry.session
+
+    def save(self, session: ChatSession) -> None:
+        """
+        Persist a session's history after a turn.
+
+        Args:
+            session: The session to save
+        """
+        with session.lock:
+            version = self.store.save(session.chat_id, session.crew_id, session.messages)
+        with self._lock:
+            entry = self._sessions.get(session.chat_id)
+            if entry is not None and entry.session is session:
+                entry.version = version
+
+    def remove(self, chat_id: str) -> None:
+        """Forget a chat thread, both in memory and in the store."""
+        with self._lock:
+            self._sessions.pop(chat_id, None)
+        self.store.delete(chat_id)
+
+    def __contains__(self, chat_id: str) -> bool:
+        with self._lock:
+            return chat_id in self._sessions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
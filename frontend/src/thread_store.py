@@ -0,0 +1,291 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TypedDict
+
+from shared.config import (
+    get_max_resident_threads,
+    get_thread_store_backend,
+    get_thread_store_path,
+    get_thread_ttl,
+)
+
+
+class ThreadRecord(TypedDict):
+    crew_id: Optional[str]
+    messages: List[Dict[str, Any]]
+    version: int
+    updated_at: float
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize LLM SDK objects (e.g. tool call models) found in messages."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "dict"):
+        return value.dict()
+    return str(value)
+
+
+class ThreadStore(ABC):
+    """Persistence for chat thread histories.
+
+    ``shared`` tells callers whether other processes may write to the same
+    store, in which case cached copies must be revalidated with ``version``.
+    """
+
+    shared = False
+
+    @abstractmethod
+    def load(self, chat_id: str) -> Optional[ThreadRecord]:
+        """Return the stored thread, or None if it does not exist or expired."""
+
+    @abstractmethod
+    def version(self, chat_id: str) -> Optional[int]:
+        """Return the stored version of a thread without loading its messages."""
+
+    @abstractmethod
+    def save(self, chat_id: str, crew_id: Optional[str], messages: List[Dict[str, Any]]) -> int:
+        """Store a thread and return its new version."""
+
+    @abstractmethod
+    def delete(self, chat_id: str) -> None:
+        """Remove a thread."""
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class MemoryThreadStore(ThreadStore):
+    """In-process store with LRU eviction and a time-to-live.
+
+    Messages are kept as the objects the session holds: ``save`` copies the
+    list, not the messages, so a turn costs one list copy however long the
+    history. Messages are never modified after they are appended, so sharing
+    them with the session is safe.
+    """
+
+    def __init__(self, max_threads: int = 10000, ttl: Optional[float] = None):
+        """
+        Initialize the store.
+
+        Args:
+            max_threads: Number of threads kept before the least recently used is dropped
+            ttl: Seconds an idle thread is kept, or None to keep threads forever
+        """
+        self.max_threads = max_threads
+        self.ttl = ttl
+        self._threads: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_live(self, chat_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._threads.get(chat_id)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.time() - entry["updated_at"] > self.ttl:
+            del self._threads[chat_id]
+            return None
+        self._threads.move_to_end(chat_id)
+        return entry
+
+    def load(self, chat_id: str) -> Optional[ThreadRecord]:
+        with self._lock:
+            entry = self._get_live(chat_id)
+            if entry is None:
+                return None
+            return ThreadRecord(
+                crew_id=entry["crew_id"],
+                messages=list(entry["messages"]),
+                version=entry["version"],
+                updated_at=entry["updated_at"],
+            )
+
+    def version(self, chat_id: str) -> Optional[int]:
+        with self._lock:
+            entry = self._get_live(chat_id)
+            return entry["version"] if entry is not None else None
+
+    def save(self, chat_id: str, crew_id: Optional[str], messages: List[Dict[str, Any]]) -> int:
+        snapshot = list(messages)
+        with self._lock:
+            previous = self._threads.pop(chat_id, None)
+            version = previous["version"] + 1 if previous else 1
+            self._threads[chat_id] = {
+                "crew_id": crew_id,
+                "messages": snapshot,
+                "version": version,
+                "updated_at": time.time(),
+            }
+            while len(self._threads) > self.max_threads:
+                self._threads.popitem(last=False)
+            return version
+
+    def delete(self, chat_id: str) -> None:
+        with self._lock:
+            self._threads.pop(chat_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._threads)
+
+
+class SQLiteThreadStore(ThreadStore):
+    """On-disk store that survives restarts and is shared by worker processes.
+
+    Uses WAL mode so readers in other processes are not blocked by a writer.
+    Each thread gets its own connection, as sqlite3 connections must not be
+    shared across threads; every connection is tracked so ``close`` can
+    release them all.
+    """
+
+    shared = True
+
+    # Expired threads are purged once every this many saves
+    _PURGE_EVERY = 500
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            path: Path to the SQLite database file
+            ttl: Seconds an idle thread is kept, or None to keep threads forever
+        """
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._saves = 0
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chat_threads (
+                    chat_id TEXT PRIMARY KEY,
+                    crew_id TEXT,
+                    messages TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chat_threads_updated_at ON chat_threads (updated_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only the creating thread uses the connection; close() may run on another
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl if self.ttl is not None else float("-inf")
+
+    def load(self, chat_id: str) -> Optional[ThreadRecord]:
+        row = self._connection().execute(
+            "SELECT crew_id, messages, version, updated_at FROM chat_threads "
+            "WHERE chat_id = ? AND updated_at >= ?",
+            (chat_id, self._cutoff()),
+        ).fetchone()
+        if row is None:
+            return None
+        return ThreadRecord(
+            crew_id=row[0], messages=json.loads(row[1]), version=row[2], updated_at=row[3]
+        )
+
+    def version(self, chat_id: str) -> Optional[int]:
+        row = self._connection().execute(
+            "SELECT version FROM chat_threads WHERE chat_id = ? AND updated_at >= ?",
+            (chat_id, self._cutoff()),
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def save(self, chat_id: str, crew_id: Optional[str], messages: List[Dict[str, Any]]) -> int:
+        payload = json.dumps(messages, default=_json_default)
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO chat_threads (chat_id, crew_id, messages, version, updated_at)
+                VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT(chat_id) DO UPDATE SET
+                    crew_id = excluded.crew_id,
+                    messages = excluded.messages,
+                    version = chat_threads.version + 1,
+                    updated_at = excluded.updated_at
+                """,
+                (chat_id, crew_id, payload, time.time()),
+            )
+            version = conn.execute(
+                "SELECT version FROM chat_threads WHERE chat_id = ?", (chat_id,)
+            ).fetchone()[0]
+
+        self._saves += 1
+        if self.ttl is not None and self._saves % self._PURGE_EVERY == 0:
+            self.purge_expired()
+        return version
+
+    def delete(self, chat_id: str) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM chat_threads WHERE chat_id = ?", (chat_id,))
+
+    def purge_expired(self) -> int:
+        """
+        Delete threads idle for longer than the time-to-live.
+
+        Returns:
+            int: Number of deleted threads
+        """
+        if self.ttl is None:
+            return 0
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM chat_threads WHERE updated_at < ?", (self._cutoff(),)
+            )
+        if cursor.rowcount:
+            logging.debug(f"Purged {cursor.rowcount} expired chat threads")
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the connections of every thread that used the store."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logging.warning(f"Could not close chat thread store connection: {str(e)}")
+        self._local = threading.local()
+
+
+def create_thread_store() -> ThreadStore:
+    """
+    Create the thread store selected by the THREAD_STORE setting.
+
+    Returns:
+        ThreadStore: The configured store
+    """
+    backend = get_thread_store_backend()
+    ttl = get_thread_ttl()
+    if backend == "sqlite":
+        path = get_thread_store_path()
+        logging.info(f"Using SQLite chat thread store at {path}")
+        return SQLiteThreadStore(path, ttl=ttl)
+    if backend != "memory":
+        logging.warning(f"Unknown THREAD_STORE '{backend}', using the in-memory store")
+    return MemoryThreadStore(max_threads=max(10000, get_max_resident_threads()), ttl=ttl)
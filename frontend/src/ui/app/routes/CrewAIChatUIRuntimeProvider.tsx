@@ -35,6 +35,47 @@ async function fetchCrews() {
   }
 }
 
+type ChatStreamEvent =
+  | { type: "token"; content: string }
+  | { type: "phase_start"; phase: string; tool?: string }
+  | { type: "phase_end"; phase: string; status: string; duration_ms: number; tool?: string }
+  | { type: "phase_error"; phase: string }
+  | { type: "fallback"; reason: string }
+  | { type: "done"; status: string; content: string }
+  | { type: "error"; status: string; content: string };
+
+async function* readChatStream(response: Response): AsyncGenerator<ChatStreamEvent> {
+  if (!response.body) {
+    throw new Error("Streaming is not supported by this browser");
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Server-Sent Events are separated by a blank line
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const data = frame
+        .split("\n")
+        .filter((line) => line.startsWith("data:"))
+        .map((line) => line.slice(5).trimStart())
+        .join("\n");
+      if (data) {
+        yield JSON.parse(data) as ChatStreamEvent;
+      }
+      boundary = buffer.indexOf("\n\n");
+    }
+  }
+}
+
 const convertMessage = (message: ThreadMessageLike) => {
   const textContent = message.content[0] as TextContentPart;
   if (!textContent || textContent.type !== "text") {
@@ -54,6 +95,7 @@ export function CrewAIChatUIRuntimeProvider({
   children: ReactNode;
 }>) {
   const [isRunning, setIsRunning] = useState(false);
+  const [streamingContent, setStreamingContent] = useState<string | null>(null);
   const currentChatId = useChatStore((state) => state.currentChatId);
   const currentCrewId = useChatStore((state) => state.currentCrewId);
   const messages = useChatStore((state) => 
@@ -86,7 +128,7 @@ export function CrewAIChatUIRuntimeProvider({
     setIsRunning(true);
     
     try {
-      const response = await fetch("/api/chat", {
+      const response = await fetch("/api/chat/stream", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -102,27 +144,43 @@ export function CrewAIChatUIRuntimeProvider({
         throw new Error(`API request failed with status ${response.status}`);
       }
 
-      const data = await response.json();
-      
-      if (data.status === "success" && data.content) {
-        addMessage(currentChatId, {
-          role: 'assistant',
-          content: data.content,
-          timestamp: Date.now(),
-        });
-      } else {
-        throw new Error(data.message || "Unknown error occurred");
+      let partial = "";
+      for await (const event of readChatStream(response)) {
+        if (event.type === "token") {
+          partial += event.content;
+          setStreamingContent(partial);
+        } else if (event.type === "phase_start" && event.phase === "tool_call") {
+          // The final answer is generated after the crew run; drop the preamble
+          partial = "";
+          setStreamingContent("");
+        } else if (event.type === "done" || event.type === "error") {
+          if (event.status === "success" && event.content) {
+            addMessage(currentChatId, {
+              role: 'assistant',
+              content: event.content,
+              timestamp: Date.now(),
+            });
+          } else {
+            throw new Error(event.content || "Unknown error occurred");
+          }
+          break;
+        }
       }
     } catch (error) {
       console.error("Error in chat:", error);
     } finally {
+      setStreamingContent(null);
       setIsRunning(false);
     }
   };
 
+  const displayedMessages = streamingContent
+    ? [...messages, { role: 'assistant' as const, content: streamingContent }]
+    : messages;
+
   const runtime = useExternalStoreRuntime({
     isRunning,
-    messages: messages.map(msg => ({
+    messages: displayedMessages.map(msg => ({
       role: msg.role,
       content: [{ type: "text" as const, text: msg.content }],
     })),
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a BoundedExecutor cannot accept more work."""
+
+
+class BoundedExecutor:
+    """A thread pool that rejects work instead of queueing it without limit.
+
+    At most ``max_workers`` callables run at once and at most ``max_queue``
+    more wait for a free worker. Anything beyond that raises
+    ``QueueFullError`` immediately so the caller can shed load.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, thread_name_prefix: str = "worker"):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Number of worker threads
+            max_queue: Number of submissions allowed to wait for a worker
+            thread_name_prefix: Prefix for worker thread names
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._count_lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of submissions that are running or waiting for a worker."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Number of submissions waiting for a worker."""
+        return max(0, self._in_flight - self.max_workers)
+
+    def _release(self, _future: Future) -> None:
+        with self._count_lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Submit a callable to the pool.
+
+        Args:
+            fn: The callable to run
+            *args: Positional arguments for ``fn``
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            Future: Future for the callable's result
+
+        Raises:
+            QueueFullError: If the pool and its queue are both full
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(
+                f"All {self.max_workers} workers are busy and {self.max_queue} requests are queued"
+            )
+        with self._count_lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(
+        self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any
+    ) -> Any:
+        """
+        Run a callable on the pool without blocking the event loop.
+
+        A callable that has not started when the timeout expires is cancelled.
+        One that is already running cannot be interrupted; it finishes in the
+        background and keeps its worker until then.
+
+        Args:
+            fn: The callable to run
+            *args: Positional arguments for ``fn``
+            timeout: Seconds to wait for the result, or None to wait forever
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            Any: The callable's return value
+
+        Raises:
+            QueueFullError: If the pool and its queue are both full
+            asyncio.TimeoutError: If the result is not ready within ``timeout``
+        """
+        future = self.submit(fn, *args, **kwargs)
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -4,7 +4,12 @@ Environment and configuration utilities for the Agent Eat Chatbot.
 import os
 import logging
 from pathlib import Path
-from dotenv import load_dotenv
+
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    # Only needed to read .env files; the getters below read os.environ either way
+    load_dotenv = None
 
 # Load environment variables from .env file
 def load_env(env_file=None):
@@ -14,6 +19,9 @@ def load_env(env_file=None):
     Args:
         env_file: Optional path to a specific .env file
     """
+    if load_dotenv is None:
+        print("Warning: python-dotenv is not installed. Using default environment variables.")
+        return
     if env_file and os.path.exists(env_file):
         load_dotenv(env_file)
     else:
@@ -101,4 +109,541 @@ def get_log_level():
         int: Logging level
     """
     level = os.getenv("LOG_LEVEL", "INFO").upper()
-    return getattr(logging, level, logging.INFO) 
\ No newline at end of file
+    return getattr(logging, level, logging.INFO) 
+
+# Get chat worker pool size
+def get_chat_workers():
+    """
+    Returns the number of worker threads that process chat turns.
+    
+    Returns:
+        int: Maximum number of chat turns processed concurrently
+    """
+    return max(1, int(os.getenv("CHAT_WORKERS", "8")))
+
+# Get chat queue limit
+def get_chat_queue_limit():
+    """
+    Returns how many chat turns may wait for a free worker before new
+    requests are rejected.
+    
+    Returns:
+        int: Maximum number of queued chat turns
+    """
+    return max(0, int(os.getenv("CHAT_QUEUE_LIMIT", "32")))
+
+# Get chat request timeout
+def get_chat_timeout():
+    """
+    Returns the per-request timeout for chat turns, in seconds.
+    
+    Returns:
+        float: Timeout in seconds
+    """
+    return float(os.getenv("CHAT_TIMEOUT_SECONDS", "120"))
+
+# Get LLM provider
+def get_llm_provider():
+    """
+    Returns which LLM backs the chat handler and the crew's agents: "openai"
+    for the configured models, or "fake" for the scripted offline stand-in.
+    
+    Returns:
+        str: LLM provider name
+    """
+    return os.getenv("LLM_PROVIDER", "openai").lower()
+
+# Get fake LLM latency
+def get_fake_llm_latency():
+    """
+    Returns how long the fake LLM waits before answering, in seconds.
+    
+    Returns:
+        float: Time to first token in seconds
+    """
+    return max(0.0, float(os.getenv("FAKE_LLM_LATENCY_SECONDS", "0.2")))
+
+# Get fake LLM token rate
+def get_fake_llm_tokens_per_second():
+    """
+    Returns how fast the fake LLM produces output (0 answers instantly after
+    the latency).
+    
+    Returns:
+        float: Output tokens per second
+    """
+    return max(0.0, float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "50")))
+
+# Get fake LLM tool call cadence
+def get_fake_llm_tool_call_every():
+    """
+    Returns on which user turns the fake LLM calls the crew tool: every Nth
+    one, or never when 0.
+    
+    Returns:
+        int: Tool call cadence
+    """
+    return max(0, int(os.getenv("FAKE_LLM_TOOL_CALL_EVERY", "0")))
+
+# Get fake LLM script
+def get_fake_llm_script():
+    """
+    Returns the path of a JSON list of responses for the fake LLM, or None
+    to use its built-in responses.
+    
+    Returns:
+        Optional[str]: Script path or None
+    """
+    return os.getenv("FAKE_LLM_SCRIPT") or None
+
+# Get token streaming flag
+def is_token_streaming_enabled():
+    """
+    Returns whether chat LLM calls should stream tokens to clients.
+    
+    Returns:
+        bool: True if token streaming is enabled, False otherwise
+    """
+    return os.getenv("CHAT_STREAM_TOKENS", "true").lower() in ["true", "1", "yes"]
+
+# Get path to the local cache directory
+def get_cache_dir():
+    """
+    Returns the directory for locally cached artifacts.
+    
+    Returns:
+        Path: Path to the cache directory
+    """
+    cache_dir = os.getenv("CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+    return get_data_path() / "cache"
+
+# Get crew analysis cache flag
+def is_crew_cache_enabled():
+    """
+    Returns whether the crew analysis run at startup may be cached on disk.
+    
+    Returns:
+        bool: True if the crew analysis cache is enabled, False otherwise
+    """
+    return os.getenv("CREW_CACHE_ENABLED", "true").lower() in ["true", "1", "yes"]
+
+# Get LLM response cache flag
+def is_llm_cache_enabled():
+    """
+    Returns whether chat LLM responses may be reused for identical prompts.
+    
+    Returns:
+        bool: True if the LLM response cache is enabled, False otherwise
+    """
+    return os.getenv("LLM_CACHE_ENABLED", "false").lower() in ["true", "1", "yes"]
+
+# Get LLM response cache lifetime
+def get_llm_cache_ttl():
+    """
+    Returns how long a cached LLM response is reused, in seconds.
+    
+    Returns:
+        float: Response cache time-to-live in seconds
+    """
+    return float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+
+# Get LLM response cache size
+def get_llm_cache_max_entries():
+    """
+    Returns how many LLM responses are cached before the least recently used
+    are evicted.
+    
+    Returns:
+        int: Maximum cached responses
+    """
+    return max(1, int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")))
+
+# Get chat context token budget
+def get_context_max_tokens():
+    """
+    Returns the approximate token budget for the history sent to the chat LLM.
+    
+    Returns:
+        int: Maximum number of (estimated) tokens per LLM call
+    """
+    return max(256, int(os.getenv("CHAT_CONTEXT_MAX_TOKENS", "6000")))
+
+# Get number of recent messages always kept verbatim
+def get_context_keep_last():
+    """
+    Returns how many of the most recent messages are kept verbatim before
+    older ones are folded into a summary.
+    
+    Returns:
+        int: Number of recent messages to keep
+    """
+    return max(1, int(os.getenv("CHAT_CONTEXT_KEEP_LAST", "20")))
+
+# Get maximum tool output size kept in the history
+def get_tool_output_max_chars():
+    """
+    Returns the maximum number of characters of a tool result kept in the
+    chat history.
+    
+    Returns:
+        int: Maximum tool output length in characters
+    """
+    return max(200, int(os.getenv("CHAT_TOOL_OUTPUT_MAX_CHARS", "4000")))
+
+# Get maximum size of the rolling summary
+def get_context_summary_max_chars():
+    """
+    Returns the maximum length of the rolling summary of older turns.
+    
+    Returns:
+        int: Maximum summary length in characters
+    """
+    return max(200, int(os.getenv("CHAT_CONTEXT_SUMMARY_MAX_CHARS", "2000")))
+
+# Get chat thread store backend
+def get_thread_store_backend():
+    """
+    Returns the backend used to persist chat threads ("memory" or "sqlite").
+    
+    Returns:
+        str: Thread store backend name
+    """
+    return os.getenv("THREAD_STORE", "memory").lower()
+
+# Get path to the SQLite chat thread store
+def get_thread_store_path():
+    """
+    Returns the path of the SQLite database used by the "sqlite" thread store.
+    
+    Returns:
+        str: Path to the thread database
+    """
+    return os.getenv("THREAD_STORE_PATH", str(get_data_path() / "threads.sqlite3"))
+
+# Get chat thread time-to-live
+def get_thread_ttl():
+    """
+    Returns how long an idle chat thread is kept, in seconds.
+    
+    Returns:
+        float: Thread time-to-live in seconds
+    """
+    return float(os.getenv("THREAD_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Get number of chat sessions kept in memory
+def get_max_resident_threads():
+    """
+    Returns how many chat sessions are kept in memory before the least
+    recently used ones are evicted.
+    
+    Returns:
+        int: Maximum number of resident chat sessions
+    """
+    return max(1, int(os.getenv("THREAD_MAX_RESIDENT", "1000")))
+
+# Get number of web server worker processes
+def get_web_workers():
+    """
+    Returns how many uvicorn worker processes serve the web UI and API.
+    
+    Returns:
+        int: Number of worker processes
+    """
+    return max(1, int(os.getenv("WEB_WORKERS", "1")))
+
+# Get path to the restaurant catalog
+def get_catalog_path():
+    """
+    Returns the path of the JSON restaurant and menu catalog used by the search tools.
+    
+    Returns:
+        str: Path to the catalog file
+    """
+    return os.getenv("CATALOG_PATH", str(get_root_dir() / "backend" / "src" / "data" / "catalog.json"))
+
+# Get number of pooled scraper browsers
+def get_browser_pool_size():
+    """
+    Returns how many headless browsers the scraper keeps warm, which also
+    caps the number of concurrent scraper searches.
+    
+    Returns:
+        int: Browser pool size
+    """
+    return max(1, int(os.getenv("BROWSER_POOL_SIZE", "2")))
+
+# Get maximum age of a pooled browser
+def get_browser_max_age():
+    """
+    Returns how long a pooled browser is reused before it is replaced, in seconds.
+    
+    Returns:
+        float: Maximum browser age in seconds
+    """
+    return float(os.getenv("BROWSER_MAX_AGE_SECONDS", "1800"))
+
+# Get maximum number of searches per pooled browser
+def get_browser_max_uses():
+    """
+    Returns how many searches a pooled browser serves before it is replaced.
+    
+    Returns:
+        int: Maximum searches per browser
+    """
+    return max(1, int(os.getenv("BROWSER_MAX_USES", "50")))
+
+# Get scrape cache freshness
+def get_scrape_cache_ttl():
+    """
+    Returns how long a scraped search result is served as fresh, in seconds.
+    
+    Returns:
+        float: Fresh time-to-live in seconds
+    """
+    return float(os.getenv("SCRAPE_CACHE_TTL_SECONDS", "600"))
+
+# Get scrape cache stale window
+def get_scrape_cache_stale_ttl():
+    """
+    Returns how long, after it stops being fresh, a scraped result is still
+    served while it is refreshed in the background, in seconds.
+    
+    Returns:
+        float: Stale-while-revalidate window in seconds
+    """
+    return float(os.getenv("SCRAPE_CACHE_STALE_SECONDS", "1800"))
+
+# Get number of scrape results kept in memory
+def get_scrape_cache_max_entries():
+    """
+    Returns how many scraped search results are kept in memory.
+    
+    Returns:
+        int: Maximum in-memory scrape cache entries
+    """
+    return max(1, int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "1024")))
+
+# Get scrape cache disk tier flag
+def is_scrape_cache_disk_enabled():
+    """
+    Returns whether scraped search results are also cached on disk.
+    
+    Returns:
+        bool: True if the on-disk scrape cache is enabled, False otherwise
+    """
+    return os.getenv("SCRAPE_CACHE_DISK", "true").lower() in ["true", "1", "yes"]
+
+# Get deadline for multi-platform searches
+def get_platform_search_deadline():
+    """
+    Returns how long a multi-platform search waits for platforms to respond
+    before returning the results it has, in seconds.
+    
+    Returns:
+        float: Search deadline in seconds
+    """
+    return float(os.getenv("PLATFORM_SEARCH_DEADLINE_SECONDS", "20"))
+
+# Get live scraping flag
+def is_live_scraping_enabled():
+    """
+    Returns whether platform searches drive a real browser against the
+    delivery sites instead of reading the local catalog.
+    
+    Returns:
+        bool: True if live scraping is enabled, False otherwise
+    """
+    return os.getenv("LIVE_SCRAPING", "false").lower() in ["true", "1", "yes"]
+
+# Get scraper mode
+def get_scraper_mode():
+    """
+    Returns how the scraper reads search results: "extract" parses the
+    results page directly and only falls back to the browser agent when that
+    fails, "agent" always uses the browser agent.
+    
+    Returns:
+        str: Scraper mode
+    """
+    return os.getenv("SCRAPER_MODE", "extract").lower()
+
+# Get Deliveroo base URL
+def get_deliveroo_base_url():
+    """
+    Returns the base URL of the Deliveroo site the scraper visits (point it
+    at a replay server to scrape recorded pages).
+    
+    Returns:
+        str: Base URL without a trailing slash
+    """
+    return os.getenv("DELIVEROO_BASE_URL", "https://deliveroo.co.uk").rstrip("/")
+
+# Get Deliveroo search URL template
+def get_deliveroo_search_url():
+    """
+    Returns the URL template of the Deliveroo search results page, with
+    {postcode} and {keywords} placeholders. The default lists London
+    restaurants; see DELIVEROO_SEARCH_AREAS.
+    
+    Returns:
+        str: Search URL template
+    """
+    return os.getenv(
+        "DELIVEROO_SEARCH_URL",
+        get_deliveroo_base_url() + "/restaurants/london?postcode={postcode}&q={keywords}",
+    )
+
+# Get postcode areas covered by the Deliveroo search URL
+def get_deliveroo_search_areas():
+    """
+    Returns the UK postcode areas (e.g. "SW", "EC") whose listings the search
+    URL shows; other postcodes skip the search page and use the browser
+    agent. The default matches the default URL's London listings; set it to
+    "*" for a URL that serves any postcode.
+    
+    Returns:
+        Optional[frozenset]: Covered postcode areas, or None if every area is covered
+    """
+    value = os.getenv("DELIVEROO_SEARCH_AREAS", "E,EC,N,NW,SE,SW,W,WC").strip()
+    if value == "*":
+        return None
+    return frozenset(area.strip().upper() for area in value.split(",") if area.strip())
+
+# Get scraper recording directory
+def get_scraper_record_dir():
+    """
+    Returns the directory where the scraper records the pages it loads as
+    replay fixtures, or None when recording is off.
+    
+    Returns:
+        Optional[str]: Fixture directory or None
+    """
+    return os.getenv("SCRAPER_RECORD_DIR") or None
+
+# Get memory write batch size
+def get_memory_write_batch_size():
+    """
+    Returns how many queued memory messages are written in one batch.
+    
+    Returns:
+        int: Memory write batch size
+    """
+    return max(1, int(os.getenv("MEMORY_WRITE_BATCH_SIZE", "16")))
+
+# Get memory write backlog limit
+def get_memory_write_queue_limit():
+    """
+    Returns how many memory messages may wait to be written before new ones
+    are dropped.
+    
+    Returns:
+        int: Maximum pending memory writes
+    """
+    return max(1, int(os.getenv("MEMORY_WRITE_QUEUE_LIMIT", "256")))
+
+# Get memory backend
+def get_memory_backend():
+    """
+    Returns the long-term memory backend ("mem0", or "none" to run without memory).
+    
+    Returns:
+        str: Memory backend name
+    """
+    return os.getenv("MEMORY_BACKEND", "mem0").lower()
+
+# Get memory cache flag
+def is_memory_cache_enabled():
+    """
+    Returns whether memory embeddings and search results may be cached.
+    
+    Returns:
+        bool: True if the memory caches are enabled, False otherwise
+    """
+    return os.getenv("MEMORY_CACHE_ENABLED", "true").lower() in ["true", "1", "yes"]
+
+# Get memory search cache lifetime
+def get_memory_search_cache_ttl():
+    """
+    Returns how long a memory search result is reused for the same query, in seconds.
+    
+    Returns:
+        float: Search cache time-to-live in seconds
+    """
+    return float(os.getenv("MEMORY_SEARCH_CACHE_TTL_SECONDS", "60"))
+
+# Get memory embedding cache size
+def get_memory_embedding_cache_size():
+    """
+    Returns how many text embeddings are cached (0 disables the cache).
+    
+    Returns:
+        int: Maximum cached embeddings
+    """
+    return max(0, int(os.getenv("MEMORY_EMBEDDING_CACHE_SIZE", "2048")))
+
+# Get memory partitioning
+def get_memory_partition():
+    """
+    Returns how memories are partitioned per user: "collection" for a Chroma
+    collection per user, or "metadata" for one collection filtered by user id.
+    
+    Returns:
+        str: Memory partition mode
+    """
+    return os.getenv("MEMORY_PARTITION", "collection").lower()
+
+# Get number of open per-user memories
+def get_memory_max_open_users():
+    """
+    Returns how many per-user memory collections are kept open at once.
+    
+    Returns:
+        int: Maximum open per-user memories
+    """
+    return max(1, int(os.getenv("MEMORY_MAX_OPEN_USERS", "32")))
+
+# Get memory lifetime
+def get_memory_ttl_days():
+    """
+    Returns how many days a memory is kept before compaction deletes it
+    (0 keeps memories forever).
+    
+    Returns:
+        float: Memory time-to-live in days
+    """
+    return max(0.0, float(os.getenv("MEMORY_TTL_DAYS", "0")))
+
+# Get per-user memory limit
+def get_memory_max_per_user():
+    """
+    Returns how many memories are kept per user; older ones are deleted on
+    compaction (0 means no limit).
+    
+    Returns:
+        int: Maximum memories per user
+    """
+    return max(0, int(os.getenv("MEMORY_MAX_PER_USER", "0")))
+
+# Get legacy memory collection
+def get_memory_legacy_collection():
+    """
+    Returns the shared collection memories were stored in before per-user
+    collections; with MEMORY_PARTITION=collection it is still searched for
+    users who have memories there (empty to stop reading it).
+    
+    Returns:
+        str: Legacy collection name, or "" if disabled
+    """
+    return os.getenv("MEMORY_LEGACY_COLLECTION", "chatbot_memory").strip()
+
+# Get CLI memory user id
+def get_memory_user_id():
+    """
+    Returns the user id the CLI chatbot stores and retrieves memories under.
+    
+    Returns:
+        str: Memory user id
+    """
+    return os.getenv("MEMORY_USER_ID", "user")
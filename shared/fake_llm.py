@@ -0,0 +1,204 @@
+"""
+Deterministic stand-in for the OpenAI-backed LLMs, for offline runs and benchmarks.
+
+Setting LLM_PROVIDER=fake makes the chat handler and the crew's agents use
+``FakeLLM`` instead of a real model, so the server, the CLI and the load test
+run without an API key. Responses are scripted and chosen from a hash of the
+prompt, so the same conversation always gets the same answers however many
+run concurrently; latency and token rate are configurable so benchmarks see
+realistic timings.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+from shared.config import (
+    get_fake_llm_latency,
+    get_fake_llm_script,
+    get_fake_llm_tokens_per_second,
+    get_fake_llm_tool_call_every,
+    get_llm_provider,
+)
+
+DEFAULT_RESPONSES = [
+    "I can help you find food nearby. What would you like to eat, and what is your postcode?",
+    "Here are a few options that match what you asked for. Would you like to see a menu?",
+    "I've added that to your cart. Would you like anything else or shall I calculate the total?",
+    "Your order total has been calculated. Shall I place the order?",
+]
+
+# Agents parse their output in this format; chat calls get plain text
+_REACT_MARKER = "Final Answer:"
+
+
+def _last_user_message(messages: Union[str, List[Dict[str, Any]]]) -> str:
+    if isinstance(messages, str):
+        return messages
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return str(message.get("content") or "")
+    return ""
+
+
+def _wants_react_answer(messages: Union[str, List[Dict[str, Any]]]) -> bool:
+    if isinstance(messages, str):
+        return _REACT_MARKER in messages
+    return any(_REACT_MARKER in str(message.get("content") or "") for message in messages)
+
+
+class FakeLLM(BaseLLM):
+    """An LLM that answers from a script with simulated latency and streaming.
+
+    ``call`` waits ``latency`` seconds, then produces the response one word
+    ("token") at a time at ``tokens_per_second``, emitting stream chunk events
+    when ``stream`` is set. When tools are offered and the conversation ends
+    with a user message, every ``tool_call_every``-th such call requests the
+    first tool instead. As with ``crewai.LLM``, the requested function is
+    then run from ``available_functions`` and its output is returned; without
+    ``available_functions`` the tool call is dropped and the text returned.
+    """
+
+    def __init__(
+        self,
+        model: str = "fake",
+        responses: Optional[List[str]] = None,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        tool_call_every: int = 0,
+    ):
+        """
+        Initialize the fake LLM.
+
+        Args:
+            model: Model name reported to callers
+            responses: Scripted responses; defaults to ``DEFAULT_RESPONSES``
+            latency: Seconds before the first token
+            tokens_per_second: Output rate, or 0 to return the whole response at once
+            tool_call_every: Call a tool on every Nth tool-enabled user turn (0 never)
+        """
+        super().__init__(model=model)
+        self.responses = list(responses or DEFAULT_RESPONSES)
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.tool_call_every = tool_call_every
+        self.stream = False
+        self.calls = 0
+        self._tool_turns = 0
+        self._lock = threading.Lock()
+
+    def _pick_response(self, messages: Union[str, List[Dict[str, Any]]]) -> str:
+        """Choose a scripted response from a hash of the last user message."""
+        digest = hashlib.sha1(_last_user_message(messages).encode("utf-8")).digest()
+        return self.responses[int.from_bytes(digest[:4], "big") % len(self.responses)]
+
+    def _call_tool(
+        self, tools: List[Dict[str, Any]], messages: List[Dict[str, Any]], available_functions: Dict[str, Any]
+    ) -> Optional[Any]:
+        """Run the first tool with every parameter set to the user's message, as CrewAI would."""
+        function = tools[0].get("function", {})
+        function_to_call = available_functions.get(function.get("name", ""))
+        if function_to_call is None:
+            return None
+        properties = function.get("parameters", {}).get("properties", {})
+        arguments = {name: _last_user_message(messages) for name in properties}
+        try:
+            return function_to_call(**arguments)
+        except Exception as e:
+            # CrewAI logs failed tool calls and falls back to the text response
+            logging.error(f"Fake LLM tool call to {function.get('name')} failed: {str(e)}")
+            return None
+
+    def _emit_chunk(self, chunk: str) -> None:
+        try:
+            from crewai.utilities.events import crewai_event_bus
+            from crewai.utilities.events.llm_events import LLMStreamChunkEvent
+        except ImportError:
+            return
+        crewai_event_bus.emit(self, event=LLMStreamChunkEvent(chunk=chunk))
+
+    def _produce(self, text: str) -> str:
+        """Simulate generation time and stream the text out word by word."""
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if self.tokens_per_second <= 0 and not self.stream:
+            return text
+        words = text.split(" ")
+        for index, word in enumerate(words):
+            if self.tokens_per_second > 0:
+                time.sleep(1.0 / self.tokens_per_second)
+            if self.stream:
+                self._emit_chunk(word if index == 0 else " " + word)
+        return text
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, Any]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+    ) -> Union[str, Any]:
+        with self._lock:
+            self.calls += 1
+
+        ends_with_user = not isinstance(messages, str) and bool(messages) and messages[-1].get("role") == "user"
+        if tools and ends_with_user and self.tool_call_every > 0:
+            with self._lock:
+                self._tool_turns += 1
+                turn = self._tool_turns
+            if turn % self.tool_call_every == 0:
+                content = self._produce("Let me look that up.")
+                result = self._call_tool(tools, messages, available_functions or {})
+                return result if result is not None else content
+
+        text = self._pick_response(messages)
+        if _wants_react_answer(messages):
+            text = f"Thought: I now know the final answer\n{_REACT_MARKER} {text}"
+        return self._produce(text)
+
+    def supports_function_calling(self) -> bool:
+        return True
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128000
+
+
+def _load_script(path: Optional[str]) -> Optional[List[str]]:
+    if not path:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            script = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Could not read fake LLM script {path}: {str(e)}")
+        return None
+    return [str(response) for response in script] or None
+
+
+def create_llm_override() -> Optional[FakeLLM]:
+    """
+    Create the LLM to use instead of the configured model, if any.
+
+    Each caller gets its own instance, as with real models, so settings such
+    as streaming on the chat LLM do not leak into the agents.
+
+    Returns:
+        Optional[FakeLLM]: A FakeLLM configured from FAKE_LLM_* settings when
+        LLM_PROVIDER is "fake", otherwise None
+    """
+    if get_llm_provider() != "fake":
+        return None
+    logging.info("Using the fake LLM; no model API calls will be made")
+    return FakeLLM(
+        responses=_load_script(get_fake_llm_script()),
+        latency=get_fake_llm_latency(),
+        tokens_per_second=get_fake_llm_tokens_per_second(),
+        tool_call_every=get_fake_llm_tool_call_every(),
+    )
@@ -1,12 +1,54 @@
 """
 Shared memory utilities for the Agent Eat Chatbot.
 """
-from mem0 import Memory
-from typing import List, Dict, Any, Optional
+import atexit
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Iterator, List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
-from shared.config import get_chroma_db_path
+from shared.config import (
+    get_chroma_db_path,
+    get_memory_backend,
+    get_memory_embedding_cache_size,
+    get_memory_legacy_collection,
+    get_memory_max_open_users,
+    get_memory_max_per_user,
+    get_memory_partition,
+    get_memory_ttl_days,
+    get_memory_search_cache_ttl,
+    is_memory_cache_enabled,
+    get_memory_write_batch_size,
+    get_memory_write_queue_limit,
+)
 from shared.logger import logger
+from shared.metrics import registry
+
+if TYPE_CHECKING:
+    from mem0 import Memory
+
+MEMORY_CACHE_REQUESTS = registry.counter(
+    "agent_eat_memory_cache_requests_total",
+    "Memory embedding and search cache lookups by result.",
+    ["cache", "result"],
+)
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache keys: lowercase with collapsed whitespace.
+    
+    Args:
+        text: Text to normalize
+        
+    Returns:
+        str: Normalized text
+    """
+    return " ".join(str(text).lower().split())
 
 def get_memory_config(collection_name="chatbot_memory"):
     """
@@ -28,19 +70,26 @@ def get_memory_config(collection_name="chatbot_memory"):
         },
     }
 
-def create_memory(collection_name="chatbot_memory") -> Memory:
+def create_memory(collection_name="chatbot_memory", embedding_cache=None) -> "Memory":
     """
     Create a memory instance.
     
     Args:
         collection_name: Name of the collection in ChromaDB
+        embedding_cache: Optional EmbeddingCache put in front of the embedding model
         
     Returns:
         Memory: Memory instance
     """
+    # Imported here so importing this module does not load mem0 and its clients
+    from mem0 import Memory
+
     config = get_memory_config(collection_name)
     logger.debug(f"Creating memory with config: {config}")
-    return Memory.from_config(config)
+    memory = Memory.from_config(config)
+    if embedding_cache is not None and hasattr(memory, "embedding_model"):
+        memory.embedding_model = CachedEmbedder(memory.embedding_model, embedding_cache)
+    return memory
 
 def format_context(relevant_info) -> str:
     """
@@ -58,5 +107,577 @@ def format_context(relevant_info) -> str:
     # Handle the case where relevant_info items might be strings rather than dictionaries
     return "\n".join(message if isinstance(message, str) else str(message) for message in relevant_info)
 
-# Create a global memory instance for reuse
-memory = create_memory() 
\ No newline at end of file
+class MemoryWriteQueue:
+    """
+    Write-behind queue for memory additions.
+    
+    ``add`` returns immediately; a background thread batches pending messages
+    per user and writes each batch with a single ``memory.add`` call, keeping
+    embedding and fact-extraction round trips off the caller's critical path.
+    The backlog is bounded: when it is full, ``add`` waits briefly and then
+    drops the message rather than stalling the caller.
+    """
+    
+    # How long the writer waits for more messages to join a batch
+    BATCH_LINGER_SECONDS = 0.25
+    
+    def __init__(self, memory: "Memory", batch_size: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        Initialize the queue and start its writer thread.
+        
+        Args:
+            memory: Memory instance to write to
+            batch_size: Maximum messages written per batch
+            max_pending: Maximum messages waiting to be written
+        """
+        self.memory = memory
+        self.batch_size = batch_size if batch_size is not None else get_memory_write_batch_size()
+        max_pending = max_pending if max_pending is not None else get_memory_write_queue_limit()
+        self._queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def add(self, message: str, user_id: str, timeout: float = 1.0) -> bool:
+        """
+        Queue a message to be added to memory.
+        
+        Args:
+            message: Text to remember
+            user_id: Memory owner
+            timeout: Seconds to wait for room when the backlog is full
+            
+        Returns:
+            bool: True if queued, False if dropped
+        """
+        if self._closed:
+            logger.warning("Memory write queue is closed; dropping message")
+            return False
+        try:
+            self._queue.put((user_id, message), timeout=timeout)
+            return True
+        except queue.Full:
+            logger.warning(f"Memory write backlog is full; dropping message for {user_id}")
+            return False
+    
+    def _next_batch(self) -> Tuple[List[Tuple[str, str]], bool]:
+        """Block for one message, then gather more for a short while."""
+        batch = []
+        item = self._queue.get()
+        if item is None:
+            return batch, True
+        batch.append(item)
+        deadline = time.monotonic() + self.BATCH_LINGER_SECONDS
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+    
+    def _write(self, batch: List[Tuple[str, str]]) -> None:
+        by_user: Dict[str, List[Dict[str, str]]] = {}
+        for user_id, message in batch:
+            by_user.setdefault(user_id, []).append({"role": "user", "content": message})
+        for user_id, messages in by_user.items():
+            try:
+                self.memory.add(messages, user_id=user_id)
+                logger.debug(f"Wrote {len(messages)} memory messages for {user_id}")
+            except Exception as e:
+                logger.error(f"Failed to write {len(messages)} memory messages for {user_id}: {str(e)}")
+    
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+    
+    def flush(self) -> None:
+        """Block until every queued message has been written."""
+        self._queue.join()
+    
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """
+        Write pending messages and stop the writer thread.
+        
+        Args:
+            timeout: Seconds to wait for pending writes
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Memory writer did not finish before shutdown; some messages were not saved")
+
+class NullMemory:
+    """
+    Memory backend that stores nothing, used when MEMORY_BACKEND is "none".
+    """
+    
+    def add(self, messages, user_id=None, **kwargs) -> Dict[str, Any]:
+        return {"results": []}
+    
+    def search(self, query, user_id=None, limit=100, **kwargs) -> List[Any]:
+        return []
+
+class EmbeddingCache:
+    """
+    LRU cache of text embeddings keyed by normalized text, shared by every
+    embedding model that wraps it.
+    """
+    
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple[str, Optional[str]]) -> Any:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+    
+    def put(self, key: Tuple[str, Optional[str]], vector: Any) -> None:
+        with self._lock:
+            self._entries[key] = vector
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+class CachedEmbedder:
+    """
+    Wraps a mem0 embedding model so repeated texts skip the embedding call.
+    
+    Short conversational inputs ("yes", "ok", a postcode) repeat constantly,
+    so most of their embeddings are served without an API call.
+    """
+    
+    def __init__(self, embedder, cache: EmbeddingCache):
+        self._embedder = embedder
+        self._cache = cache
+    
+    def embed(self, text, memory_action=None):
+        key = (normalize_text(text), memory_action)
+        vector = self._cache.get(key)
+        if vector is not None:
+            MEMORY_CACHE_REQUESTS.inc(cache="embedding", result="hit")
+            return vector
+        MEMORY_CACHE_REQUESTS.inc(cache="embedding", result="miss")
+        
+        if memory_action is None:
+            vector = self._embedder.embed(text)
+        else:
+            vector = self._embedder.embed(text, memory_action)
+        self._cache.put(key, vector)
+        return vector
+    
+    def __getattr__(self, name):
+        return getattr(self._embedder, name)
+
+class CachedMemory:
+    """
+    Wraps a mem0 Memory with a short-lived per-user search cache.
+    
+    ``search`` results are reused for identical (normalized) queries until
+    the TTL expires or the user's memories change through ``add``. Anything
+    else is passed through to the wrapped memory.
+    """
+    
+    def __init__(self, memory: "Memory", search_ttl: float):
+        """
+        Initialize the wrapper.
+        
+        Args:
+            memory: The memory to wrap
+            search_ttl: Seconds a search result is reused
+        """
+        self._memory = memory
+        self._search_ttl = search_ttl
+        self._searches: Dict[Optional[str], Dict[Any, Tuple[float, Any]]] = {}
+        # Bumped on every add so a search that raced with a write is not cached
+        self._generations: Dict[Optional[str], int] = {}
+        self._lock = threading.Lock()
+    
+    def search(self, query, user_id=None, limit=100, **kwargs):
+        key = (normalize_text(query), limit, repr(sorted(kwargs.items())))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._searches.get(user_id, {}).get(key)
+            generation = self._generations.get(user_id, 0)
+        if cached is not None and now - cached[0] <= self._search_ttl:
+            MEMORY_CACHE_REQUESTS.inc(cache="search", result="hit")
+            return cached[1]
+        MEMORY_CACHE_REQUESTS.inc(cache="search", result="miss")
+        
+        results = self._memory.search(query=query, user_id=user_id, limit=limit, **kwargs)
+        with self._lock:
+            if self._generations.get(user_id, 0) == generation:
+                entries = self._searches.setdefault(user_id, {})
+                # Drop expired entries so idle queries do not pile up
+                for stale_key in [k for k, (at, _) in entries.items() if now - at > self._search_ttl]:
+                    del entries[stale_key]
+                entries[key] = (now, results)
+        return results
+    
+    def add(self, messages, user_id=None, **kwargs):
+        try:
+            return self._memory.add(messages, user_id=user_id, **kwargs)
+        finally:
+            self.invalidate(user_id)
+    
+    def invalidate(self, user_id=None) -> None:
+        """
+        Forget cached searches for a user.
+        
+        Args:
+            user_id: Memory owner whose searches are dropped
+        """
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._searches.pop(user_id, None)
+    
+    def __getattr__(self, name):
+        return getattr(self._memory, name)
+
+def user_collection_name(user_id: str, prefix: str = "chatbot_memory") -> str:
+    """
+    Name of the Chroma collection holding one user's memories.
+    
+    User ids are hashed so any id yields a valid collection name.
+    
+    Args:
+        user_id: Memory owner
+        prefix: Collection name prefix
+        
+    Returns:
+        str: Collection name
+    """
+    digest = hashlib.sha1(str(user_id).encode("utf-8")).hexdigest()[:16]
+    return f"{prefix}_u_{digest}"
+
+def _memory_items(result) -> List[Dict[str, Any]]:
+    """Unwrap mem0's ``get_all`` result, which is a list or {"results": [...]} by version."""
+    if isinstance(result, dict):
+        result = result.get("results", [])
+    return [item for item in result or [] if isinstance(item, dict) and item.get("id")]
+
+def _result_items(result) -> List[Any]:
+    if isinstance(result, dict):
+        return list(result.get("results", []))
+    return list(result or [])
+
+def _merge_results(primary, fallback, limit: Optional[int] = None):
+    """Append ``fallback``'s memories to ``primary``'s, keeping mem0's result shape."""
+    items = _result_items(primary)
+    seen = {item.get("id") for item in items if isinstance(item, dict)}
+    items.extend(
+        item for item in _result_items(fallback)
+        if not (isinstance(item, dict) and item.get("id") in seen)
+    )
+    if limit is not None:
+        items = items[:limit]
+    if isinstance(primary, dict):
+        return {**primary, "results": items}
+    return items
+
+def _all_memory_items(memory, user_id: str, page_size: int = 500) -> List[Dict[str, Any]]:
+    """Read every memory of a user; ``get_all`` only takes a limit, so it is raised until the result falls short."""
+    limit = page_size
+    while True:
+        result = memory.get_all(user_id=user_id, limit=limit)
+        if len(_result_items(result)) < limit:
+            return _memory_items(result)
+        limit *= 2
+
+def _memory_timestamp(item: Dict[str, Any]) -> float:
+    """When a memory was last written, as a Unix timestamp (0 if unknown)."""
+    value = item.get("updated_at") or item.get("created_at")
+    if not value:
+        return 0.0
+    try:
+        written = datetime.fromisoformat(str(value))
+    except ValueError:
+        return 0.0
+    if written.tzinfo is None:
+        written = written.replace(tzinfo=timezone.utc)
+    return written.timestamp()
+
+def _close_memory(memory) -> None:
+    """Release a memory's connections; memories without ``close`` are left to the garbage collector."""
+    close = getattr(memory, "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except Exception as e:
+        logger.warning(f"Failed to close memory: {str(e)}")
+
+class UserScopedMemory:
+    """
+    Partitions memory per user so retrieval only touches one user's history.
+    
+    In "collection" mode each user gets a Chroma collection of their own, so
+    a search scans that user's vectors rather than the whole deployment's;
+    the most recently used per-user memories are kept open, and the others
+    are closed once no call is using them. In "metadata"
+    mode all users share one collection and searches are filtered by user id.
+    
+    Memories written before per-user collections live in the shared legacy
+    collection; in "collection" mode it is still searched for users who have
+    any there, so upgrading loses nothing. When a TTL or per-user limit is
+    set, each user's memories are compacted every few writes: those older
+    than the TTL are deleted, then the oldest beyond the per-user limit.
+    """
+    
+    # Writes per user between compactions
+    COMPACT_EVERY = 20
+    
+    def __init__(
+        self,
+        factory: Callable[[str], "Memory"],
+        partition: str = "collection",
+        max_open: int = 32,
+        ttl: Optional[float] = None,
+        max_per_user: Optional[int] = None,
+        legacy_collection: Optional[str] = None,
+    ):
+        """
+        Initialize the partitioned memory.
+        
+        Args:
+            factory: Creates a memory for a collection name
+            partition: "collection" for a collection per user, "metadata" for one shared collection
+            max_open: Per-user memories kept open in "collection" mode
+            ttl: Seconds a memory is kept, or None to keep memories forever
+            max_per_user: Memories kept per user, or None for no limit
+            legacy_collection: Shared collection to keep reading in "collection" mode, or None
+        """
+        if partition not in ("collection", "metadata"):
+            logger.warning(f"Unknown MEMORY_PARTITION '{partition}', using a collection per user")
+            partition = "collection"
+        self._factory = factory
+        self.partition = partition
+        self._max_open = max(1, max_open)
+        self._ttl = ttl
+        self._max_per_user = max_per_user
+        self._legacy_collection = legacy_collection if partition == "collection" else None
+        self._legacy: Optional["Memory"] = None
+        # Whether each user seen so far has memories in the legacy collection
+        self._legacy_users: Dict[str, bool] = {}
+        self._memories: "OrderedDict[str, Memory]" = OrderedDict()
+        # Calls using each open memory (by id), and evicted memories closed when their last call ends
+        self._in_use: Dict[int, int] = {}
+        self._evicted: Dict[int, "Memory"] = {}
+        self._writes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def for_user(self, user_id: str) -> Iterator["Memory"]:
+        """
+        Use the memory holding a user's history, opening it if needed.
+        
+        The memory stays open until the block ends, even if it is evicted
+        meanwhile; an evicted memory is closed when its last user is done.
+        
+        Args:
+            user_id: Memory owner
+            
+        Yields:
+            Memory: The user's memory
+        """
+        name = user_collection_name(user_id) if self.partition == "collection" else "chatbot_memory"
+        to_close = []
+        with self._lock:
+            memory = self._memories.get(name)
+            if memory is None:
+                memory = self._factory(name)
+                self._memories[name] = memory
+                while len(self._memories) > self._max_open:
+                    _, evicted = self._memories.popitem(last=False)
+                    if self._in_use.get(id(evicted)):
+                        self._evicted[id(evicted)] = evicted
+                    else:
+                        to_close.append(evicted)
+            else:
+                self._memories.move_to_end(name)
+            self._in_use[id(memory)] = self._in_use.get(id(memory), 0) + 1
+        for evicted in to_close:
+            _close_memory(evicted)
+        try:
+            yield memory
+        finally:
+            with self._lock:
+                remaining = self._in_use[id(memory)] - 1
+                if remaining:
+                    self._in_use[id(memory)] = remaining
+                else:
+                    del self._in_use[id(memory)]
+                retired = self._evicted.pop(id(memory), None) if not remaining else None
+            if retired is not None:
+                _close_memory(retired)
+    
+    def legacy_for_user(self, user_id: str) -> Optional["Memory"]:
+        """
+        Get the legacy shared memory if it holds any of a user's memories.
+        
+        The check runs once per user; users without legacy memories never
+        touch the legacy collection again.
+        
+        Args:
+            user_id: Memory owner
+            
+        Returns:
+            Optional[Memory]: The legacy memory, or None
+        """
+        if not self._legacy_collection:
+            return None
+        with self._lock:
+            has_legacy = self._legacy_users.get(user_id)
+            if self._legacy is None:
+                self._legacy = self._factory(self._legacy_collection)
+            legacy = self._legacy
+        if has_legacy is None:
+            try:
+                has_legacy = bool(_memory_items(legacy.get_all(user_id=user_id, limit=1)))
+            except Exception as e:
+                logger.warning(f"Could not read legacy memories for {user_id}: {str(e)}")
+                return None
+            with self._lock:
+                self._legacy_users[user_id] = has_legacy
+        return legacy if has_legacy else None
+    
+    def add(self, messages, user_id=None, **kwargs):
+        with self.for_user(user_id) as memory:
+            result = memory.add(messages, user_id=user_id, **kwargs)
+        with self._lock:
+            writes = self._writes.get(user_id, 0) + 1
+            self._writes[user_id] = writes
+        if writes % self.COMPACT_EVERY == 0:
+            try:
+                self.compact(user_id)
+            except Exception as e:
+                logger.error(f"Failed to compact memories for {user_id}: {str(e)}")
+        return result
+    
+    def search(self, query, user_id=None, limit=100, **kwargs):
+        with self.for_user(user_id) as memory:
+            results = memory.search(query=query, user_id=user_id, limit=limit, **kwargs)
+        legacy = self.legacy_for_user(user_id)
+        if legacy is None:
+            return results
+        legacy_results = legacy.search(query=query, user_id=user_id, limit=limit, **kwargs)
+        return _merge_results(results, legacy_results, limit)
+    
+    def get_all(self, user_id=None, **kwargs):
+        with self.for_user(user_id) as memory:
+            results = memory.get_all(user_id=user_id, **kwargs)
+        legacy = self.legacy_for_user(user_id)
+        if legacy is None:
+            return results
+        return _merge_results(results, legacy.get_all(user_id=user_id, **kwargs), kwargs.get("limit"))
+    
+    def compact(self, user_id: str) -> int:
+        """
+        Delete a user's expired memories and the oldest beyond the per-user limit.
+        
+        Memories are ranked by when they were last written; those without a
+        timestamp count as the oldest.
+        
+        Args:
+            user_id: Memory owner
+            
+        Returns:
+            int: Number of memories deleted
+        """
+        if self._ttl is None and self._max_per_user is None:
+            return 0
+        with self.for_user(user_id) as memory:
+            # Newest first; get_all returns memories in no particular order
+            items = sorted(_all_memory_items(memory, user_id), key=_memory_timestamp, reverse=True)
+            expired = []
+            if self._ttl is not None:
+                cutoff = time.time() - self._ttl
+                expired = [item for item in items if 0 < _memory_timestamp(item) < cutoff]
+            if self._max_per_user is not None:
+                expired_ids = {item["id"] for item in expired}
+                kept = [item for item in items if item["id"] not in expired_ids]
+                expired.extend(kept[self._max_per_user:])
+            for item in expired:
+                memory.delete(item["id"])
+        deleted = len(expired)
+        if deleted:
+            logger.info(f"Compacted memory for {user_id}: deleted {deleted} old memories")
+        return deleted
+
+_memory = None
+_memory_lock = threading.Lock()
+
+def _create_shared_memory():
+    """Build the shared memory selected by MEMORY_BACKEND, wrappers included."""
+    backend = get_memory_backend()
+    if backend == "none":
+        logger.info("Memory backend disabled; conversations will not be remembered")
+        return NullMemory()
+    if backend != "mem0":
+        logger.warning(f"Unknown MEMORY_BACKEND '{backend}', using mem0")
+    cache_enabled = is_memory_cache_enabled()
+    embedding_cache_size = get_memory_embedding_cache_size()
+    # One embedding cache serves every user's memory
+    embedding_cache = (
+        EmbeddingCache(embedding_cache_size)
+        if cache_enabled and embedding_cache_size > 0 else None
+    )
+    ttl_days = get_memory_ttl_days()
+    max_per_user = get_memory_max_per_user()
+    memory = UserScopedMemory(
+        lambda name: create_memory(name, embedding_cache=embedding_cache),
+        partition=get_memory_partition(),
+        max_open=get_memory_max_open_users(),
+        ttl=ttl_days * 86400 if ttl_days > 0 else None,
+        max_per_user=max_per_user if max_per_user > 0 else None,
+        legacy_collection=get_memory_legacy_collection() or None,
+    )
+    if cache_enabled:
+        return CachedMemory(memory, search_ttl=get_memory_search_cache_ttl())
+    return memory
+
+def get_memory():
+    """
+    Get the shared memory instance, creating it on first use.
+    
+    The vector store and embedding clients are only opened when memory is
+    actually used, so code paths that never touch memory do not pay for them.
+    
+    Returns:
+        Memory: The mem0 memory partitioned per user (wrapped in a CachedMemory
+        unless MEMORY_CACHE_ENABLED is off), or a NullMemory when MEMORY_BACKEND is "none"
+    """
+    global _memory
+    if _memory is None:
+        with _memory_lock:
+            if _memory is None:
+                # Built in full before it is published, so the unlocked check above
+                # never hands out a half-configured instance
+                _memory = _create_shared_memory()
+    return _memory
+
+def warm_up_memory() -> None:
+    """
+    Create the shared memory instance ahead of its first use.
+    """
+    get_memory()
+
+def __getattr__(name):
+    # Keep ``from shared.memory import memory`` working, lazily
+    if name == "memory":
+        return get_memory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,186 @@
+"""
+Compact serialization of tool results before they reach the LLM.
+
+Tool results are fed back into every later call of a conversation, so their
+size is paid for again and again. ``compact_tool_result`` turns a result
+into compact JSON: human-readable fields that repeat the structured ones
+are dropped, records are projected onto the fields the model needs and
+empty values are removed. Only when the result is still over the size cap
+are long lists shortened, keeping as many leading items as fit; the text
+is then capped with a truncation marker.
+"""
+import ast
+import functools
+import json
+import re
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+from shared.config import get_tool_output_max_chars
+
+TRUNCATION_MARKER = "... [truncated {omitted} chars]"
+_TRUNCATED_RE = re.compile(r"\.\.\. \[truncated \d+ chars\]$")
+
+# Prose renderings of fields the result already carries
+REDUNDANT_FIELDS = frozenset({"message"})
+
+# Fields kept on each record (a dict inside a list) of a tool's result;
+# tools without an entry keep every field
+TOOL_PROJECTIONS: Dict[str, FrozenSet[str]] = {
+    "FoodSearch": frozenset({
+        "name", "price", "restaurant", "rating", "reviews", "specialty", "description", "platform", "error",
+    }),
+    "SearchRestaurants": frozenset({"name", "specialty", "description", "rating", "reviews", "platform", "error"}),
+    "SearchAllPlatforms": frozenset({
+        "name", "restaurant", "price", "rating", "reviews", "specialty", "description", "platform", "url",
+        "eta_min_minutes", "eta_max_minutes", "delivery_fee",
+    }),
+    "GetRestaurantMenu": frozenset({"name", "price", "description"}),
+    "CompareCartPrices": frozenset({
+        "restaurant", "platform", "items", "name", "price", "quantity",
+        "subtotal", "discount", "delivery_fee", "small_order_fee", "total", "promotion", "meets_minimum",
+    }),
+}
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """
+    Shorten text to at most ``max_chars`` plus a truncation marker.
+
+    Args:
+        text: The text to shorten
+        max_chars: Number of characters to keep
+
+    Returns:
+        str: The original text, or its head followed by a truncation marker
+    """
+    if len(text) <= max_chars:
+        return text
+    # Already truncated to this size on an earlier pass
+    marker = _TRUNCATED_RE.search(text)
+    if marker and marker.start() <= max_chars:
+        return text
+    return text[:max_chars] + TRUNCATION_MARKER.format(omitted=len(text) - max_chars)
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _compact_value(value: Any, projection: Optional[FrozenSet[str]], in_list: bool = False) -> Any:
+    if isinstance(value, dict):
+        compacted = {}
+        for key, item in value.items():
+            if key in REDUNDANT_FIELDS:
+                continue
+            # Projections describe records; mappings such as per-platform statuses keep their keys
+            if in_list and projection is not None and key not in projection:
+                continue
+            item = _compact_value(item, projection)
+            if not _is_empty(item):
+                compacted[key] = item
+        return compacted
+    if isinstance(value, (list, tuple)):
+        return [_compact_value(item, projection, in_list=True) for item in value]
+    if isinstance(value, float):
+        return round(value, 2)
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def _longest_list(value: Any) -> int:
+    if isinstance(value, dict):
+        return max((_longest_list(item) for item in value.values()), default=0)
+    if isinstance(value, list):
+        return max([len(value)] + [_longest_list(item) for item in value])
+    return 0
+
+
+def _cut_lists(value: Any, max_items: int) -> Any:
+    """Keep the first ``max_items`` of every list, counting the rest in a trailing marker."""
+    if isinstance(value, dict):
+        return {key: _cut_lists(item, max_items) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [_cut_lists(item, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            items.append(f"... {len(value) - max_items} more")
+        return items
+    return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _fit_lists(value: Any, text: str, max_chars: int) -> str:
+    """Shorten lists just enough for the serialized value to fit ``max_chars``, if that is possible."""
+    longest = _longest_list(value)
+    if len(text) <= max_chars or longest <= 1:
+        return text
+    # Binary search for the most items per list that still fit
+    best = _dumps(_cut_lists(value, 1))
+    low, high = 2, longest - 1
+    while low <= high:
+        middle = (low + high) // 2
+        candidate = _dumps(_cut_lists(value, middle))
+        if len(candidate) <= max_chars:
+            best, low = candidate, middle + 1
+        else:
+            high = middle - 1
+    return best
+
+
+def _parse(text: str) -> Any:
+    """Recover structured data from a JSON or Python-literal string, else return the text."""
+    stripped = text.strip()
+    if not stripped or stripped[0] not in "[{":
+        return text
+    try:
+        return json.loads(stripped)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(stripped)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return text
+
+
+def compact_tool_result(result: Any, tool_name: Optional[str] = None, max_chars: Optional[int] = None) -> str:
+    """
+    Serialize a tool result compactly for the LLM.
+
+    Args:
+        result: The value a tool returned (structured, or a string that may hold JSON)
+        tool_name: Name of the tool, selecting its field projection
+        max_chars: Size cap; defaults to CHAT_TOOL_OUTPUT_MAX_CHARS
+
+    Returns:
+        str: Compact JSON, or the plain text for unstructured results, within the cap
+    """
+    max_chars = max_chars if max_chars is not None else get_tool_output_max_chars()
+    if isinstance(result, str):
+        result = _parse(result)
+    if isinstance(result, str):
+        text = result.strip()
+    else:
+        compacted = _compact_value(result, TOOL_PROJECTIONS.get(tool_name or ""))
+        text = _fit_lists(compacted, _dumps(compacted), max_chars)
+    return truncate_text(text, max_chars)
+
+
+def compact_result(tool_name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator making a tool function return its result through ``compact_tool_result``.
+
+    Place it under ``@tool``; the wrapped function keeps its signature and
+    docstring, which the tool's schema is built from.
+
+    Args:
+        tool_name: Name of the tool, selecting its field projection
+    """
+    def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return compact_tool_result(function(*args, **kwargs), tool_name)
+        return wrapper
+    return decorator
@@ -0,0 +1,81 @@
+"""Catalog lookups behind the mock search tools."""
+from pathlib import Path
+
+import pytest
+
+from backend.src.catalog import ALTERNATIVE, FEATURED, Catalog, partial_matches
+
+CATALOG_PATH = Path(__file__).resolve().parent.parent / "backend" / "src" / "data" / "catalog.json"
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return Catalog.load(str(CATALOG_PATH))
+
+
+def _names(dishes):
+    return [dish["name"] for dish in dishes]
+
+
+@pytest.mark.parametrize("keywords, expected", [
+    ("pizza", ["Margherita Pizza"]),
+    ("pepperoni pizza", ["Margherita Pizza"]),
+    ("large pizzas please", ["Margherita Pizza"]),
+    ("salmon sushi", ["Salmon Sushi Set"]),
+    ("cheap burger", ["Classic Burger"]),
+])
+def test_find_dishes_multi_word_keywords(catalog, keywords, expected):
+    assert _names(catalog.find_dishes(keywords)) == expected
+
+
+@pytest.mark.parametrize("keywords, expected", [
+    ("pizza", ["Pepperoni Pizza"]),
+    ("margherita pizza", ["Pepperoni Pizza"]),
+    ("sushi", ["Dragon Roll"]),
+])
+def test_find_dishes_alternatives(catalog, keywords, expected):
+    assert _names(catalog.find_dishes(keywords, tier=ALTERNATIVE)) == expected
+
+
+def test_find_dishes_falls_back_to_featured_without_alternatives():
+    catalog = Catalog([], [{"name": "Pad Thai", "price": 9.5, "restaurant": "Thai Corner", "keywords": ["thai"]}])
+    assert _names(catalog.find_dishes("thai noodles", tier=ALTERNATIVE)) == ["Pad Thai"]
+
+
+def test_find_dishes_without_match(catalog):
+    assert catalog.find_dishes("tacos") == []
+    assert catalog.find_dishes("") == []
+
+
+@pytest.mark.parametrize("keywords, tier, expected", [
+    ("cheeseburger", FEATURED, ["Classic Burger"]),
+    ("cheese", ALTERNATIVE, ["Double Cheeseburger"]),
+    ("piz", FEATURED, ["Margherita Pizza"]),
+    ("sush please", ALTERNATIVE, ["Dragon Roll"]),
+    ("pepperonipizza", FEATURED, ["Margherita Pizza"]),
+])
+def test_find_dishes_matches_parts_of_words(catalog, keywords, tier, expected):
+    assert _names(catalog.find_dishes(keywords, tier=tier)) == expected
+
+
+def test_find_dishes_prefers_whole_words_over_parts(catalog):
+    # "roll" is a whole word of Dragon Roll, so the partial "sush" is not tried
+    assert _names(catalog.find_dishes("sush roll", tier=ALTERNATIVE)) == ["Dragon Roll"]
+    assert _names(catalog.find_dishes("cheese pizza")) == ["Margherita Pizza"]
+
+
+def test_partial_matches_ignore_short_keywords(catalog):
+    assert catalog.find_dishes("pi") == []
+    assert partial_matches("pi", ["pizza"]) == []
+    assert partial_matches("apizzaa", ["pizza", "za"]) == ["pizza"]
+
+
+@pytest.mark.parametrize("keywords, expected", [
+    ("chinese food", "chinese"),
+    ("something italian", "italian"),
+    ("indianfood", "indian"),
+    ("ital", "italian"),
+    ("tacos", None),
+])
+def test_find_cuisine(catalog, keywords, expected):
+    assert catalog.find_cuisine(keywords) == expected
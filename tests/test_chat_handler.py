@@ -0,0 +1,135 @@
+"""Chat turns against the real ``crewai.LLM`` call contract, with litellm patched out."""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crewai")
+litellm = pytest.importorskip("litellm")
+
+from crewai.llm import LLM
+
+from frontend.src import chat_handler
+from frontend.src.chat_handler import ChatHandler, ChatSession, warn_dropped_tool_calls
+from frontend.src.chat_metrics import TOOL_CALLS, record_progress_event
+from frontend.src.context_window import ContextWindowPolicy
+from frontend.src.progress import progress
+
+TOOL_NAME = "food_crew"
+TOOL_SCHEMA = {
+    "type": "function",
+    "function": {
+        "name": TOOL_NAME,
+        "description": "Run the food crew",
+        "parameters": {
+            "type": "object",
+            "properties": {"user_message": {"type": "string"}},
+            "required": ["user_message"],
+        },
+    },
+}
+
+
+def _tool_call_response(*messages):
+    tool_calls = [
+        {
+            "id": f"call_{index}",
+            "type": "function",
+            "function": {"name": TOOL_NAME, "arguments": json.dumps({"user_message": message})},
+        }
+        for index, message in enumerate(messages)
+    ]
+    return litellm.ModelResponse(choices=[{
+        "index": 0,
+        "finish_reason": "tool_calls",
+        "message": {"role": "assistant", "content": None, "tool_calls": tool_calls},
+    }])
+
+
+@pytest.fixture
+def session(monkeypatch):
+    handler = ChatHandler.__new__(ChatHandler)
+    handler.crew = SimpleNamespace(copy=lambda: "crew-copy")
+    handler.crew_name = "food_crew"
+    handler.chat_llm = LLM(model="gpt-4o-mini")
+    handler.crew_chat_inputs = SimpleNamespace(crew_name=TOOL_NAME)
+    handler.crew_tool_schema = TOOL_SCHEMA
+    handler.system_message = "You are a food assistant."
+    handler.intro_content = "Hi! What would you like to eat?"
+    handler.is_initialized = True
+    handler.context_policy = ContextWindowPolicy()
+    handler.response_cache = None
+    handler._opening_digest = None
+
+    crew_runs = []
+
+    def run_crew_tool(crew, messages, **kwargs):
+        crew_runs.append(kwargs)
+        return f"Crew answer for {kwargs['user_message']}"
+
+    monkeypatch.setattr(chat_handler, "run_crew_tool", run_crew_tool)
+    chat_session = ChatSession(handler, "chat-1")
+    chat_session.crew_runs = crew_runs
+    return chat_session
+
+
+def test_tool_call_runs_inside_llm_call_and_is_reported(session, monkeypatch):
+    completions = []
+
+    def completion(**params):
+        completions.append(params)
+        return _tool_call_response("pizza in SW1A", "sushi in SW1A")
+
+    monkeypatch.setattr(litellm, "completion", completion)
+    progress.subscribe(record_progress_event)
+    before = TOOL_CALLS.value(tool=TOOL_NAME, status="success")
+    events = []
+    try:
+        result = session.process_message("pizza please", on_event=events.append)
+    finally:
+        progress.unsubscribe(record_progress_event)
+
+    # CrewAI runs the first requested call and returns its output: one LLM
+    # round trip and one crew run per turn, however many calls were requested
+    assert len(completions) == 1
+    assert session.crew_runs == [{"user_message": "pizza in SW1A"}]
+    assert result == {"status": "success", "content": "Crew answer for pizza in SW1A", "has_tool_call": True}
+    assert session.messages[-1] == {"role": "assistant", "content": "Crew answer for pizza in SW1A"}
+
+    tool_events = [event for event in events if event.get("phase") == "tool_call"]
+    assert [event["type"] for event in tool_events] == ["phase_start", "phase_end"]
+    assert all(event["tool"] == TOOL_NAME for event in tool_events)
+    assert TOOL_CALLS.value(tool=TOOL_NAME, status="success") == before + 1
+
+
+def test_plain_answer_does_not_run_the_crew(session, monkeypatch):
+    def completion(**params):
+        return litellm.ModelResponse(choices=[{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "What is your postcode?"},
+        }])
+
+    monkeypatch.setattr(litellm, "completion", completion)
+    events = []
+    result = session.process_message("hi", on_event=events.append)
+
+    assert result == {"status": "success", "content": "What is your postcode?", "has_tool_call": False}
+    assert session.crew_runs == []
+    assert not any(event.get("phase") == "tool_call" for event in events)
+
+
+def test_dropped_tool_calls_are_logged(session, caplog):
+    # ChatSession registered the crew tool; litellm reports every response to the callback
+    assert warn_dropped_tool_calls in litellm.success_callback
+    with caplog.at_level("WARNING"):
+        warn_dropped_tool_calls({}, _tool_call_response("pizza in SW1A", "sushi in SW1A", "ramen in SW1A"))
+    assert "requested 3 crew tool calls" in caplog.text
+    assert "2 were dropped" in caplog.text
+
+
+def test_single_tool_call_is_not_logged(session, caplog):
+    with caplog.at_level("WARNING"):
+        warn_dropped_tool_calls({}, _tool_call_response("pizza in SW1A"))
+        warn_dropped_tool_calls({"complete_streaming_response": None}, litellm.ModelResponse(choices=[]))
+    assert caplog.text == ""
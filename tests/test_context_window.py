@@ -0,0 +1,121 @@
+"""Context window policy: summary folding, tool call boundaries and the latest turn."""
+from frontend.src.context_window import SUMMARY_PREFIX, ContextWindowPolicy
+
+SYSTEM = {"role": "system", "content": "You are a food assistant."}
+
+
+def _turn(index):
+    return [
+        {"role": "user", "content": f"question {index}"},
+        {"role": "assistant", "content": f"answer {index}"},
+    ]
+
+
+def _tool_turn(index, result="x" * 40):
+    return [
+        {"role": "user", "content": f"find food {index}"},
+        {"role": "assistant", "content": None, "tool_calls": [{"id": f"call_{index}", "function": {"name": "crew"}}]},
+        {"role": "tool", "tool_call_id": f"call_{index}", "content": result},
+        {"role": "tool", "tool_call_id": f"call_{index}", "content": result},
+        {"role": "assistant", "content": f"found food {index}"},
+    ]
+
+
+def _summary(messages):
+    summaries = [m for m in messages if m["role"] == "system" and m["content"].startswith(SUMMARY_PREFIX)]
+    assert len(summaries) <= 1
+    return summaries[0]["content"] if summaries else None
+
+
+def test_history_within_limits_is_unchanged():
+    messages = [SYSTEM] + _turn(1) + _turn(2)
+    policy = ContextWindowPolicy(max_tokens=10000, keep_last=10, max_tool_chars=1000, max_summary_chars=1000)
+    assert policy.apply(messages) == messages
+
+
+def test_older_turns_are_folded_into_one_summary():
+    messages = [SYSTEM] + [m for index in range(1, 6) for m in _turn(index)]
+    policy = ContextWindowPolicy(max_tokens=10000, keep_last=4, max_tool_chars=1000, max_summary_chars=1000)
+
+    compacted = policy.apply(messages)
+
+    assert compacted[0] == SYSTEM
+    summary = _summary(compacted)
+    assert compacted[1]["content"] == summary
+    for index in (1, 2, 3):
+        assert f"- User: question {index}" in summary
+        assert f"- Assistant: answer {index}" in summary
+    assert compacted[2:] == _turn(4) + _turn(5)
+
+
+def test_summary_is_carried_over_and_extended():
+    policy = ContextWindowPolicy(max_tokens=10000, keep_last=2, max_tool_chars=1000, max_summary_chars=1000)
+    history = policy.apply([SYSTEM] + _turn(1) + _turn(2))
+    history = policy.apply(history + _turn(3))
+
+    summary = _summary(history)
+    assert summary.index("question 1") < summary.index("question 2")
+    assert history[-2:] == _turn(3)
+    assert len(history) == 4
+
+
+def test_summary_keeps_the_newest_lines_within_its_limit():
+    messages = [SYSTEM] + [m for index in range(1, 30) for m in _turn(index)] + _turn(30)
+    policy = ContextWindowPolicy(max_tokens=10000, keep_last=2, max_tool_chars=1000, max_summary_chars=120)
+
+    summary = _summary(policy.apply(messages))
+
+    body = summary[len(SUMMARY_PREFIX):].strip()
+    assert len(body) <= 120
+    assert "answer 29" in body
+    assert "question 1\n" not in body
+    assert all(line.startswith("- ") for line in body.splitlines())
+
+
+def test_cut_never_separates_tool_results_from_their_call():
+    messages = [SYSTEM] + _tool_turn(1) + _turn(2)
+    # keep_last=4 would start at the second tool result of turn 1
+    policy = ContextWindowPolicy(max_tokens=10000, keep_last=4, max_tool_chars=1000, max_summary_chars=1000)
+
+    compacted = policy.apply(messages)
+
+    kept = compacted[2:]
+    assert kept[0]["role"] == "assistant" and kept[0]["tool_calls"]
+    assert [m["role"] for m in kept] == ["assistant", "tool", "tool", "assistant", "user", "assistant"]
+
+
+def test_budget_cuts_skip_whole_tool_groups():
+    messages = [SYSTEM] + _tool_turn(1, result="r" * 400) + _tool_turn(2, result="s" * 400) + _turn(3)
+    policy = ContextWindowPolicy(max_tokens=260, keep_last=100, max_tool_chars=1000, max_summary_chars=1000)
+
+    compacted = policy.apply(messages)
+
+    body = compacted[2:] if _summary(compacted) else compacted[1:]
+    for position, message in enumerate(body):
+        if message["role"] == "tool":
+            previous = body[position - 1]
+            assert previous["role"] == "tool" or previous.get("tool_calls")
+    assert body[-2:] == _turn(3)
+
+
+def test_latest_turn_is_kept_whole_over_budget():
+    latest = _tool_turn(2, result="z" * 2000)
+    messages = [SYSTEM] + _turn(1) + latest
+    policy = ContextWindowPolicy(max_tokens=50, keep_last=2, max_tool_chars=5000, max_summary_chars=1000)
+
+    compacted = policy.apply(messages)
+
+    assert compacted[-len(latest):] == latest
+    assert "question 1" in _summary(compacted)
+
+
+def test_tool_outputs_are_capped():
+    messages = [SYSTEM] + _tool_turn(1, result="y" * 500)
+    policy = ContextWindowPolicy(max_tokens=10000, keep_last=10, max_tool_chars=100, max_summary_chars=1000)
+
+    compacted = policy.apply(messages)
+
+    tool_results = [m["content"] for m in compacted if m["role"] == "tool"]
+    assert tool_results and all(text.startswith("y" * 100) and "truncated 400 chars" in text for text in tool_results)
+    # The caller's history is not modified in place
+    assert messages[3]["content"] == "y" * 500
@@ -0,0 +1,37 @@
+"""FakeLLM follows the crewai.LLM tool-call contract."""
+import pytest
+
+pytest.importorskip("crewai")
+
+from shared.fake_llm import FakeLLM
+
+TOOLS = [{
+    "type": "function",
+    "function": {"name": "food_crew", "parameters": {"properties": {"user_message": {"type": "string"}}}},
+}]
+MESSAGES = [{"role": "user", "content": "pizza in SW1A"}]
+
+
+def test_tool_turn_runs_the_function_and_returns_its_output():
+    llm = FakeLLM(tool_call_every=1)
+    calls = []
+
+    def food_crew(**kwargs):
+        calls.append(kwargs)
+        return "Crew answer"
+
+    assert llm.call(MESSAGES, tools=TOOLS, available_functions={"food_crew": food_crew}) == "Crew answer"
+    assert calls == [{"user_message": "pizza in SW1A"}]
+
+
+def test_tool_turn_without_functions_returns_text():
+    response = FakeLLM(tool_call_every=1).call(MESSAGES, tools=TOOLS)
+    assert isinstance(response, str) and response
+
+
+def test_failing_tool_falls_back_to_text():
+    def food_crew(**kwargs):
+        raise RuntimeError("crew failed")
+
+    response = FakeLLM(tool_call_every=1).call(MESSAGES, tools=TOOLS, available_functions={"food_crew": food_crew})
+    assert isinstance(response, str) and response
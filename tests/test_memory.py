@@ -0,0 +1,181 @@
+"""Per-user memory partitioning, legacy fallback and compaction."""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import shared.memory as shared_memory
+from shared.memory import CachedMemory, NullMemory, UserScopedMemory, user_collection_name
+
+
+class FakeMemory:
+    """In-memory stand-in for a mem0 Memory on one collection."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = []
+        self.deleted = []
+        self.closed = False
+
+    def add(self, messages, user_id=None, **kwargs):
+        item = {
+            "id": f"{self.name}-{len(self.items)}",
+            "memory": messages,
+            "user_id": user_id,
+            "created_at": kwargs.get("created_at") or datetime.now(timezone.utc).isoformat(),
+        }
+        self.items.append(item)
+        return {"results": [item]}
+
+    def search(self, query, user_id=None, limit=100, **kwargs):
+        return {"results": [item for item in self.items if item["user_id"] == user_id and query in item["memory"]][:limit]}
+
+    def get_all(self, user_id=None, limit=100, **kwargs):
+        return {"results": [item for item in self.items if item["user_id"] == user_id][:limit]}
+
+    def delete(self, memory_id):
+        self.deleted.append(memory_id)
+        self.items = [item for item in self.items if item["id"] != memory_id]
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def collections():
+    return {}
+
+
+@pytest.fixture
+def factory(collections):
+    def create(name):
+        return collections.setdefault(name, FakeMemory(name))
+    return create
+
+
+def test_users_get_separate_collections(factory, collections):
+    memory = UserScopedMemory(factory)
+    memory.add("likes pizza", user_id="alice")
+    memory.add("likes sushi", user_id="bob")
+
+    assert len(collections) == 2
+    assert [item["memory"] for item in memory.search("likes", user_id="alice")["results"]] == ["likes pizza"]
+
+
+def test_legacy_collection_stays_readable(factory, collections):
+    legacy = factory("chatbot_memory")
+    legacy.add("User: I am vegetarian", user_id="user")
+    legacy.add("User: I live in SW1A", user_id="someone-else")
+    memory = UserScopedMemory(factory, legacy_collection="chatbot_memory")
+    memory.add("User: I like pizza", user_id="user")
+
+    found = [item["memory"] for item in memory.search("User", user_id="user")["results"]]
+    assert found == ["User: I like pizza", "User: I am vegetarian"]
+    assert len(memory.get_all(user_id="user")["results"]) == 2
+    assert memory.search("User", user_id="new-user")["results"] == []
+
+
+def test_users_without_legacy_memories_skip_the_legacy_collection(factory, collections):
+    memory = UserScopedMemory(factory, legacy_collection="chatbot_memory")
+    memory.search("pizza", user_id="alice")
+    legacy = collections["chatbot_memory"]
+    legacy.add("pizza", user_id="alice")
+
+    # The check ran once on the first search and is not repeated
+    assert memory.search("pizza", user_id="alice")["results"] == []
+
+
+def test_compaction_deletes_expired_then_oldest(factory, collections):
+    memory = UserScopedMemory(factory, ttl=86400, max_per_user=2)
+    now = datetime.now(timezone.utc)
+    user_memory = factory(user_collection_name("alice"))
+    for age_hours in (50, 3, 2, 1):
+        user_memory.add(f"{age_hours}h old", user_id="alice", created_at=(now - timedelta(hours=age_hours)).isoformat())
+
+    assert memory.compact("alice") == 2
+    assert sorted(item["memory"] for item in user_memory.items) == ["1h old", "2h old"]
+
+
+def test_compaction_keeps_the_newest_whatever_order_get_all_returns(factory):
+    memory = UserScopedMemory(factory, max_per_user=3)
+    now = datetime.now(timezone.utc)
+    user_memory = factory(user_collection_name("alice"))
+    # Stored newest first, so get_all also lists them newest first
+    for age_hours in (1, 2, 3, 4, 5, 6, 7):
+        user_memory.add(f"{age_hours}h old", user_id="alice", created_at=(now - timedelta(hours=age_hours)).isoformat())
+    user_memory.items.insert(3, user_memory.items.pop())
+
+    assert memory.compact("alice") == 4
+    assert sorted(item["memory"] for item in user_memory.items) == ["1h old", "2h old", "3h old"]
+
+
+def test_all_memory_items_reads_past_the_first_page(factory):
+    user_memory = factory("alice")
+    for index in range(5):
+        user_memory.add(f"memory {index}", user_id="alice")
+    assert len(shared_memory._all_memory_items(user_memory, "alice", page_size=2)) == 5
+
+
+def test_evicted_memories_are_closed(factory, collections):
+    memory = UserScopedMemory(factory, max_open=2)
+    for user_id in ("alice", "bob", "carol"):
+        memory.add("hello", user_id=user_id)
+
+    closed = [user_id for user_id in ("alice", "bob", "carol") if collections[user_collection_name(user_id)].closed]
+    assert closed == ["alice"]
+
+
+def test_memory_evicted_while_in_use_is_closed_when_the_call_ends(factory, collections):
+    memory = UserScopedMemory(factory, max_open=1)
+    with memory.for_user("alice") as alice:
+        memory.add("hello", user_id="bob")
+        assert not alice.closed
+        alice.add("still open", user_id="alice")
+    assert alice.closed
+    assert not collections[user_collection_name("bob")].closed
+
+
+def test_compaction_is_off_without_limits(factory):
+    memory = UserScopedMemory(factory)
+    for index in range(UserScopedMemory.COMPACT_EVERY):
+        memory.add(f"memory {index}", user_id="alice")
+    assert len(memory.get_all(user_id="alice")["results"]) == UserScopedMemory.COMPACT_EVERY
+
+
+@pytest.fixture
+def fresh_shared_memory(monkeypatch):
+    monkeypatch.setattr(shared_memory, "_memory", None)
+    monkeypatch.setenv("MEMORY_BACKEND", "mem0")
+    yield
+    shared_memory._memory = None
+
+
+def test_get_memory_returns_the_cache_wrapper_to_every_caller(fresh_shared_memory, monkeypatch):
+    monkeypatch.setenv("MEMORY_CACHE_ENABLED", "true")
+
+    def slow_search_ttl():
+        # Widen the window in which a half-built instance could be published
+        time.sleep(0.05)
+        return 30.0
+
+    monkeypatch.setattr(shared_memory, "get_memory_search_cache_ttl", slow_search_ttl)
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(shared_memory.get_memory())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(seen) == 8
+    assert all(isinstance(memory, CachedMemory) for memory in seen)
+    assert len({id(memory) for memory in seen}) == 1
+
+
+def test_get_memory_without_cache_or_backend(fresh_shared_memory, monkeypatch):
+    monkeypatch.setenv("MEMORY_CACHE_ENABLED", "false")
+    assert isinstance(shared_memory.get_memory(), UserScopedMemory)
+
+    shared_memory._memory = None
+    monkeypatch.setenv("MEMORY_BACKEND", "none")
+    assert isinstance(shared_memory.get_memory(), NullMemory)
@@ -0,0 +1,198 @@
+"""Pricing engine: fee tiers, promotions, combos, minimum orders and candidate carts."""
+import pytest
+
+from backend.src.catalog import Catalog
+from backend.src.pricing import DEFAULT_RULES, PricingEngine, PricingRules, build_candidate_carts
+
+
+def _cart(*items, restaurant="Diner", platform="Deliveroo"):
+    return {
+        "restaurant": restaurant,
+        "platform": platform,
+        "items": [{"name": name, "price": price, "quantity": quantity} for name, price, quantity in items],
+    }
+
+
+TIERED = PricingRules(fee_tiers=[
+    {"min_subtotal": 0.0, "fee": 3.99},
+    {"min_subtotal": 15.0, "fee": 1.99},
+    {"min_subtotal": 25.0, "fee": 0.0},
+])
+
+
+@pytest.mark.parametrize("subtotal, fee", [
+    (0.0, 3.99),
+    (14.99, 3.99),
+    (15.0, 1.99),
+    (24.99, 1.99),
+    (25.0, 0.0),
+    (60.0, 0.0),
+])
+def test_fee_tier_boundaries(subtotal, fee):
+    quote = TIERED.quote_many([_cart(("Meal", subtotal, 1))])[0]
+    assert quote["delivery_fee"] == fee
+    assert quote["total"] == round(subtotal + fee, 2)
+
+
+def test_subtotal_below_the_lowest_tier_pays_its_fee():
+    rules = PricingRules(fee_tiers=[{"min_subtotal": 10.0, "fee": 2.5}, {"min_subtotal": 20.0, "fee": 1.0}])
+    assert rules.quote_many([_cart(("Snack", 4.0, 1))])[0]["delivery_fee"] == 2.5
+
+
+def test_default_rules_match_the_house_offer():
+    below, at = DEFAULT_RULES.quote_many([_cart(("Meal", 17.99, 1)), _cart(("Meal", 9.0, 2))])
+    assert (below["discount"], below["delivery_fee"], below["total"]) == (0.0, 2.99, 20.98)
+    assert "promotion" not in below
+    assert (at["discount"], at["delivery_fee"], at["total"]) == (2.7, 1.69, 16.99)
+    assert at["promotion"] == "15% off orders of £18 or more"
+
+
+COMBO_RULES = PricingRules(
+    fee_tiers=[{"min_subtotal": 0.0, "fee": 2.0}],
+    promotions=[
+        {"name": "£3 off £20", "min_subtotal": 20.0, "amount_off": 3.0},
+        {"name": "10% off", "min_subtotal": 0.0, "percent_off": 0.1},
+    ],
+    combos=[{"name": "Meal deal", "items": ["Burger", "Fries"], "price": 10.0}],
+)
+
+
+def test_combo_applies_before_promotion_thresholds():
+    # 2 burgers and 2 fries cost 24, or 20 as two meal deals; the £3 promotion still applies at 20
+    quote = COMBO_RULES.quote_many([_cart(("Burger", 8.0, 2), ("Fries", 4.0, 2))])[0]
+    assert quote["subtotal"] == 24.0
+    assert quote["combo_savings"] == 4.0
+    assert quote["promotion"] == "£3 off £20"
+    assert quote["discount"] == 3.0
+    assert quote["total"] == 19.0
+
+
+def test_combo_can_drop_a_cart_below_a_promotion_threshold():
+    # 20 before the combo, 18 after: only the percentage promotion is reachable
+    quote = COMBO_RULES.quote_many([_cart(("Burger", 8.0, 1), ("Fries", 4.0, 1), ("Shake", 8.0, 1))])[0]
+    assert quote["subtotal"] == 20.0
+    assert quote["combo_savings"] == 2.0
+    assert quote["promotion"] == "10% off"
+    assert quote["discount"] == 1.8
+    assert quote["total"] == 18.2
+
+
+def test_combo_is_skipped_when_it_costs_more_than_its_parts():
+    rules = PricingRules(combos=[{"name": "Bad deal", "items": ["Burger", "Fries"], "price": 20.0}])
+    assert rules.quote_many([_cart(("Burger", 8.0, 1), ("Fries", 4.0, 1))])[0]["combo_savings"] == 0.0
+
+
+def test_promotion_with_cheaper_delivery_can_beat_a_larger_discount():
+    rules = PricingRules(
+        fee_tiers=[{"min_subtotal": 0.0, "fee": 5.0}],
+        promotions=[
+            {"name": "£1 off", "min_subtotal": 0.0, "amount_off": 1.0},
+            {"name": "Free delivery", "min_subtotal": 0.0, "delivery_fee": 0.0},
+        ],
+    )
+    quote = rules.quote_many([_cart(("Meal", 12.0, 1))])[0]
+    assert quote["promotion"] == "Free delivery"
+    assert (quote["discount"], quote["delivery_fee"], quote["total"]) == (0.0, 0.0, 12.0)
+
+
+def test_carts_below_the_minimum_order_rank_last():
+    engine = PricingEngine(
+        platform_rules={"Just Eat": PricingRules(
+            fee_tiers=[{"min_subtotal": 0.0, "fee": 0.0}], minimum_order=15.0, small_order_fee=1.0,
+        )},
+    )
+    small = _cart(("Noodles", 6.0, 1), restaurant="Cheap Wok", platform="Just Eat")
+    large = _cart(("Noodles", 9.0, 2), restaurant="Wok & Roll", platform="Deliveroo")
+
+    ranked = engine.compare([small, large])
+
+    assert [quote["restaurant"] for quote in ranked] == ["Wok & Roll", "Cheap Wok"]
+    assert ranked[1]["meets_minimum"] is False
+    assert ranked[1]["small_order_fee"] == 1.0
+    assert ranked[1]["total"] == 7.0 < ranked[0]["total"]
+    assert [quote["restaurant"] for quote in engine.compare([small, large], limit=1)] == ["Wok & Roll"]
+
+
+def test_restaurant_rules_take_precedence_over_platform_rules():
+    engine = PricingEngine(
+        platform_rules={"Deliveroo": PricingRules(fee_tiers=[{"min_subtotal": 0.0, "fee": 4.0}])},
+        restaurant_rules={"Diner": PricingRules(fee_tiers=[{"min_subtotal": 0.0, "fee": 1.0}])},
+    )
+    diner, other = engine.quote([_cart(("Meal", 10.0, 1)), _cart(("Meal", 10.0, 1), restaurant="Other")])
+    assert diner["delivery_fee"] == 1.0
+    assert other["delivery_fee"] == 4.0
+
+
+@pytest.mark.parametrize("quantity, expected", [
+    (None, 1),
+    ("2", 2),
+    ("2.0", 2),
+    (0, 1),
+    (-3, 1),
+    ("two", 1),
+    ([], 1),
+])
+def test_quantities_are_normalized(quantity, expected):
+    quote = PricingRules().quote_many([{"items": [{"name": "Meal", "price": 5.0, "quantity": quantity}]}])[0]
+    assert quote["items"][0]["quantity"] == expected
+    assert quote["subtotal"] == 5.0 * expected
+
+
+@pytest.mark.parametrize("price, expected", [
+    (None, 0.0),
+    ("4.50", 4.5),
+    ("£4.50", 0.0),
+    (3, 3.0),
+])
+def test_prices_are_normalized(price, expected):
+    quote = PricingRules().quote_many([{"items": [{"name": "Meal", "price": price}]}])[0]
+    assert quote["items"][0]["price"] == expected
+    assert quote["subtotal"] == expected
+
+
+def test_items_without_fields_or_as_names_are_priced_at_zero():
+    quote = PricingRules().quote_many([{"items": [{}, "Mystery dish"]}])[0]
+    assert [item["name"] for item in quote["items"]] == ["", "Mystery dish"]
+    assert quote["subtotal"] == 0.0
+
+
+CATALOG = Catalog(
+    [
+        {"name": "Wok & Roll", "cuisine": "chinese", "platform": "Deliveroo", "tiers": ["featured"], "menu": [
+            {"name": "Egg Fried Rice", "price": 4.5}, {"name": "Spring Rolls", "price": 3.0},
+        ]},
+        {"name": "Bamboo House", "cuisine": "chinese", "platform": "Just Eat", "tiers": ["featured"], "menu": [
+            {"name": "Egg Fried Rice", "price": 4.0},
+        ]},
+        {"name": "Golden Dragon", "cuisine": "chinese", "tiers": ["featured"], "menu": [
+            {"name": "Egg Fried Rice", "price": 2.0}, {"name": "Spring Rolls", "price": 1.0},
+            {"name": "Crispy Duck", "price": 12.0},
+        ]},
+    ],
+    [],
+)
+
+
+def test_candidate_carts_need_every_item_and_a_platform():
+    carts, missing = build_candidate_carts(["egg fried rice", {"name": "spring rolls", "quantity": "2"}], CATALOG)
+
+    assert missing == []
+    assert [(cart["restaurant"], cart["platform"]) for cart in carts] == [("Wok & Roll", "Deliveroo")]
+    assert carts[0]["items"] == [
+        {"name": "Egg Fried Rice", "price": 4.5, "quantity": 1},
+        {"name": "Spring Rolls", "price": 3.0, "quantity": 2},
+    ]
+
+
+def test_candidate_carts_report_items_only_sold_off_platform():
+    carts, missing = build_candidate_carts(["crispy duck", "egg fried rice"], CATALOG)
+    assert carts == []
+    assert missing == ["crispy duck"]
+
+
+def test_real_catalog_carts_all_name_a_platform():
+    from backend.src.catalog import get_catalog
+
+    carts, _ = build_candidate_carts(["egg fried rice"], get_catalog())
+    assert carts
+    assert all(cart["platform"] for cart in carts)
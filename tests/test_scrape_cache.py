@@ -0,0 +1,124 @@
+"""Scrape cache: keys, freshness, stale-while-revalidate and single-flight fetches."""
+import threading
+from concurrent.futures import Future
+
+from backend.src.scrape_cache import ScrapeCache, postcode_outward_code, scrape_cache_key
+
+KEY = scrape_cache_key("SW1A 1AA", "pizza")
+
+
+class Scraper:
+    """Records scrapes and hands out futures the test completes."""
+
+    def __init__(self):
+        self.futures = []
+        self._lock = threading.Lock()
+
+    def submit(self):
+        future = Future()
+        with self._lock:
+            self.futures.append(future)
+        return future
+
+
+def _cache(**kwargs):
+    return ScrapeCache(**{"ttl": 60, "stale_ttl": 600, "max_entries": 10, **kwargs})
+
+
+def _age(cache, key, seconds):
+    cache._entries[key].stored_at -= seconds
+
+
+def test_keys_share_the_outward_code_and_stemmed_keywords():
+    assert postcode_outward_code("sw1a1aa") == "SW1A"
+    assert postcode_outward_code("SW1A 2BB") == "SW1A"
+    assert scrape_cache_key("SW1A 1AA", "Pizzas  Margherita") == scrape_cache_key("sw1a2bb", "margherita pizza")
+
+
+def test_fresh_entry_is_served_without_scraping():
+    cache, scraper = _cache(), Scraper()
+    first = cache.get_or_submit(KEY, scraper.submit)
+    first.set_result([{"name": "Pizza Place"}])
+
+    second = cache.get_or_submit(KEY, scraper.submit)
+
+    assert second.result(timeout=1) == [{"name": "Pizza Place"}]
+    assert len(scraper.futures) == 1
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    cache, scraper = _cache(), Scraper()
+    cache.get_or_submit(KEY, scraper.submit).set_result(["old"])
+    _age(cache, KEY, 120)
+
+    served = [cache.get_or_submit(KEY, scraper.submit) for _ in range(3)]
+
+    assert all(future.result(timeout=0) == ["old"] for future in served)
+    assert len(scraper.futures) == 2
+    scraper.futures[1].set_result(["new"])
+    assert cache.get_or_submit(KEY, scraper.submit).result(timeout=0) == ["new"]
+    assert len(scraper.futures) == 2
+
+
+def test_entry_past_the_stale_window_is_scraped_again():
+    cache, scraper = _cache(), Scraper()
+    cache.get_or_submit(KEY, scraper.submit).set_result(["old"])
+    _age(cache, KEY, 60 + 600 + 1)
+
+    future = cache.get_or_submit(KEY, scraper.submit)
+
+    assert not future.done()
+    assert future is scraper.futures[1]
+
+
+def test_concurrent_misses_share_one_scrape():
+    cache, scraper = _cache(), Scraper()
+    start = threading.Barrier(16)
+    results = []
+
+    def search():
+        start.wait()
+        results.append(cache.get_or_submit(KEY, scraper.submit))
+
+    threads = [threading.Thread(target=search) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(scraper.futures) == 1
+    assert all(future is scraper.futures[0] for future in results)
+    scraper.futures[0].set_result(["shared"])
+    assert cache.get_or_submit(KEY, scraper.submit).result(timeout=0) == ["shared"]
+    assert len(scraper.futures) == 1
+
+
+def test_failures_and_empty_results_are_not_cached():
+    cache, scraper = _cache(), Scraper()
+    cache.get_or_submit(KEY, scraper.submit).set_exception(RuntimeError("blocked"))
+    cache.get_or_submit(KEY, scraper.submit).set_result([{"error": "no results"}])
+    cache.get_or_submit(KEY, scraper.submit).set_result([])
+
+    cache.get_or_submit(KEY, scraper.submit)
+
+    assert len(scraper.futures) == 4
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache, scraper = _cache(max_entries=2), Scraper()
+    for keywords in ("pizza", "sushi", "burger"):
+        cache.get_or_submit(scrape_cache_key("SW1A", keywords), scraper.submit).set_result([keywords])
+
+    cache.get_or_submit(scrape_cache_key("SW1A", "pizza"), scraper.submit)
+
+    assert len(scraper.futures) == 4
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    scraper = Scraper()
+    _cache(disk_dir=tmp_path).get_or_submit(KEY, scraper.submit).set_result(["from disk"])
+
+    restarted = _cache(disk_dir=tmp_path)
+
+    assert restarted.get_or_submit(KEY, scraper.submit).result(timeout=0) == ["from disk"]
+    assert len(scraper.futures) == 1
@@ -0,0 +1,98 @@
+"""Session manager: resident reuse, reloads after other processes save, and LRU eviction."""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from frontend.src.chat_handler import ChatHandler
+from frontend.src.session_manager import SessionManager
+from frontend.src.thread_store import SQLiteThreadStore
+
+TOOL_SCHEMA = {"type": "function", "function": {"name": "food_crew", "parameters": {}}}
+
+
+@pytest.fixture
+def handler():
+    handler = ChatHandler.__new__(ChatHandler)
+    handler.crew_name = "food_crew"
+    handler.chat_llm = None
+    handler.crew_chat_inputs = SimpleNamespace(crew_name="food_crew")
+    handler.crew_tool_schema = TOOL_SCHEMA
+    handler.system_message = "You are a food assistant."
+    handler.intro_content = "Hi! What would you like to eat?"
+    handler.is_initialized = True
+    return handler
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteThreadStore(str(tmp_path / "threads.db"))
+    yield store
+    store.close()
+
+
+def _turn(manager, session, text):
+    session.messages.append({"role": "user", "content": text})
+    manager.save(session)
+
+
+def test_current_resident_session_is_reused(store, handler):
+    manager = SessionManager(store, max_resident=4, ttl=60)
+    session = manager.get_or_create("chat-1", handler, "crew")
+    _turn(manager, session, "pizza please")
+
+    assert manager.get_or_create("chat-1", handler, "crew") is session
+    assert store.load("chat-1")["crew_id"] == "crew"
+
+
+def test_thread_saved_by_another_process_is_reloaded(store, handler):
+    first = SessionManager(store, max_resident=4, ttl=60)
+    second = SessionManager(store, max_resident=4, ttl=60)
+    _turn(first, first.get_or_create("chat-1", handler), "pizza please")
+    stale = second.get_or_create("chat-1", handler)
+    assert stale.messages[-1]["content"] == "pizza please"
+
+    _turn(first, first.get_or_create("chat-1", handler), "make it two")
+    reloaded = second.get_or_create("chat-1", handler)
+
+    assert reloaded is not stale
+    assert [m["content"] for m in reloaded.messages[-2:]] == ["pizza please", "make it two"]
+    # Its own save keeps the reloaded session current
+    _turn(second, reloaded, "and a drink")
+    assert second.get_or_create("chat-1", handler) is reloaded
+    assert first.get_or_create("chat-1", handler).messages[-1]["content"] == "and a drink"
+
+
+def test_evicted_thread_is_reloaded_from_the_store(store, handler):
+    manager = SessionManager(store, max_resident=1, ttl=60)
+    first = manager.get_or_create("chat-1", handler)
+    _turn(manager, first, "pizza please")
+    manager.get_or_create("chat-2", handler)
+
+    assert "chat-1" not in manager
+    assert len(manager) == 1
+    reloaded = manager.get_or_create("chat-1", handler)
+    assert reloaded is not first
+    assert reloaded.messages == first.messages
+    assert "chat-2" not in manager
+
+
+def test_idle_session_expires_but_its_thread_survives(store, handler):
+    manager = SessionManager(store, max_resident=4, ttl=0)
+    session = manager.get_or_create("chat-1", handler)
+    _turn(manager, session, "pizza please")
+
+    assert manager.get("chat-1") is None
+    assert manager.get_or_create("chat-1", handler).messages == session.messages
+
+
+def test_remove_forgets_the_thread_everywhere(store, handler):
+    manager = SessionManager(store, max_resident=4, ttl=60)
+    _turn(manager, manager.get_or_create("chat-1", handler), "pizza please")
+
+    manager.remove("chat-1")
+
+    assert "chat-1" not in manager
+    assert store.load("chat-1") is None
+    assert manager.get_or_create("chat-1", handler).messages == handler.initial_messages()
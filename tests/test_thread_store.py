@@ -0,0 +1,67 @@
+"""Chat thread stores: the abstract base, in-memory storage and SQLite connections."""
+import sqlite3
+import threading
+
+import pytest
+
+from frontend.src.thread_store import MemoryThreadStore, SQLiteThreadStore, ThreadStore
+
+
+def test_base_store_is_abstract():
+    with pytest.raises(TypeError):
+        ThreadStore()
+
+
+def test_memory_store_keeps_message_objects_and_versions():
+    store = MemoryThreadStore(max_threads=2)
+    message = {"role": "user", "content": "hi"}
+    history = [message]
+
+    assert store.save("a", "crew", history) == 1
+    history.append({"role": "assistant", "content": "hello"})
+    assert store.save("a", "crew", history) == 2
+
+    record = store.load("a")
+    assert record["version"] == 2
+    assert record["messages"] == history
+    assert record["messages"][0] is message
+    # Appending to the session's list does not change the stored snapshot
+    history.append({"role": "user", "content": "more"})
+    assert len(store.load("a")["messages"]) == 2
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryThreadStore(max_threads=2)
+    store.save("a", None, [])
+    store.save("b", None, [])
+    store.load("a")
+    store.save("c", None, [])
+
+    assert store.load("b") is None
+    assert store.load("a") is not None
+    assert len(store) == 2
+
+
+def test_sqlite_close_releases_every_thread_connection(tmp_path):
+    store = SQLiteThreadStore(str(tmp_path / "threads.db"))
+
+    def worker(index):
+        store.save(f"chat-{index}", None, [{"role": "user", "content": str(index)}])
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    connections = list(store._connections)
+    assert len(connections) == 4
+
+    store.close()
+
+    assert store._connections == []
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    # The store reconnects on the next use
+    assert store.load("chat-1")["messages"] == [{"role": "user", "content": "1"}]
+    store.close()
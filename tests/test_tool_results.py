@@ -0,0 +1,41 @@
+"""Compact serialization of tool results."""
+import json
+
+from shared.tool_results import compact_tool_result
+
+MENU = {
+    "name": "Pizza Place",
+    "menu": [
+        {"name": f"Pizza {index}", "price": 10 + index, "description": f"Stone-baked pizza number {index}"}
+        for index in range(25)
+    ],
+}
+
+
+def test_keeps_descriptions_and_every_item_within_budget():
+    result = json.loads(compact_tool_result(MENU, "GetRestaurantMenu", max_chars=10000))
+    assert len(result["menu"]) == 25
+    assert result["menu"][3] == {"name": "Pizza 3", "price": 13, "description": "Stone-baked pizza number 3"}
+
+
+def test_drops_redundant_and_empty_fields():
+    result = json.loads(compact_tool_result(
+        {"subtotal": 10.0, "total": 12.994, "message": "Total: £12.99", "promotion": None}, "CalculateTotal"
+    ))
+    assert result == {"subtotal": 10.0, "total": 12.99}
+
+
+def test_cuts_lists_only_as_far_as_the_budget_needs():
+    full = compact_tool_result(MENU, "GetRestaurantMenu", max_chars=100000)
+    budget = len(full) - 200
+    text = compact_tool_result(MENU, "GetRestaurantMenu", max_chars=budget)
+    assert len(text) <= budget
+    result = json.loads(text)
+    kept = [item for item in result["menu"] if isinstance(item, dict)]
+    assert 20 <= len(kept) < 25
+    assert result["menu"][-1] == f"... {25 - len(kept)} more"
+
+
+def test_plain_text_is_truncated_with_marker():
+    text = compact_tool_result("x" * 50, max_chars=10)
+    assert text == "x" * 10 + "... [truncated 40 chars]"
@@ -0,0 +1,22 @@
+"""Which postcodes the scraper's search page fast path serves."""
+import pytest
+
+pytest.importorskip("browser_use")
+pytest.importorskip("langchain_openai")
+
+from backend.src.uber_eats_scraper import search_page_covers
+
+
+@pytest.mark.parametrize("postal_code", ["SW1A 1AA", "e1 6an", "EC1A1BB", "W1"])
+def test_default_search_page_covers_london(postal_code):
+    assert search_page_covers(postal_code)
+
+
+@pytest.mark.parametrize("postal_code", ["M1 1AE", "B1 1AA", "EH1 1YZ", "Manchester", ""])
+def test_other_areas_use_the_agent(postal_code):
+    assert not search_page_covers(postal_code)
+
+
+def test_any_area_when_configured(monkeypatch):
+    monkeypatch.setenv("DELIVEROO_SEARCH_AREAS", "*")
+    assert search_page_covers("M1 1AE")
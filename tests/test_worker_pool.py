@@ -0,0 +1,111 @@
+"""Bounded chat worker pool: rejections, freed slots, timeouts and their HTTP errors."""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from frontend.src.worker_pool import BoundedExecutor, QueueFullError
+
+
+@pytest.fixture
+def gate():
+    """An event the pooled jobs block on; set on teardown so no worker hangs."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def executor():
+    pool = BoundedExecutor(max_workers=1, max_queue=1, thread_name_prefix="test-worker")
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def test_submissions_beyond_workers_and_queue_are_rejected(executor, gate):
+    running = executor.submit(gate.wait)
+    waiting = executor.submit(gate.wait)
+
+    assert (executor.in_flight, executor.queued) == (2, 1)
+    with pytest.raises(QueueFullError):
+        executor.submit(gate.wait)
+
+    gate.set()
+    running.result(timeout=1)
+    waiting.result(timeout=1)
+
+
+def test_finished_work_frees_its_slot(executor, gate):
+    futures = [executor.submit(gate.wait) for _ in range(2)]
+    gate.set()
+    for future in futures:
+        future.result(timeout=1)
+
+    assert executor.submit(lambda: "again").result(timeout=1) == "again"
+    assert executor.in_flight == 0
+
+
+def test_failed_work_frees_its_slot(executor):
+    def fail():
+        raise ValueError("boom")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            executor.submit(fail).result(timeout=1)
+    assert executor.in_flight == 0
+
+
+def test_run_returns_the_result_without_blocking_the_loop(executor):
+    assert asyncio.run(executor.run(lambda a, b: a + b, 2, b=3)) == 5
+
+
+def test_run_times_out_and_rejects_when_full(executor, gate):
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run(gate.wait, timeout=0.05)
+        # The timed-out job keeps its worker, so one queued job fills the pool
+        executor.submit(gate.wait)
+        with pytest.raises(QueueFullError):
+            await executor.run(gate.wait)
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def server():
+    pytest.importorskip("fastapi")
+    pytest.importorskip("uvicorn")
+    pytest.importorskip("crewai")
+    from frontend.src import server as server_module
+
+    return server_module
+
+
+def test_saturated_pool_returns_429(server, executor, gate):
+    executor.submit(gate.wait)
+    executor.submit(gate.wait)
+    state = SimpleNamespace(chat_executor=executor)
+
+    with pytest.raises(server.HTTPException) as raised:
+        asyncio.run(server._run_on_chat_pool(state, lambda _state: "unreachable"))
+
+    assert raised.value.status_code == 429
+    assert raised.value.headers == {"Retry-After": "1"}
+
+
+def test_slow_turn_returns_503(server, executor, gate, monkeypatch):
+    monkeypatch.setenv("CHAT_TIMEOUT_SECONDS", "0.05")
+    state = SimpleNamespace(chat_executor=executor)
+
+    with pytest.raises(server.HTTPException) as raised:
+        asyncio.run(server._run_on_chat_pool(state, lambda _state: gate.wait()))
+
+    assert raised.value.status_code == 503
+    assert raised.value.headers == {"Retry-After": "5"}
+
+
+def test_turn_receives_the_state_and_its_arguments(server, executor):
+    state = SimpleNamespace(chat_executor=executor)
+    result = asyncio.run(server._run_on_chat_pool(state, lambda s, chat_id: (s is state, chat_id), "chat-1"))
+    assert result == (True, "chat-1")